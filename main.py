@@ -1,25 +1,49 @@
-import matplotlib
+import argparse
 from src.data_cleanner import DataCleanner
+from src.dataset_cache import DatasetCache, RAW_DATA_FILE
 from src.data_analysis_plots import data_analysis_charts
 from src.surface import generate_surface_charts
 from src.most_expensive_region import generate_all_expensive_municipality_charts
 from src.less_expensive_region import generate_all_least_expensive_charts
+from src.chart_scheduler import default_chart_jobs, render_charts
+from src.quantile_sketch import DEFAULT_RELATIVE_ACCURACY
 
-matplotlib.use('TkAgg')
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Clean the Immoweb dataset and generate the analysis charts.")
+    parser.add_argument("--rebuild-cache", action="store_true",
+                        help="ignore the cached cleaned dataset and clean the raw file again")
+    parser.add_argument("--compact-dtypes", action="store_true",
+                        help="store numeric columns in compact nullable dtypes instead of int64 with -1 sentinels")
+    parser.add_argument("--workers", type=int, default=None, metavar="N",
+                        help="render the charts headless (without displaying them) with N worker processes")
+    parser.add_argument("--near-duplicates", action="store_true",
+                        help="also remove near-duplicate listings (same address, type, subtype and bedrooms, "
+                             "price and surface within 2%%)")
+    parser.add_argument("--approx-median", type=float, nargs="?", const=DEFAULT_RELATIVE_ACCURACY, default=None,
+                        metavar="ACCURACY",
+                        help="compute the municipality medians with a quantile sketch, within this relative error "
+                             f"(default: {DEFAULT_RELATIVE_ACCURACY})")
+    args = parser.parse_args()
 
-# Initialization and data cleaning
-cleaner = DataCleanner("data/immoweb-dataset.csv")
-cleaner.send_output_file("data/data_cleanned.csv")
+    # Initialization and data cleaning (loaded from the on-disk cache when the raw file is unchanged)
+    cleaner = DataCleanner(RAW_DATA_FILE, cache=DatasetCache(rebuild=args.rebuild_cache),
+                           compact_dtypes=args.compact_dtypes, near_duplicates=args.near_duplicates)
+    cleaner.send_output_file("data/data_cleanned.csv")
 
-# Convert -1 values to NaN so they are not included in the correlation
-df = cleaner.to_real_values() 
+    # Convert -1 values to NaN so they are not included in the correlation (no-op with --compact-dtypes)
+    df = cleaner.to_real_values() 
 
-# Data analysis
-data_analysis_charts(df, True)
+    if args.workers:
+        # Render all the charts in parallel, on the non-interactive Agg backend
+        render_charts(df, default_chart_jobs(args.approx_median, cleaner.profile()), workers=args.workers)
+    else:
+        # Data analysis (python -m src.batch renders the charts headless instead)
+        data_analysis_charts(df, True, cleaner.profile())
 
-# Data interpretation
-generate_surface_charts(df, True)
+        # Data interpretation
+        generate_surface_charts(df, True)
 
-generate_all_expensive_municipality_charts()
+        # Both reports share one municipality aggregate (see src/municipality_stats.py)
+        generate_all_expensive_municipality_charts(True, df, args.approx_median)
 
-generate_all_least_expensive_charts()
\ No newline at end of file
+        generate_all_least_expensive_charts(True, df, args.approx_median)
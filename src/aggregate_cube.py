@@ -0,0 +1,106 @@
+import pandas as pd
+from src.category_normalizer import MISSING_VALUE
+from src.quantile_sketch import GroupedQuantileSketch, DEFAULT_RELATIVE_ACCURACY
+
+# Dimensions of the cube, from the coarsest to the finest
+DIMENSIONS = ["region", "province", "locality", "subtype"]
+
+class AggregateCube:
+    """
+    In-memory cube of price statistics per (region, province, locality, subtype).
+
+    Every cell keeps mergeable state only: the listing count, the sums of the prices and
+    of the prices per m², and a quantile sketch of the prices. Any rollup (e.g. the
+    provinces of a region) is computed from the cells, without scanning the listings,
+    so its cost depends on the number of cells, not on the size of the dataset.
+    Medians are approximate, within the sketch's relative accuracy.
+
+    Missing dimension values are kept as their own MISSING_VALUE cells, so totals over
+    a dimension still count them; rollups by that dimension leave them out.
+    """
+
+    def __init__(self, cells: pd.DataFrame, price_sketch: GroupedQuantileSketch) -> None:
+        """
+        Initialize the cube.
+
+        Args:
+            cells (pd.DataFrame): 'count', 'price_sum' and 'price_m2_sum' per cell,
+                                  indexed by DIMENSIONS.
+            price_sketch (GroupedQuantileSketch): Price sketch per cell.
+        """
+        self.cells = cells
+        self.price_sketch = price_sketch
+
+    @classmethod
+    def from_listings(cls, df: pd.DataFrame, relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY) -> "AggregateCube":
+        """
+        Build the cube from listings.
+
+        Args:
+            df (pd.DataFrame): Listings with the DIMENSIONS columns, 'price' and 'price_per_m2'.
+            relative_accuracy (float): Maximal relative error of the medians.
+
+        Returns:
+            AggregateCube: The cube.
+        """
+        listings = df[DIMENSIONS + ["price", "price_per_m2"]].astype({col: "object" for col in DIMENSIONS})
+        listings[DIMENSIONS] = listings[DIMENSIONS].fillna(MISSING_VALUE)
+
+        cells = listings.groupby(DIMENSIONS).agg(
+            count=("price", "count"),
+            price_sum=("price", "sum"),
+            price_m2_sum=("price_per_m2", "sum")
+        )
+        price_sketch = GroupedQuantileSketch(DIMENSIONS, relative_accuracy)
+        price_sketch.add(listings, "price")
+        return cls(cells, price_sketch)
+
+    @staticmethod
+    def _filter(frame, filters: dict):
+        mask = None
+        for dim, value in filters.items():
+            if dim not in DIMENSIONS:
+                raise ValueError(f"Unknown dimension '{dim}', expected one of {DIMENSIONS}")
+            values = frame.index.get_level_values(dim)
+            dim_mask = values.isin(value) if isinstance(value, (list, tuple, set)) else values == value
+            mask = dim_mask if mask is None else mask & dim_mask
+        return frame if mask is None else frame[mask]
+
+    def rollup(self, by: list, **filters) -> pd.DataFrame:
+        """
+        Statistics rolled up to some dimensions, optionally within a slice of the cube.
+
+        Example: cube.rollup(["province"], region="Wallonia") gives the statistics of
+        every province of Wallonia.
+
+        Args:
+            by (list[str]): Dimensions to keep (at least one).
+            **filters: Dimension values to keep, as dimension=value or dimension=[values].
+
+        Returns:
+            pd.DataFrame: One row per combination of the `by` dimensions, with columns
+                          by + ['avg_price', 'med_price', 'price_m2', 'count'].
+
+        Raises:
+            ValueError: If no or an unknown dimension is given.
+        """
+        by = list(by)
+        if not by or any(dim not in DIMENSIONS for dim in by):
+            raise ValueError(f"Roll up by one or more of {DIMENSIONS}, got {by}")
+
+        cells = self._filter(self.cells, filters)
+        totals = cells.groupby(level=by).sum()
+
+        counts = self._filter(self.price_sketch.counts, filters)
+        counts = counts.groupby(level=by + ["bucket"]).sum()
+        sketch = GroupedQuantileSketch(by, self.price_sketch.relative_accuracy, counts)
+
+        result = pd.DataFrame({
+            "avg_price": totals["price_sum"] / totals["count"],
+            "med_price": sketch.quantile(0.5).reindex(totals.index),
+            "price_m2": totals["price_m2_sum"] / totals["count"],
+            "count": totals["count"]
+        }).reset_index()
+
+        # Missing values count in the totals, but are not a province/locality/... of their own
+        return result[(result[by] != MISSING_VALUE).all(axis=1)].reset_index(drop=True)
@@ -0,0 +1,75 @@
+# Headless batch entry point: python -m src.batch
+# The Agg backend must be selected before pyplot is imported (by the chart modules below).
+import matplotlib
+matplotlib.use("Agg")
+
+import argparse
+import time
+from src.data_cleanner import DataCleanner
+from src.dataset_cache import DatasetCache, RAW_DATA_FILE
+from src.chart_scheduler import default_chart_jobs, render_charts, write_manifest
+from src.quantile_sketch import DEFAULT_RELATIVE_ACCURACY
+
+# Default location of the manifest of the generated charts
+MANIFEST_FILE = "plots/manifest.json"
+
+def run_batch(rebuild_cache: bool = False, compact_dtypes: bool = False, workers: int = 1,
+              manifest_path: str = MANIFEST_FILE, median_accuracy: float = None,
+              near_duplicates: bool = False) -> dict:
+    """
+    Clean the dataset and render every chart headless, without ever displaying them.
+
+    Args:
+        rebuild_cache (bool): Ignore the cached cleaned dataset and clean the raw file again.
+        compact_dtypes (bool): Store numeric columns in compact nullable dtypes.
+        workers (int): Number of worker processes rendering the charts (1 renders them
+                       in the current process).
+        manifest_path (str): Where to save the manifest of the generated charts.
+        median_accuracy (float, optional): Maximal relative error of the approximate medians
+                                           of the region charts. None (default) for exact medians.
+        near_duplicates (bool): Also remove near-duplicate listings when cleaning.
+
+    Returns:
+        dict: The manifest (generated files, with the render time of each).
+    """
+    start = time.perf_counter()
+
+    cleaner = DataCleanner(RAW_DATA_FILE, cache=DatasetCache(rebuild=rebuild_cache),
+                           compact_dtypes=compact_dtypes, near_duplicates=near_duplicates)
+    cleaner.send_output_file("data/data_cleanned.csv")
+    df = cleaner.to_real_values()
+    cleaning_seconds = time.perf_counter() - start
+
+    results = render_charts(df, default_chart_jobs(median_accuracy, cleaner.profile()), workers=workers)
+
+    return write_manifest(
+        results, manifest_path,
+        workers=workers,
+        cleaning_seconds=round(cleaning_seconds, 3),
+        total_seconds=round(time.perf_counter() - start, 3)
+    )
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Clean the Immoweb dataset and render all the charts headless.")
+    parser.add_argument("--rebuild-cache", action="store_true",
+                        help="ignore the cached cleaned dataset and clean the raw file again")
+    parser.add_argument("--compact-dtypes", action="store_true",
+                        help="store numeric columns in compact nullable dtypes instead of int64 with -1 sentinels")
+    parser.add_argument("--workers", type=int, default=1, metavar="N",
+                        help="render the charts with N worker processes (default: 1, in-process)")
+    parser.add_argument("--manifest", default=MANIFEST_FILE,
+                        help=f"where to save the manifest of the generated charts (default: {MANIFEST_FILE})")
+    parser.add_argument("--near-duplicates", action="store_true",
+                        help="also remove near-duplicate listings (same address, type, subtype and bedrooms, "
+                             "price and surface within 2%%)")
+    parser.add_argument("--approx-median", type=float, nargs="?", const=DEFAULT_RELATIVE_ACCURACY, default=None,
+                        metavar="ACCURACY",
+                        help="compute the municipality medians with a quantile sketch, within this relative error "
+                             f"(default: {DEFAULT_RELATIVE_ACCURACY})")
+    args = parser.parse_args()
+
+    manifest = run_batch(args.rebuild_cache, args.compact_dtypes, args.workers, args.manifest, args.approx_median,
+                         args.near_duplicates)
+    failed = [chart["chart"] for chart in manifest["charts"] if chart["error"]]
+    if failed:
+        raise SystemExit(f"[ERROR] {len(failed)} chart(s) failed: {', '.join(failed)}")
@@ -0,0 +1,194 @@
+import numpy as np
+import pandas as pd
+from src.outliers import IQR_FACTOR
+
+# Fliers drawn per box at most (the lowest and highest are always kept)
+MAX_FLIERS = 200
+
+# Points drawn per box at most by the strip overlay
+STRIP_SIZE = 300
+
+class ReservoirSampler:
+    """
+    Uniform random sample of bounded size of a stream of values (reservoir sampling).
+
+    Values can be added in chunks of any size; after n values, each of them is in the
+    sample with probability size / n, and the sample never holds more than size values.
+    """
+
+    def __init__(self, size: int, seed: int = 0) -> None:
+        """
+        Initialize an empty sampler.
+
+        Args:
+            size (int): Maximal number of values kept.
+            seed (int): Seed of the random generator (samples are reproducible).
+        """
+        self.size = size
+        self.seen = 0
+        self._rng = np.random.default_rng(seed)
+        self._sample = np.empty(size, dtype="float64")
+
+    def add(self, values: np.ndarray) -> None:
+        """
+        Add values to the stream.
+
+        Args:
+            values (np.ndarray): Values, in stream order.
+
+        Returns:
+            None
+        """
+        values = np.asarray(values, dtype="float64")
+
+        # Fill the reservoir first
+        free = min(max(self.size - self.seen, 0), len(values))
+        self._sample[self.seen:self.seen + free] = values[:free]
+
+        # Then the value at stream position t replaces a random slot with probability size / (t + 1)
+        positions = self.seen + np.arange(free, len(values))
+        slots = (self._rng.random(len(positions)) * (positions + 1)).astype(np.int64)
+        accepted = slots < self.size
+        for slot, value in zip(slots[accepted], values[free:][accepted]):
+            self._sample[slot] = value
+        self.seen += len(values)
+
+    def sample(self) -> np.ndarray:
+        """
+        Current sample.
+
+        Returns:
+            np.ndarray: min(size, number of values seen) values.
+        """
+        return self._sample[:min(self.size, self.seen)].copy()
+
+def sample_fliers(values: np.ndarray, max_fliers: int = MAX_FLIERS, seed: int = 0) -> np.ndarray:
+    """
+    Cap the number of fliers drawn for a box, keeping the extreme ones.
+
+    Args:
+        values (np.ndarray): Outlier values of the box.
+        max_fliers (int): Maximal number of values returned.
+        seed (int): Seed of the random generator.
+
+    Returns:
+        np.ndarray: All the values if there are at most max_fliers, otherwise the lowest,
+                    the highest and a random sample of the others.
+    """
+    values = np.asarray(values, dtype="float64")
+    if len(values) <= max_fliers:
+        return values
+    extremes = values[[np.argmin(values), np.argmax(values)]]
+    sampled = np.random.default_rng(seed).choice(values, max_fliers - 2, replace=False)
+    return np.concatenate([extremes, sampled])
+
+def box_stats(df: pd.DataFrame, value_col: str, group_col: str = None, factor: float = IQR_FACTOR,
+              max_fliers: int = MAX_FLIERS, seed: int = 0) -> list:
+    """
+    Box statistics of a column, overall or per group, ready for Axes.bxp().
+
+    Quartiles, whiskers (the most extreme values within factor × IQR of the quartiles)
+    and fliers are computed from every row, but at most max_fliers fliers are kept per
+    box, so drawing the boxes costs the same whatever the size of the dataset.
+
+    Args:
+        df (pd.DataFrame): Dataset.
+        value_col (str): Column to summarize. Missing values are ignored.
+        group_col (str, optional): Column defining one box per group. Defaults to a single box.
+        factor (float): Whisker reach, in IQRs.
+        max_fliers (int): Maximal number of fliers per box (see sample_fliers()).
+        seed (int): Seed of the flier sampling.
+
+    Returns:
+        list[dict]: One dict per box (in group order), with the bxp() keys 'label', 'q1',
+                    'med', 'q3', 'whislo', 'whishi' and 'fliers', plus the number of values
+                    'n' and of outliers 'n_outliers'.
+    """
+    data = df[[value_col] + ([group_col] if group_col else [])].dropna()
+    values = data[value_col].astype("float64")
+    keys = data[group_col] if group_col else pd.Series(value_col, index=data.index)
+
+    quartiles = values.groupby(keys, observed=True).quantile([0.25, 0.5, 0.75]).unstack()
+    quartiles.columns = ["q1", "med", "q3"]
+    iqr = quartiles["q3"] - quartiles["q1"]
+    lower = (quartiles["q1"] - factor * iqr).reindex(keys).to_numpy()
+    upper = (quartiles["q3"] + factor * iqr).reindex(keys).to_numpy()
+
+    outlier = (values.to_numpy() < lower) | (values.to_numpy() > upper)
+    whiskers = values[~outlier].groupby(keys[~outlier], observed=True).agg(["min", "max"])
+    counts = keys.value_counts()
+    fliers = {key: group.to_numpy() for key, group in values[outlier].groupby(keys[outlier], observed=True)}
+
+    stats = []
+    for key, row in quartiles.iterrows():
+        group_fliers = fliers.get(key, np.empty(0))
+        stats.append({
+            "label": str(key),
+            "q1": row["q1"], "med": row["med"], "q3": row["q3"],
+            "whislo": whiskers.at[key, "min"], "whishi": whiskers.at[key, "max"],
+            "fliers": sample_fliers(group_fliers, max_fliers, seed),
+            "n": int(counts[key]),
+            "n_outliers": len(group_fliers)
+        })
+    return stats
+
+def strip_sample(df: pd.DataFrame, value_col: str, group_col: str = None,
+                 size: int = STRIP_SIZE, seed: int = 0) -> list:
+    """
+    Reservoir sample of the values of every group, for a strip overlay of bounded size.
+
+    Args:
+        df (pd.DataFrame): Dataset.
+        value_col (str): Column to sample. Missing values are ignored.
+        group_col (str, optional): Column defining the groups (same as for box_stats()).
+        size (int): Maximal number of values per group.
+        seed (int): Seed of the sampling.
+
+    Returns:
+        list[np.ndarray]: Sampled values of every group, in the order of box_stats().
+    """
+    data = df[[value_col] + ([group_col] if group_col else [])].dropna()
+    keys = data[group_col] if group_col else pd.Series(value_col, index=data.index)
+
+    samples = []
+    for _, values in data[value_col].astype("float64").groupby(keys, observed=True):
+        sampler = ReservoirSampler(size, seed)
+        sampler.add(values.to_numpy())
+        samples.append(sampler.sample())
+    return samples
+
+def draw_boxes(ax, stats: list, colors: list = None, strip: list = None,
+               orientation: str = "horizontal", seed: int = 0) -> dict:
+    """
+    Draw precomputed box statistics, with an optional strip overlay.
+
+    Boxes are drawn top to bottom (horizontal) or left to right (vertical) in the
+    order of stats, at positions 1..n.
+
+    Args:
+        ax (matplotlib.axes.Axes): Axes to draw on.
+        stats (list[dict]): Box statistics (see box_stats()).
+        colors (list, optional): Face color of every box.
+        strip (list[np.ndarray], optional): Values to scatter over every box (see strip_sample()).
+        orientation (str): "horizontal" or "vertical".
+        seed (int): Seed of the strip jitter.
+
+    Returns:
+        dict: The artists returned by Axes.bxp().
+    """
+    artists = ax.bxp(stats, orientation=orientation, patch_artist=True, widths=0.6,
+                     medianprops={"color": "black"},
+                     flierprops={"marker": "o", "markersize": 4, "markerfacecolor": "none"})
+    for patch, color in zip(artists["boxes"], colors or ["white"] * len(stats)):
+        patch.set_facecolor(color)
+
+    if strip is not None:
+        rng = np.random.default_rng(seed)
+        for position, values in enumerate(strip, start=1):
+            jitter = position + rng.uniform(-0.2, 0.2, len(values))
+            x, y = (values, jitter) if orientation == "horizontal" else (jitter, values)
+            ax.scatter(x, y, color="gray", s=9, alpha=0.4, linewidths=0, zorder=3)
+
+    if orientation == "horizontal":
+        ax.invert_yaxis()
+    return artists
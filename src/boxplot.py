@@ -2,13 +2,21 @@
 import pandas as pd
 import seaborn as sns
 import matplotlib.pyplot as plt
-from data_cleanner import DataCleanner  # Custom data loading/cleaning class
+import sys
+from src.data_cleanner import DataCleanner  # Custom data loading/cleaning class
+from src.dataset_cache import DatasetCache, RAW_DATA_FILE
+from src.regions import map_postcodes_to_region
+from src.quantile_sketch import grouped_median, median_accuracy_option
+from src.box_stats import box_stats, strip_sample, draw_boxes
 import matplotlib.ticker as mtick
 
 
+# Exact medians by default, approximate (quantile sketch) with --approx-median[=ACCURACY]
+median_accuracy = median_accuracy_option(sys.argv[1:])
+
 # Load and clean the dataset using your custom cleaner
-data = DataCleanner("data/data_cleanned.csv")
-df = data.load_data_file()
+data = DataCleanner(RAW_DATA_FILE, cache=DatasetCache(rebuild="--rebuild-cache" in sys.argv[1:]))
+df = data.normalization()
 
 # Filter out unrealistic price and surface entries
 df = df[df["price"] > 10000]
@@ -21,33 +29,21 @@ df["price_per_m2"] = df["price"] / df["habitableSurface"]
 # Add a new column 'region' based on Belgian postcode ranges
 ####################################################################################
 
-def map_postcode_to_region(postcode):
-    try:
-        pc = int(postcode)
-        if 1000 <= pc <= 1299:
-            return "Brussels"
-        elif (1300 <= pc <= 1499) or (4000 <= pc <= 7999):
-            return "Wallonia"
-        elif 1500 <= pc <= 3999:
-            return "Flanders"
-        else:
-            return "Unknown"
-    except:
-        return "Unknown"
-
 # Apply postcode-to-region mapping
-df["region"] = df["postCode"].apply(map_postcode_to_region)
+df["region"] = map_postcodes_to_region(df["postCode"])
 
 # Prepare a summarized DataFrame with key geographic and pricing info
 summary_df = df[["locality", "province", "region", "price", "price_per_m2"]].copy()
 
 # Aggregate stats at locality level
-agg_df = summary_df.groupby(["region", "province", "locality"]).agg(
+group_cols = ["region", "province", "locality"]
+agg_df = summary_df.groupby(group_cols, observed=True).agg(
     avg_price=("price", "mean"),
-    med_price=("price", "median"),
     price_m2=("price_per_m2", "mean"),
     count=("price", "count")
-).reset_index()
+)
+agg_df.insert(1, "med_price", grouped_median(summary_df, group_cols, "price", median_accuracy))
+agg_df = agg_df.reset_index()
 
 #####################################################################################################
 # Visualize Habitable Surface by Property Subtype                                                   #
@@ -64,10 +60,10 @@ df = df[df["subtype"].isin([
     'OTHER_PROPERTY', 'CASTLE', 'PAVILION'
 ])]
 
-# Boxplot with stripplot overlay for habitable surface per subtype
+# Boxplot with stripplot overlay for habitable surface per subtype (box statistics and a bounded sample per subtype)
 plt.figure(figsize=(10, 6))
-sns.boxplot(data=df, y='subtype', x='habitableSurface', palette='Set2')
-sns.stripplot(data=df, y='subtype', x='habitableSurface', color='gray', size=3, jitter=True, alpha=0.4)
+stats = box_stats(df, 'habitableSurface', 'subtype')
+draw_boxes(plt.gca(), stats, colors=sns.color_palette('Set2', len(stats)), strip=strip_sample(df, 'habitableSurface', 'subtype'))
 plt.title('Habitable Surface Comparison by Property Subtype')
 plt.xlabel('Habitable Surface (m²)')
 plt.ylabel('Subtype')
@@ -89,10 +85,10 @@ df = df[df["subtype"].isin([
     'OTHER_PROPERTY', 'CASTLE', 'PAVILION'
 ])]
 
-# Boxplot with stripplot overlay for habitable surface per subtype
+# Boxplot with stripplot overlay for price per subtype (box statistics and a bounded sample per subtype)
 plt.figure(figsize=(10, 6))
-sns.boxplot(data=df, y='subtype', x='price', palette='Set2')
-sns.stripplot(data=df, y='subtype', x='price', color='gray', size=3, jitter=True, alpha=0.4)
+stats = box_stats(df, 'price', 'subtype')
+draw_boxes(plt.gca(), stats, colors=sns.color_palette('Set2', len(stats)), strip=strip_sample(df, 'price', 'subtype'))
 plt.title('Price Comparison by Property Subtype')
 plt.xlabel('Price')
 plt.ylabel('Subtype')
@@ -103,10 +99,11 @@ plt.show()
 #   Define a modular function to compare prices by any categorical variable                         #
 #####################################################################################################
 
-def plot_price_comparaison(df_region, title, var):
+def plot_price_comparaison(df_region, title, var, median_accuracy=None):
     """
     Visualizes average price, median price, and price per m²
     grouped by a categorical variable (e.g., subtype, region, etc.).
+    Medians are approximate (within median_accuracy) when median_accuracy is given.
     """
 
     # Ensure required metrics exist
@@ -122,15 +119,16 @@ def plot_price_comparaison(df_region, title, var):
             ]
             df_region["price_per_m2"] = df_region["price"] / df_region["habitableSurface"]
 
-        df_region = (
+        grouped = (
             df_region
-            .groupby(var, as_index=False)
+            .groupby(var, observed=True)
             .agg(
                 avg_price=('price', 'mean'),
-                med_price=('price', 'median'),
                 price_m2=('price_per_m2', 'mean')
             )
         )
+        grouped.insert(1, "med_price", grouped_median(df_region, [var], "price", median_accuracy))
+        df_region = grouped.reset_index()
 
     # Create 3 subplots side-by-side
     fig, axes = plt.subplots(1, 3, figsize=(18, 6))
@@ -185,33 +183,21 @@ def plot_price_comparaison(df_region, title, var):
 # Add a new column 'region' based on Belgian postcode ranges
 ####################################################################################
 
-def map_postcode_to_region(postcode):
-    try:
-        pc = int(postcode)
-        if 1000 <= pc <= 1299:
-            return "Brussels"
-        elif (1300 <= pc <= 1499) or (4000 <= pc <= 7999):
-            return "Wallonia"
-        elif 1500 <= pc <= 3999:
-            return "Flanders"
-        else:
-            return "Unknown"
-    except:
-        return "Unknown"
-
 # Apply postcode-to-region mapping
-df["region"] = df["postCode"].apply(map_postcode_to_region)
+df["region"] = map_postcodes_to_region(df["postCode"])
 
 # Prepare a summarized DataFrame with key geographic and pricing info
 summary_df = df[["locality", "province", "region", "price", "price_per_m2"]].copy()
 
 # Aggregate stats at locality level
-agg_df = summary_df.groupby(["region", "province", "locality"]).agg(
+group_cols = ["region", "province", "locality"]
+agg_df = summary_df.groupby(group_cols, observed=True).agg(
     avg_price=("price", "mean"),
-    med_price=("price", "median"),
     price_m2=("price_per_m2", "mean"),
     count=("price", "count")
-).reset_index()
+)
+agg_df.insert(1, "med_price", grouped_median(summary_df, group_cols, "price", median_accuracy))
+agg_df = agg_df.reset_index()
 
 
 ###########################################################################################################
@@ -231,7 +217,7 @@ def plot_price_by_rooms(df,room):
     df["price_per_m2"] = df["price"] / df["habitableSurface"]
 
     # Step 3: Group by property subtype
-    grouped = df.groupby("subtype", as_index=False).agg({
+    grouped = df.groupby("subtype", as_index=False, observed=True).agg({
         "price": ["mean", "median"],
         "price_per_m2": "mean",
         room: "median"
@@ -291,7 +277,7 @@ def plot_price_by_rooms(df,room):
 # Ensure price is available
 df = df[df['price'].notna()]
 # Plot price metrics per property subtype
-plot_price_comparaison(df, "Property Subtype", "subtype")
+plot_price_comparaison(df, "Property Subtype", "subtype", median_accuracy)
 
 ###########################################################################################################
 #                       Price comparison by Building Condition                                            #
@@ -300,7 +286,7 @@ plot_price_comparaison(df, "Property Subtype", "subtype")
 # Filter valid building conditions
 df = df[df['buildingCondition'].notna()]
 # Plot price metrics per building condition
-plot_price_comparaison(df, "Building Condition", "buildingCondition")
+plot_price_comparaison(df, "Building Condition", "buildingCondition", median_accuracy)
 ###########################################################################################################
 #                       Price comparison by Kitchen Type                                                  #
 ###########################################################################################################
@@ -309,7 +295,7 @@ plot_price_comparaison(df, "Building Condition", "buildingCondition")
 ##TO REDO : fusionner les types de Kitchen et les trier
 df = df[df['kitchenType'].notna()]
 # Plot price metrics per building condition
-plot_price_comparaison(df, "Kitchen Type", "kitchenType")
+plot_price_comparaison(df, "Kitchen Type", "kitchenType", median_accuracy)
 ###########################################################################################################
 #                       Price comparison by Heating Type                                                  #
 ###########################################################################################################
@@ -317,7 +303,7 @@ plot_price_comparaison(df, "Kitchen Type", "kitchenType")
 # Filter valid Heating Type
 df = df[df['heatingType'].notna()]
 # Plot price metrics per building condition
-plot_price_comparaison(df, "Heating Type", "heatingType")
+plot_price_comparaison(df, "Heating Type", "heatingType", median_accuracy)
 ###########################################################################################################
 #                       Price comparison by Flood Zone Type                                                 #
 ###########################################################################################################
@@ -325,7 +311,7 @@ plot_price_comparaison(df, "Heating Type", "heatingType")
 # Filter valid Heating Type
 df = df[df['floodZoneType'].notna()]
 # Plot price metrics per building condition
-plot_price_comparaison(df, "Flood Zone Type", "floodZoneType")
+plot_price_comparaison(df, "Flood Zone Type", "floodZoneType", median_accuracy)
 
 
 ###########################################################################################################
@@ -1,60 +1,95 @@
 import pandas as pd
 import plotly.express as px
-from dash import Dash, dcc, html, Input, Output
+from dash import Dash, DiskcacheManager, ctx, dcc, html, Input, Output, State, no_update
 import dash_bootstrap_components as dbc
-from data_cleanner import DataCleanner
-
-# Chargement et préparation des données
-data = DataCleanner("data/data_cleanned.csv")
-df = data.load_data_file()
-df = df[
-        (df["price"].notna()) & (df["price"] > 10000) & (df["price"] < 1_000_000) &
-        (df["habitableSurface"].notna()) & (df["habitableSurface"] > 10)
-    ].copy()
-
-df["price_per_m2"] = df["price"] / df["habitableSurface"]
-
-####################################################################################
-# Official Region Mapping by Postcode (Belgium)                                    #
-#| Region   | Postcode Range        |                                              #
-#| -------- | --------------------- |                                              #
-#| Brussels | 1000–1299             |                                              #
-#| Flanders | 1500–3999             |                                              #
-#| Wallonia | 1300–1499 & 4000–7999 |                                              #
-#                                                                                  #
-####################################################################################
-
-def map_postcode_to_region(postcode):
-    try:
-        pc = int(postcode)
-        if 1000 <= pc <= 1299:
-            return "Brussels"
-        elif (1300 <= pc <= 1499) or (4000 <= pc <= 7999):
-            return "Wallonia"
-        elif 1500 <= pc <= 3999:
-            return "Flanders"
-    except:
-        return "Unknown"
-
-df["region"] = df["postCode"].apply(map_postcode_to_region)
-
-# Agrégation par région
-region_avg = df.groupby("region").agg(avg_price=("price", "mean")).reset_index()
-fig_region = px.choropleth(
-    region_avg,
-    geojson="https://raw.githubusercontent.com/napoleon03/be-geojson/main/belgium_regions.geojson",
-    featureidkey="properties.name",
-    locations="region",
-    color="avg_price",
-    color_continuous_scale="Blues",
-    title="💶 Average Property Price by Region"
-)
-fig_region.update_geos(fitbounds="locations", visible=False)
+import diskcache
+import json
+import sys
+import threading
+import time
+from functools import lru_cache
+from src.dashboard_data import load_dashboard_listings, SNAPSHOT_FILE
+from src.aggregate_cube import AggregateCube
+from src.geo_store import GeoStore, FEATURE_ID_KEY
+from src.snapshot import read_snapshot_metadata
+
+# Cache des callbacks en arrière-plan, partagé par les workers
+CALLBACK_CACHE_DIR = "data/cache/dash"
+
+# Chargement des données : snapshot colonnaire mappé en mémoire (filtré, avec price_per_m2 et region),
+# reconstruit seulement si le dataset brut a changé (see src/dashboard_data.py)
+df = load_dashboard_listings(rebuild="--rebuild-cache" in sys.argv[1:])
+
+# Cube d'agrégats (region × province × locality × subtype), construit une fois au démarrage :
+# les callbacks lisent le cube au lieu de rescanner les annonces
+cube = AggregateCube.from_listings(df)
+
+# Géométries des régions et des provinces : store local pré-simplifié (hors ligne, see data/geo),
+# sinon le GeoJSON distant pour les régions
+geo_store = GeoStore()
+try:
+    region_tolerance = geo_store.tolerance_for_zoom("region")
+except FileNotFoundError as e:
+    print(f"[WARNING] {e}, using the remote GeoJSON")
+    region_tolerance = None
+
+# Niveaux de la carte disponibles : les provinces seulement si leurs géométries sont dans le store
+MAP_LEVELS = ["region"] + (["province"] if geo_store.tolerances("province") else [])
+
+# Agrégation par région, et région de chaque province (celle qui a le plus d'annonces) pour le
+# graphique des provinces
+region_avg = cube.rollup(["region"])
+province_region_counts = cube.rollup(["province", "region"]).sort_values("count")
+province_regions = dict(zip(province_region_counts["province"], province_region_counts["region"]))
+
+@lru_cache(maxsize=16)
+def map_figure(level, tolerance):
+    """
+    Choropleth of the average price per region or province, with the geometries
+    simplified at a tolerance (cached per level and tolerance).
+
+    Args:
+        level (str): Map level, "region" or "province".
+        tolerance (float): Tolerance of the stored geometries, or None for the remote GeoJSON (regions only).
+
+    Returns:
+        plotly.graph_objects.Figure: The figure.
+    """
+    if tolerance is None:
+        geojson = "https://raw.githubusercontent.com/napoleon03/be-geojson/main/belgium_regions.geojson"
+        featureidkey = "properties.name"
+    else:
+        geojson, featureidkey = geo_store.get(level, tolerance), FEATURE_ID_KEY
+
+    fig = px.choropleth(
+        cube.rollup([level]),
+        geojson=geojson,
+        featureidkey=featureidkey,
+        locations=level,
+        color="avg_price",
+        color_continuous_scale="Blues",
+        title=f"💶 Average Property Price by {level.capitalize()}"
+    )
+    fig.update_geos(fitbounds="locations", visible=False)
+    # Keeps the user's zoom and pan when the geometries are swapped for more detailed ones
+    fig.update_layout(uirevision="map")
+    return fig
+
+fig_region = map_figure("region", region_tolerance)
+
+# Callbacks lents exécutés en arrière-plan (hors du thread de la requête) ; leurs résultats sont
+# mis en cache sur disque pour tous les workers, par arguments et par version du snapshot
+snapshot_key = json.dumps(read_snapshot_metadata(SNAPSHOT_FILE), sort_keys=True)
+background_callback_manager = DiskcacheManager(diskcache.Cache(CALLBACK_CACHE_DIR), cache_by=[lambda: snapshot_key])
 
 # Initialisation app
-app = Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP])
+app = Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP],
+           background_callback_manager=background_callback_manager)
 app.title = "Belgium Real Estate"
 
+# Serveur WSGI pour la production, e.g. gunicorn src.carte_region:server --workers 4 --threads 4
+server = app.server
+
 # Layout responsive
 app.layout = dbc.Container(fluid=True, children=[
     dbc.Row([
@@ -66,7 +101,17 @@ app.layout = dbc.Container(fluid=True, children=[
             dbc.Card([
                 dbc.CardHeader("Choropleth Map"),
                 dbc.CardBody([
-                    dcc.Graph(id="map", figure=fig_region, config={"displayModeBar": False})
+                    dcc.RadioItems(
+                        id="map-level",
+                        options=[{"label": f" {level.capitalize()}", "value": level, "disabled": level not in MAP_LEVELS}
+                                 for level in ["region", "province"]],
+                        value="region",
+                        inline=True,
+                        inputStyle={"margin-left": "12px"}
+                    ),
+                    dcc.Graph(id="map", figure=fig_region, config={"displayModeBar": False}),
+                    # Tolerance of the geometries currently drawn (see update_map_detail())
+                    dcc.Store(id="map-tolerance", data=region_tolerance)
                 ])
             ])
         ], md=6, lg=4),  # Carte prend 1/3
@@ -82,17 +127,18 @@ app.layout = dbc.Container(fluid=True, children=[
 ], style={"padding": "20px"})
 
 
-@app.callback(
-    Output("province-bar", "figure"),
-    Input("map", "clickData")
-)
-def update_province_chart(clickData):
-    if not clickData:
-        return px.bar(title="Click on a region to explore provinces")
+@lru_cache(maxsize=256)
+def province_figure(region):
+    """
+    Bar chart of the average price per province of a region (cached per region).
+
+    Args:
+        region (str): Region name.
 
-    region = clickData["points"][0]["location"]
-    province_avg = df[df["region"] == region].groupby("province").agg(
-        avg_price=("price", "mean")).reset_index()
+    Returns:
+        plotly.graph_objects.Figure: The figure.
+    """
+    province_avg = cube.rollup(["province"], region=region)
 
     fig = px.bar(
         province_avg,
@@ -105,5 +151,69 @@ def update_province_chart(clickData):
     )
     return fig
 
+# Graphique affiché tant qu'aucune région n'est sélectionnée (construit une seule fois)
+EMPTY_PROVINCE_FIGURE = px.bar(title="Click on a region to explore provinces")
+
+def precompute_province_figures():
+    """
+    Build the province figure of every region and the map of every zoom level, so that
+    no user waits for one to be built.
+
+    Runs in a background thread at startup: the dashboard answers requests meanwhile,
+    and a region clicked before its figure is ready is built on demand.
+
+    Returns:
+        None
+    """
+    start = time.perf_counter()
+    regions = region_avg["region"].tolist()
+    for region in regions:
+        province_figure(region)
+    # Maps of every level and zoom level as well
+    if region_tolerance is not None:
+        for level in MAP_LEVELS:
+            for tolerance in geo_store.tolerances(level):
+                map_figure(level, tolerance)
+    print(f"[INFO] Precomputed the province figures of {len(regions)} regions in {time.perf_counter() - start:.2f}s")
+
+threading.Thread(target=precompute_province_figures, name="precompute-province-figures", daemon=True).start()
+
+@app.callback(
+    Output("province-bar", "figure"),
+    Input("map", "clickData"),
+    background=True
+)
+def update_province_chart(clickData):
+    if not clickData:
+        return EMPTY_PROVINCE_FIGURE
+
+    # A province clicked on the province map shows the provinces of its region
+    location = clickData["points"][0]["location"]
+    return province_figure(province_regions.get(location, location))
+
+@app.callback(
+    Output("map", "figure"),
+    Output("map-tolerance", "data"),
+    Input("map-level", "value"),
+    Input("map", "relayoutData"),
+    State("map-tolerance", "data"),
+    prevent_initial_call=True,
+    background=True
+)
+def update_map_detail(level, relayoutData, tolerance):
+    # Draw the selected level, and swap the geometries for the stored tolerance matching the zoom level
+    if tolerance is None:
+        return no_update, no_update
+
+    scale = (relayoutData or {}).get("geo.projection.scale", 1.0)
+    if ctx.triggered_id == "map" and "geo.projection.scale" not in (relayoutData or {}):
+        return no_update, no_update
+
+    zoom_tolerance = geo_store.tolerance_for_zoom(level, scale)
+    if ctx.triggered_id == "map" and zoom_tolerance == tolerance:
+        return no_update, no_update
+    return map_figure(level, zoom_tolerance), zoom_tolerance
+
 if __name__ == "__main__":
-    app.run_server(debug=True)
\ No newline at end of file
+    # Serveur de développement ; en production, servir `server` avec un serveur WSGI multi-workers
+    app.run(debug=True)
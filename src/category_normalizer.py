@@ -0,0 +1,193 @@
+import numpy as np
+import pandas as pd
+
+# Value of the string columns for missing entries, and its normalized code
+MISSING_VALUE = "missing value"
+MISSING_CODE = -1
+
+# Normalization mappings (textual category → numerical code)
+BUILDING_CONDITIONS = {
+    MISSING_VALUE: MISSING_CODE,
+    "GOOD": 1,
+    "AS_NEW": 2,
+    "TO_RENOVATE": 3, 
+    "TO_BE_DONE_UP": 4,
+    "JUST_RENOVATED": 5,
+    "TO_RESTORE": 6
+}
+
+EPC_SCORES = {
+    MISSING_VALUE: MISSING_CODE,
+    'A++': 1,
+    'A+': 2,
+    'A': 3,
+    'B': 4,
+    'C': 5,
+    'D': 6,
+    'E': 7,
+    'F': 8,
+    'G': 9,
+    'G_C': 9, # for ranges, we take the lowest score ()
+    'F_D': 8,
+    'C_A': 5,
+    'F_C': 8,
+    'E_C': 7,
+    'C_B': 5,
+    'E_D': 7,
+    'G_F': 9,
+    'D_C': 6,
+    'G_E': 9,
+    'X': 0
+}
+
+HEATING_TYPES = {
+    MISSING_VALUE: MISSING_CODE,
+    'GAS': 1,
+    'FUELOIL': 2,
+    'ELECTRIC': 3,
+    'PELLET': 4,
+    'WOOD': 5,
+    'SOLAR': 6,
+    'CARBON': 7
+}
+
+FLOOD_ZONE_TYPES = {
+    MISSING_VALUE: MISSING_CODE,
+    'NON_FLOOD_ZONE': 1,
+    'POSSIBLE_FLOOD_ZONE': 2,
+    'RECOGNIZED_FLOOD_ZONE': 3,
+    'RECOGNIZED_N_CIRCUMSCRIBED_FLOOD_ZONE': 4,
+    'CIRCUMSCRIBED_WATERSIDE_ZONE': 5,
+    'CIRCUMSCRIBED_FLOOD_ZONE': 6,
+    'POSSIBLE_N_CIRCUMSCRIBED_FLOOD_ZONE': 7,
+    'POSSIBLE_N_CIRCUMSCRIBED_WATERSIDE_ZONE': 8,
+    'RECOGNIZED_N_CIRCUMSCRIBED_WATERSIDE_FLOOD_ZONE': 9
+}
+
+KITCHEN_TYPES = {
+    MISSING_VALUE: MISSING_CODE,
+    'NOT_INSTALLED': 0,
+    'SEMI_EQUIPPED': 1,
+    'INSTALLED': 2,
+    'HYPER_EQUIPPED': 3,
+    'USA_UNINSTALLED': 0,
+    'USA_SEMI_EQUIPPED': 1,
+    'USA_INSTALLED': 2,
+    'USA_HYPER_EQUIPPED': 3
+}
+
+# Categorical column → (normalized column, mapping)
+NORMALIZATION_MAPPINGS = {
+    "buildingCondition": ("buildingConditionNormalize", BUILDING_CONDITIONS),
+    "epcScore": ("epcScoreNormalize", EPC_SCORES),
+    "heatingType": ("heatingTypeNormalize", HEATING_TYPES),
+    "floodZoneType": ("floodZoneTypeNormalize", FLOOD_ZONE_TYPES),
+    "kitchenType": ("kitchenTypeNormalize", KITCHEN_TYPES)
+}
+
+class CategoryNormalizer:
+    """
+    Normalize categorical columns by mapping textual categories to numerical codes.
+
+    Each mapping is compiled once into a lookup Series. A column is then normalized by
+    dictionary-encoding it (pd.factorize), mapping only its distinct values through the
+    lookup, and taking the result by code, so no per-row Python work or Series.replace()
+    is involved. Categories missing from a mapping are not left as strings: they get the
+    missing code and are counted in a report (see unknown_categories()).
+
+    Works on the output of DataCleanner.clean_errors() as well as on any DataFrame with
+    the mapped columns (e.g. a cleaned CSV file or a raw chunk): values are stripped and
+    NaN is treated as "missing value".
+    """
+
+    def __init__(self, mappings: dict = None) -> None:
+        """
+        Initialize the normalizer.
+
+        Args:
+            mappings (dict, optional): Column → (normalized column, {category: code}).
+                                       Defaults to NORMALIZATION_MAPPINGS.
+        """
+        mappings = NORMALIZATION_MAPPINGS if mappings is None else mappings
+        self._compiled = {
+            col: (normalized_col, pd.Series(mapping, dtype="int64"))
+            for col, (normalized_col, mapping) in mappings.items()
+        }
+        self._unknown_counts = {}
+
+    def transform(self, df: pd.DataFrame, compact_dtypes: bool = False) -> pd.DataFrame:
+        """
+        Add the normalized column of every mapped column present in the DataFrame.
+
+        Args:
+            df (pd.DataFrame): DataFrame to normalize (modified in place).
+            compact_dtypes (bool): If True, normalized columns are Int8 with <NA> for missing
+                                   values; otherwise int64 with MISSING_CODE.
+
+        Returns:
+            pd.DataFrame: The DataFrame with the additional normalized columns.
+        """
+        for col, (normalized_col, lookup) in self._compiled.items():
+            if col not in df.columns:
+                continue
+
+            # Dictionary-encode the column: NaN gets code -1
+            codes, uniques = pd.factorize(df[col])
+            categories = pd.Index(uniques).astype(str).str.strip()
+            mapped = categories.map(lookup)
+
+            # Count the categories the mapping does not know
+            unknown = np.flatnonzero(pd.isna(mapped))
+            if len(unknown):
+                counts = np.bincount(codes[codes >= 0], minlength=len(categories))
+                for i in unknown:
+                    key = (col, categories[i])
+                    self._unknown_counts[key] = self._unknown_counts.get(key, 0) + int(counts[i])
+
+            # Last slot of the lookup array is taken by the -1 codes (NaN values)
+            values = np.append(np.asarray(mapped, dtype="float64"), np.nan)[codes]
+            if compact_dtypes:
+                values[values == MISSING_CODE] = np.nan
+                df[normalized_col] = pd.array(values, dtype="Int8")
+            else:
+                df[normalized_col] = np.nan_to_num(values, nan=MISSING_CODE).astype("int64")
+
+        return df
+
+    def unknown_categories(self) -> pd.DataFrame:
+        """
+        Summary of the categories found in the data but missing from the mappings.
+
+        Counts accumulate over every transform() call (e.g. over all the chunks of a file)
+        until reset_report() is called.
+
+        Returns:
+            pd.DataFrame: One row per unknown category, with columns
+                          ['column', 'category', 'count'], most frequent first.
+        """
+        report = pd.DataFrame(
+            [(col, category, count) for (col, category), count in self._unknown_counts.items()],
+            columns=["column", "category", "count"]
+        )
+        return report.sort_values(["count", "column"], ascending=[False, True], ignore_index=True)
+
+    def reset_report(self) -> None:
+        """
+        Clear the unknown categories counted so far.
+
+        Returns:
+            None
+        """
+        self._unknown_counts = {}
+
+    def print_report(self) -> None:
+        """
+        Print the unknown categories summary (nothing if every category was known).
+
+        Returns:
+            None
+        """
+        report = self.unknown_categories()
+        if not report.empty:
+            print(f"[WARNING] {int(report['count'].sum())} values with unknown categories normalized as missing:")
+            print(report.to_string(index=False))
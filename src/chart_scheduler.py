@@ -0,0 +1,216 @@
+import json
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+import matplotlib
+import pandas as pd
+from src.data_analysis_plots import (plot_missing_values_percentage, plot_correlations_to_price,
+                                     plot_count_features_correlations, plot_outliers)
+from src.surface import plot_surface_histogram, plot_big_surface_boxplot
+from src import most_expensive_region, less_expensive_region
+from src.snapshot import write_snapshot, read_snapshot
+from src.data_profile import DataProfile
+
+class ChartJob:
+    """
+    One chart to render: a plotting function called as func(df, **kwargs).
+
+    The function must be defined at module level (so worker processes can import it),
+    and must save the chart itself, to output_path.
+    """
+
+    def __init__(self, name: str, func, output_path: str, **kwargs) -> None:
+        """
+        Initialize the job.
+
+        Args:
+            name (str): Chart name, used in the report.
+            func (Callable): Plotting function, called as func(df, **kwargs).
+            output_path (str): File the chart is saved to (reported only; pass it to the
+                               function through kwargs under the name it expects).
+            **kwargs: Keyword arguments of the plotting function.
+        """
+        self.name = name
+        self.func = func
+        self.output_path = output_path
+        self.kwargs = kwargs
+
+def default_chart_jobs(median_accuracy: float = None, profile: DataProfile = None) -> list:
+    """
+    Build the jobs of the 14 charts generated by main.py.
+
+    Args:
+        median_accuracy (float, optional): Maximal relative error of the approximate medians
+                                           of the region charts. None (default) for exact medians.
+        profile (DataProfile, optional): Persisted data-quality profile, read by the missing
+                                         values chart instead of scanning the data.
+
+    Returns:
+        list[ChartJob]: The chart jobs, in the order main.py renders them.
+    """
+    jobs = [
+        ChartJob("missing_values_percentage", plot_missing_values_percentage,
+                 "plots/01_missing_values_percentage.png",
+                 plot_file_path="plots/01_missing_values_percentage.png", show_plot=False, profile=profile),
+        ChartJob("correlation_with_price", plot_correlations_to_price,
+                 "plots/02_correlation_with_variable_price.png",
+                 plot_file_path="plots/02_correlation_with_variable_price.png", show_plot=False),
+        ChartJob("count_features_correlations", plot_count_features_correlations,
+                 "plots/03_count_features_correlations.png",
+                 plot_file_path="plots/03_count_features_correlations.png", show_plot=False),
+        ChartJob("outliers", plot_outliers, "plots/04_outliers.png",
+                 plot_file_path="plots/04_outliers.png", show_plot=False),
+        ChartJob("histogram_surface", plot_surface_histogram, "plots/05_histogram_surface.png",
+                 plot_file_path="plots/05_histogram_surface.png", show_plot=False),
+        ChartJob("big_surface_boxplot", plot_big_surface_boxplot, "plots/06_big_surface_boxplot.png",
+                 min_surface=1000, plot_file_path="plots/06_big_surface_boxplot.png", show_plot=False)
+    ]
+
+    for region, path in most_expensive_region.REGION_FILES.items():
+        jobs.append(ChartJob(f"top_expensive_{region.lower()}",
+                             most_expensive_region.generate_expensive_municipality_chart,
+                             path, region=region, save_path=path, show_plot=False,
+                             median_accuracy=median_accuracy))
+
+    for region, path in less_expensive_region.REGION_FILES.items():
+        jobs.append(ChartJob(f"least_expensive_{region.lower()}",
+                             less_expensive_region.generate_least_expensive_chart,
+                             path, region=region, save_path=path, show_plot=False,
+                             median_accuracy=median_accuracy))
+
+    return jobs
+
+# DataFrame shared by the jobs of a worker process (see _init_worker())
+_worker_df = None
+
+def _init_worker(snapshot_path: str) -> None:
+    """
+    Set up a worker process: headless backend and the shared read-only DataFrame.
+
+    Args:
+        snapshot_path (str): Feather file holding the DataFrame.
+    """
+    global _worker_df
+    os.environ["MPLBACKEND"] = "Agg"
+    matplotlib.use("Agg")
+    _worker_df = read_snapshot(snapshot_path)
+
+def _render_job(job: ChartJob, df: pd.DataFrame = None) -> dict:
+    """
+    Render one job and time it.
+
+    Args:
+        job (ChartJob): The job to render.
+        df (pd.DataFrame, optional): Data of the job. Defaults to the worker's shared DataFrame.
+
+    Returns:
+        dict: Report entry with keys 'chart', 'path', 'seconds', 'generated' (whether the
+              file was written), 'bytes' (its size) and 'error' (None on success).
+    """
+    import matplotlib.pyplot as plt
+
+    if df is None:
+        df = _worker_df
+
+    started_at = time.time()
+    start = time.perf_counter()
+    error = None
+    try:
+        job.func(df, **job.kwargs)
+    except Exception as e:
+        error = str(e)
+    finally:
+        plt.close("all")
+    seconds = time.perf_counter() - start
+
+    # Only count the file if this run wrote it (not a leftover from a previous run)
+    generated = os.path.exists(job.output_path) and os.path.getmtime(job.output_path) >= int(started_at)
+
+    return {
+        "chart": job.name,
+        "path": job.output_path,
+        "seconds": round(seconds, 3),
+        "generated": generated,
+        "bytes": os.path.getsize(job.output_path) if generated else None,
+        "error": error
+    }
+
+def render_charts(df: pd.DataFrame, jobs: list, workers: int = None) -> list:
+    """
+    Render chart jobs headless (Agg backend), in parallel across a process pool.
+
+    The DataFrame is written once to a memory-mapped Feather snapshot that every worker
+    reads, instead of being pickled and sent with each job. Results are reported in job
+    order whatever the completion order, and each chart is rendered in a fresh figure,
+    so the output does not depend on scheduling. With a single worker, the jobs are
+    rendered one after another in the current process (which must already use a
+    non-interactive backend), without snapshot.
+
+    Args:
+        df (pd.DataFrame): Data shared (read-only) by all the jobs.
+        jobs (list[ChartJob]): Charts to render.
+        workers (int, optional): Number of worker processes. Defaults to the CPU count.
+
+    Returns:
+        list[dict]: One report entry per job (see _render_job()), in job order.
+    """
+    if not jobs:
+        return []
+
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    for job in jobs:
+        os.makedirs(os.path.dirname(job.output_path) or ".", exist_ok=True)
+
+    start = time.perf_counter()
+    if workers == 1:
+        results = [_render_job(job, df) for job in jobs]
+    else:
+        snapshot_dir = tempfile.mkdtemp(prefix="charts-")
+        snapshot_path = os.path.join(snapshot_dir, "data.feather")
+        try:
+            write_snapshot(df, snapshot_path)
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(snapshot_path,)) as executor:
+                results = list(executor.map(_render_job, jobs))
+        finally:
+            shutil.rmtree(snapshot_dir, ignore_errors=True)
+    total = time.perf_counter() - start
+
+    for result in results:
+        if result["error"]:
+            print(f"[ERROR] {result['chart']} failed after {result['seconds']:.2f}s => {result['error']}")
+        elif not result["generated"]:
+            print(f"[WARNING] {result['chart']} produced no file ({result['seconds']:.2f}s)")
+        else:
+            print(f"✅ {result['chart']} rendered in {result['seconds']:.2f}s → {result['path']}")
+    print(f"[INFO] Rendered {len(results)} charts in {total:.2f}s with {workers} worker(s).")
+
+    return results
+
+def write_manifest(results: list, manifest_path: str, **metadata) -> dict:
+    """
+    Write the manifest of a rendering run as a JSON file.
+
+    Args:
+        results (list[dict]): Report entries returned by render_charts().
+        manifest_path (str): Destination file path.
+        **metadata: Extra top-level fields (e.g. the number of workers).
+
+    Returns:
+        dict: The manifest.
+    """
+    manifest = {
+        **metadata,
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "chart_seconds": round(sum(result["seconds"] for result in results), 3),
+        "charts": results
+    }
+
+    os.makedirs(os.path.dirname(manifest_path) or ".", exist_ok=True)
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    print(f"[SUCCESS] Manifest of {len(results)} charts saved → {manifest_path}")
+
+    return manifest
@@ -0,0 +1,153 @@
+import numpy as np
+import pandas as pd
+from src.outliers import numeric_columns
+
+class CorrelationStats:
+    """
+    Pearson correlations of numeric columns, from sufficient statistics.
+
+    For every pair of columns (i, j), the statistics hold, over the rows where both are
+    present (pairwise-complete, like DataFrame.corr()): the number of rows, the sums
+    and sums of squares of i and j, and the sum of their products. They are computed
+    in a single pass of matrix products and are additive, so appending listings only
+    adds the statistics of the new rows. Any correlation submatrix or single-target
+    vector is then derived from them without touching the data.
+
+    Values are shifted by a fixed per-column offset (the means of the first batch)
+    before being accumulated, which keeps the sums of squares numerically stable.
+    """
+
+    # Statistics shared by the callers working on the same DataFrame (see shared())
+    _shared = None
+    _shared_df = None
+
+    def __init__(self, columns: list, shift: np.ndarray) -> None:
+        """
+        Initialize empty statistics.
+
+        Args:
+            columns (list[str]): Numeric columns covered.
+            shift (np.ndarray): Offset subtracted from every column before accumulating.
+        """
+        self.columns = list(columns)
+        self.shift = np.asarray(shift, dtype="float64")
+        size = len(self.columns)
+        self.n = np.zeros((size, size))
+        self.sums = np.zeros((size, size))           # sums[i, j]: sum of i where j is present too
+        self.squares = np.zeros((size, size))        # squares[i, j]: sum of i² where j is present too
+        self.products = np.zeros((size, size))       # products[i, j]: sum of i × j
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "CorrelationStats":
+        """
+        Compute the statistics of every numeric column of a DataFrame.
+
+        Args:
+            df (pd.DataFrame): Dataset (only its numeric columns are used).
+
+        Returns:
+            CorrelationStats: The statistics.
+        """
+        numeric_df = numeric_columns(df)
+        shift = np.nan_to_num(numeric_df.mean().to_numpy())
+        stats = cls(numeric_df.columns, shift)
+        stats.update(numeric_df)
+        return stats
+
+    @classmethod
+    def shared(cls, df: pd.DataFrame) -> "CorrelationStats":
+        """
+        Get the statistics of a DataFrame, reusing the last ones built for the same object.
+
+        Lets the correlation charts share a single pass over the data.
+
+        Args:
+            df (pd.DataFrame): Dataset.
+
+        Returns:
+            CorrelationStats: The statistics.
+        """
+        if cls._shared is None or cls._shared_df is not df:
+            cls._shared, cls._shared_df = cls.from_frame(df), df
+        return cls._shared
+
+    def update(self, df: pd.DataFrame) -> None:
+        """
+        Add rows (e.g. newly appended listings) to the statistics.
+
+        Args:
+            df (pd.DataFrame): Rows with (at least) the covered columns.
+
+        Returns:
+            None
+        """
+        values = df[self.columns].to_numpy(dtype="float64", na_value=np.nan) - self.shift
+        present = ~np.isnan(values)
+        values = np.where(present, values, 0.0)
+        present = present.astype("float64")
+
+        self.n += present.T @ present
+        self.sums += values.T @ present
+        self.squares += (values * values).T @ present
+        self.products += values.T @ values
+
+    def merge(self, other: "CorrelationStats") -> None:
+        """
+        Add the statistics of other rows (e.g. another chunk) computed with the same columns.
+
+        Args:
+            other (CorrelationStats): Statistics to merge.
+
+        Returns:
+            None
+
+        Raises:
+            ValueError: If the statistics do not cover the same columns.
+        """
+        if other.columns != self.columns:
+            raise ValueError("Cannot merge correlation statistics of different columns.")
+
+        # Re-express the other statistics with this shift: x - a = (x - b) + (b - a)
+        delta = other.shift - self.shift
+        n, sums = other.n, other.sums + delta[:, None] * other.n
+        self.squares += other.squares + 2 * delta[:, None] * other.sums + delta[:, None] ** 2 * other.n
+        self.products += (other.products + delta[:, None] * other.sums.T + delta[None, :] * other.sums
+                          + np.outer(delta, delta) * other.n)
+        self.n += n
+        self.sums += sums
+
+    def corr(self, columns: list = None) -> pd.DataFrame:
+        """
+        Pairwise-complete Pearson correlation matrix, like DataFrame.corr().
+
+        Args:
+            columns (list[str], optional): Columns of the submatrix. Defaults to all of them.
+
+        Returns:
+            pd.DataFrame: Correlation matrix (NaN where fewer than 2 rows or no variance).
+        """
+        columns = self.columns if columns is None else list(columns)
+        idx = [self.columns.index(col) for col in columns]
+        grid = np.ix_(idx, idx)
+
+        n, sums, squares, products = self.n[grid], self.sums[grid], self.squares[grid], self.products[grid]
+        covariance = n * products - sums * sums.T
+        variance_i = n * squares - sums ** 2
+        with np.errstate(divide="ignore", invalid="ignore"):
+            corr = covariance / np.sqrt(variance_i * variance_i.T)
+        corr[(n < 2) | (variance_i <= 0) | (variance_i.T <= 0)] = np.nan
+        return pd.DataFrame(np.clip(corr, -1, 1), index=columns, columns=columns)
+
+    def corr_with(self, target: str, columns: list = None) -> pd.Series:
+        """
+        Correlations of the columns with a single target column.
+
+        Args:
+            target (str): Target column (e.g. 'price').
+            columns (list[str], optional): Columns to correlate. Defaults to all the others.
+
+        Returns:
+            pd.Series: Correlation of every column with the target, indexed by column.
+        """
+        columns = [col for col in self.columns if col != target] if columns is None else list(columns)
+        return self.corr(columns + [target])[target].drop(target)
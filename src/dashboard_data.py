@@ -0,0 +1,185 @@
+import argparse
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+import pandas as pd
+from filelock import FileLock
+from src.data_cleanner import DataCleanner
+from src.dataset_cache import DatasetCache, RAW_DATA_FILE
+from src.regions import map_postcodes_to_region
+from src.snapshot import write_snapshot, read_snapshot, read_snapshot_metadata
+
+# Pre-filtered listings of the dashboard, with the derived columns materialized
+SNAPSHOT_FILE = "data/cache/dashboard.feather"
+
+# Version of the dashboard filters; bump it when prepare_dashboard_listings() changes
+SNAPSHOT_VERSION = 1
+
+# Columns kept in the snapshot (strings are dictionary-encoded)
+DASHBOARD_COLUMNS = ["region", "province", "locality", "subtype", "postCode",
+                     "price", "habitableSurface", "price_per_m2"]
+CATEGORY_COLUMNS = ["region", "province", "locality", "subtype"]
+
+def prepare_dashboard_listings(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Filter the cleaned listings for the dashboard and derive its columns.
+
+    Keeps the listings priced in (10,000, 1,000,000) € with a habitable surface above
+    10 m², and adds the 'price_per_m2' and 'region' columns.
+
+    Args:
+        df (pd.DataFrame): Cleaned listings.
+
+    Returns:
+        pd.DataFrame: The DASHBOARD_COLUMNS of the kept listings.
+    """
+    df = df[
+        (df["price"].notna()) & (df["price"] > 10000) & (df["price"] < 1_000_000) &
+        (df["habitableSurface"].notna()) & (df["habitableSurface"] > 10)
+    ]
+    df = df.assign(
+        price_per_m2=df["price"] / df["habitableSurface"],
+        region=map_postcodes_to_region(df["postCode"])
+    )
+    return df[DASHBOARD_COLUMNS].astype({col: "category" for col in CATEGORY_COLUMNS})
+
+def _source_signature(raw_file_path: str, cleaner: DataCleanner) -> dict:
+    # Compared with the snapshot's metadata: the raw file's size and modification time,
+    # the cleaning rules and options (CLEANING_VERSION, as in the cleaned-data cache key)
+    # and the version of the dashboard filters
+    stat = os.stat(raw_file_path)
+    return {"source_size": str(stat.st_size), "source_mtime": str(int(stat.st_mtime)),
+            "cleaning_rules": cleaner.rules_key(), "snapshot_version": str(SNAPSHOT_VERSION)}
+
+def build_dashboard_snapshot(snapshot_path: str = SNAPSHOT_FILE, cache: DatasetCache = None) -> pd.DataFrame:
+    """
+    Build the dashboard snapshot from the cleaned dataset.
+
+    Args:
+        snapshot_path (str): Destination Feather file.
+        cache (DatasetCache, optional): Cache of cleaned datasets. Defaults to the default cache.
+
+    Returns:
+        pd.DataFrame: The snapshot's listings.
+    """
+    cleaner = DataCleanner(RAW_DATA_FILE, cache=cache or DatasetCache())
+    listings = prepare_dashboard_listings(cleaner.normalization())
+
+    # Written aside then renamed, so workers starting together never read a partial file
+    os.makedirs(os.path.dirname(snapshot_path) or ".", exist_ok=True)
+    tmp_path = f"{snapshot_path}.{os.getpid()}.tmp"
+    write_snapshot(listings, tmp_path, _source_signature(RAW_DATA_FILE, cleaner))
+    os.replace(tmp_path, snapshot_path)
+    print(f"[INFO] Dashboard snapshot ({len(listings)} rows) → {snapshot_path}")
+    return listings
+
+def _snapshot_is_current(snapshot_path: str) -> bool:
+    # Whether the snapshot exists and was built from the current raw file and cleaning rules
+    if not Path(snapshot_path).exists():
+        return False
+    try:
+        if read_snapshot_metadata(snapshot_path) == _source_signature(RAW_DATA_FILE, DataCleanner(RAW_DATA_FILE)):
+            return True
+        print("[INFO] Dashboard snapshot is out of date.")
+    except Exception as e:
+        print(f"[WARNING] Ignoring unreadable dashboard snapshot: {e}")
+    return False
+
+def load_dashboard_listings(snapshot_path: str = SNAPSHOT_FILE, rebuild: bool = False) -> pd.DataFrame:
+    """
+    Load the dashboard listings from the memory-mapped snapshot, building it first if
+    it is missing, older than the raw dataset or built with other cleaning rules.
+
+    Dashboard workers loading the same snapshot share its pages through the OS page
+    cache instead of each parsing and holding its own copy of the dataset. Workers
+    finding the snapshot out of date rebuild it one at a time (under a file lock), so
+    the first one rebuilds it and the others load its result. Without the raw dataset
+    (e.g. a deployment shipping the snapshot only), the existing snapshot is used as is.
+
+    Args:
+        snapshot_path (str): Snapshot Feather file.
+        rebuild (bool): If True, rebuild the snapshot (and the cleaned dataset) first.
+
+    Returns:
+        pd.DataFrame: Filtered listings with the DASHBOARD_COLUMNS.
+
+    Raises:
+        FileNotFoundError: If neither the raw dataset nor the snapshot exists.
+    """
+    if not os.path.exists(RAW_DATA_FILE):
+        if not Path(snapshot_path).exists():
+            raise FileNotFoundError(f"Neither the raw dataset ({RAW_DATA_FILE}) nor the dashboard snapshot "
+                                    f"({snapshot_path}) exists.")
+        print(f"[WARNING] Raw dataset not found ({RAW_DATA_FILE}), using the existing dashboard snapshot.")
+        return read_snapshot(snapshot_path)
+
+    if not rebuild and _snapshot_is_current(snapshot_path):
+        return read_snapshot(snapshot_path)
+
+    os.makedirs(os.path.dirname(snapshot_path) or ".", exist_ok=True)
+    with FileLock(f"{snapshot_path}.lock"):
+        # Another worker may have rebuilt it while this one was waiting for the lock
+        if rebuild or not _snapshot_is_current(snapshot_path):
+            build_dashboard_snapshot(snapshot_path, DatasetCache(rebuild=rebuild))
+    return read_snapshot(snapshot_path)
+
+def current_rss_mb() -> float:
+    """
+    Resident set size of the current process (Linux), in MB.
+
+    Returns:
+        float: RSS in MB, or NaN where /proc is not available.
+    """
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return float("nan")
+
+# Startup paths compared by benchmark_startup(), each run in a fresh process
+_STARTUP_CODE = {
+    "csv": ("import pandas as pd; from src.dashboard_data import prepare_dashboard_listings; "
+            "df = prepare_dashboard_listings(pd.read_csv('data/data_cleanned.csv'))"),
+    "snapshot": "from src.dashboard_data import load_dashboard_listings; df = load_dashboard_listings()"
+}
+
+def benchmark_startup() -> dict:
+    """
+    Measure the startup time and RSS of a dashboard worker loading its data from the
+    cleaned CSV versus from the snapshot.
+
+    Each path runs in a fresh Python process (from the repository root), as a worker would.
+
+    Returns:
+        dict: For each path, the load time in seconds and the RSS in MB after loading.
+    """
+    results = {}
+    for name, code in _STARTUP_CODE.items():
+        script = ("import time; start = time.perf_counter(); " + code + "; "
+                  "from src.dashboard_data import current_rss_mb; "
+                  "print(time.perf_counter() - start, current_rss_mb(), len(df))")
+        output = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+        seconds, rss, rows = output.stdout.strip().splitlines()[-1].split()
+        results[name] = {"seconds": round(float(seconds), 3), "rss_mb": round(float(rss), 1), "rows": int(rows)}
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the dashboard snapshot and/or benchmark the dashboard startup.")
+    parser.add_argument("--rebuild-cache", action="store_true",
+                        help="ignore the cached cleaned dataset and clean the raw file again")
+    parser.add_argument("--benchmark", action="store_true",
+                        help="compare the startup time and RSS of loading the CSV and the snapshot")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    build_dashboard_snapshot(SNAPSHOT_FILE, DatasetCache(rebuild=args.rebuild_cache))
+    print(f"[INFO] Built in {time.perf_counter() - start:.2f}s")
+
+    if args.benchmark:
+        for name, result in benchmark_startup().items():
+            print(f"[INFO] {name:>8}: {result['rows']} rows loaded in {result['seconds']:.3f}s, RSS {result['rss_mb']:.1f} MB")
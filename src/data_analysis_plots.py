@@ -3,10 +3,12 @@ import matplotlib.pyplot as plt
 import matplotlib
 import pandas as pd
 import matplotlib.patches as mpatches
+from src.outliers import numeric_columns, box_statistics, outlier_mask
+from src.box_stats import sample_fliers, draw_boxes
+from src.correlation import CorrelationStats
+from src.data_profile import DataProfile
 
-matplotlib.use('TkAgg')
-
-def data_analysis_charts(df: pd.DataFrame, show_plot: bool):
+def data_analysis_charts(df: pd.DataFrame, show_plot: bool, profile: DataProfile = None):
     """
     Generate a series of exploratory data analysis charts on the dataset.
 
@@ -19,13 +21,15 @@ def data_analysis_charts(df: pd.DataFrame, show_plot: bool):
     Args:
         df (pd.DataFrame): The input dataset for analysis.
         show_plot (bool): Whether to display the plots interactively.
+        profile (DataProfile, optional): Persisted data-quality profile of the dataset
+                                         (see DataCleanner.profile()).
 
     Returns:
         None
     """
 
     # Plot missing values percentages
-    plot_missing_values_percentage(df, "plots/01_missing_values_percentage.png", show_plot)
+    plot_missing_values_percentage(df, "plots/01_missing_values_percentage.png", show_plot, profile)
 
     # Plot correlations to price
     plot_correlations_to_price(df, "plots/02_correlation_with_variable_price.png", show_plot)
@@ -37,7 +41,8 @@ def data_analysis_charts(df: pd.DataFrame, show_plot: bool):
     # Plot the outliers
     plot_outliers(df, "plots/04_outliers.png", show_plot)
 
-def plot_missing_values_percentage(df: pd.DataFrame, plot_file_path: str, show_plot: bool) -> None:
+def plot_missing_values_percentage(df: pd.DataFrame, plot_file_path: str, show_plot: bool,
+                                   profile: DataProfile = None) -> None:
     """
     Plot a horizontal bar chart showing the percentage of missing values per feature.
 
@@ -45,14 +50,19 @@ def plot_missing_values_percentage(df: pd.DataFrame, plot_file_path: str, show_p
         df (pd.DataFrame): Dataset containing features to analyze for missing data.
         plot_file_path (str): Path to save the plot image file. If empty or None, plot is not saved.
         show_plot (bool): Whether to display the plot interactively.
+        profile (DataProfile, optional): Persisted profile of the cleaned dataset (see
+                                         DataCleanner.profile()), read instead of scanning df.
+                                         Its -1 sentinels count as missing, as in to_real_values().
 
     Returns:
         None
     """
     try:
-        # Calculate missing data information
-        missing_data = df.isna().sum()
-        missing_pct = (missing_data / len(df)) * 100
+        # Missing data information, from the persisted profile when available
+        if profile is not None:
+            missing_pct = profile.summary(sentinel_as_missing=True)["Missing %"]
+        else:
+            missing_pct = DataProfile.from_frame(df).summary()["Missing %"]
 
         # Filter to features with missing values
         missing_df = missing_pct[missing_pct > 0].sort_values(ascending=False)
@@ -91,12 +101,16 @@ def plot_missing_values_percentage(df: pd.DataFrame, plot_file_path: str, show_p
 
     except Exception as e:
         print(f"[ERRO] Failed to plot Missing Values Percentage => {e}")
+    finally:
+        # Release the figure once it is saved (and shown)
+        plt.close()
 
 def plot_correlations_to_price(df: pd.DataFrame, plot_file_path: str, show_plot: bool) -> None:
     """
     Plot the correlation coefficients of numeric features with the 'price' column.
 
     Only numeric columns are considered, and the correlation excludes 'price' itself.
+    Correlations come from statistics shared with the other correlation charts (see src/correlation.py).
 
     Args:
         df (pd.DataFrame): Dataset with numeric features and a 'price' column.
@@ -107,14 +121,8 @@ def plot_correlations_to_price(df: pd.DataFrame, plot_file_path: str, show_plot:
         None
     """
     try:
-        # Selecting only numeric columns
-        numeric_df = df.select_dtypes(include=["int64", "float64"])
-
-        # Calculation of the correlation matrix
-        corr_matrix = numeric_df.corr()
-
-        # Extracting correlations with 'price'
-        price_corr = corr_matrix["price"].drop("price").sort_values()
+        # Correlations of every numeric column with 'price', from the shared sufficient statistics
+        price_corr = CorrelationStats.shared(df).corr_with("price").sort_values()
 
         # Plotting the correlations
         plt.figure(figsize=(10, 6))
@@ -143,13 +151,17 @@ def plot_correlations_to_price(df: pd.DataFrame, plot_file_path: str, show_plot:
 
     except Exception as e:
         print(f"[ERRO] Failed to plot correlations with the the variable 'price' => {e}")
+    finally:
+        # Release the figure once it is saved (and shown)
+        plt.close()
 
 def plot_outliers(df: pd.DataFrame, plot_file_path: str, show_plot: bool) -> None:
     """
     Detect and visualize outliers in numeric features using boxplots.
 
-    Uses the Interquartile Range (IQR) method to count outliers per feature,
-    annotates counts on the plot, and colors extreme outlier counts differently.
+    Uses the Interquartile Range (IQR) method to count outliers per feature (see
+    src/outliers.py), draws the boxes from these precomputed statistics, annotates
+    counts on the plot, and colors extreme outlier counts differently.
 
     Args:
         df (pd.DataFrame): Dataset containing numeric features.
@@ -160,58 +172,41 @@ def plot_outliers(df: pd.DataFrame, plot_file_path: str, show_plot: bool) -> Non
         None
     """
     try:
-        # Select only numeric columns
-        numeric_df = df.select_dtypes(include=["int64", "float64"])
-
-        # Detect columns with outliers using the IQR method
-        def outlier_count(series):
-            Q1 = series.quantile(0.25)
-            Q3 = series.quantile(0.75)
-            IQR = Q3 - Q1
-            lower = Q1 - 1.5 * IQR
-            upper = Q3 + 1.5 * IQR
-            return ((series < lower) | (series > upper)).sum()
-
-        # Create a dictionary with outlier counts
-        outlier_counts = {col: outlier_count(numeric_df[col]) for col in numeric_df.columns}
-        print(outlier_count)
-        columns_with_outliers = {col: count for col, count in outlier_counts.items() if count > 0}
-        print(columns_with_outliers)
-
-        # Filter DataFrame
-        filtered_df = numeric_df[list(columns_with_outliers.keys())]
-
-        # Melt the dataframe into long format
-        melted = filtered_df.melt(var_name="Feature", value_name="Value")
-
-        # Sort features by number of outliers for better readability
-        sorted_features = sorted(columns_with_outliers.items(), key=lambda x: x[1], reverse=True)
-        feature_order = [feat for feat, _ in sorted_features]
+        # Box statistics of every numeric column (quantiles, IQR bounds, whiskers, outlier counts)
+        numeric_df = numeric_columns(df)
+        stats = box_statistics(numeric_df)
+
+        # Keep the columns with outliers, sorted by number of outliers for better readability
+        stats = stats[stats["outliers"] > 0].sort_values("outliers", ascending=False, kind="stable")
+        mask = outlier_mask(numeric_df, stats)
+
+        # Boxes drawn from the precomputed statistics (with a capped sample of the flagged values as fliers)
+        box_stats = [
+            {
+                "label": feature,
+                "q1": row["q1"], "med": row["median"], "q3": row["q3"],
+                "whislo": row["whislo"], "whishi": row["whishi"],
+                "fliers": sample_fliers(numeric_df[feature].to_numpy()[mask[feature].to_numpy()])
+            }
+            for feature, row in stats.iterrows()
+        ]
 
         # Plot
         plt.figure(figsize=(16, 10))
-        ax = sns.boxplot(
-            x="Value",
-            y="Feature",
-            data=melted,
-            order=feature_order,
-            palette="coolwarm",
-            showfliers=True
-        )
+        ax = plt.gca()
+        draw_boxes(ax, box_stats, colors=sns.color_palette("coolwarm", len(box_stats)))
 
         # Annotate outlier counts clearly to the right
         x_min, x_max = ax.get_xlim()
         x_range = x_max - x_min
         offset = x_range * 0.06  # 6% to the right
 
-        for i, feature in enumerate(feature_order):
-            count = columns_with_outliers[feature]
-            x_pos = melted[melted["Feature"] == feature]["Value"].quantile(0.97)
-            
+        for i, (feature, row) in enumerate(stats.iterrows(), start=1):
+            count = int(row["outliers"])
             color = "lightcoral" if count > 1000 else "green"
-            
+
             ax.text(
-                x_pos + offset, i, f"{count}",
+                row["p97"] + offset, i, f"{count}",
                 va='center', ha='left', fontsize=9, fontweight='bold', color=color
             )
 
@@ -239,6 +234,9 @@ def plot_outliers(df: pd.DataFrame, plot_file_path: str, show_plot: bool) -> Non
 
     except Exception as e:
         print(f"[ERRO] Failed to plot outliers => {e}")
+    finally:
+        # Release the figure once it is saved (and shown)
+        plt.close()
 
 def plot_count_features_correlations(df: pd.DataFrame, plot_file_path: str, show_plot: bool) -> None:
     """
@@ -267,11 +265,8 @@ def plot_count_features_correlations(df: pd.DataFrame, plot_file_path: str, show
             "toiletCount"
         ]
 
-        # Subset the DataFrame
-        count_df = df[count_columns]
-
-        # Compute the correlation matrix
-        corr_matrix = count_df.corr()
+        # Compute the correlation matrix (a submatrix of the shared statistics, no new pass over the data)
+        corr_matrix = CorrelationStats.shared(df).corr(count_columns)
 
         # Set up the plot
         plt.figure(figsize=(10, 8))
@@ -305,4 +300,7 @@ def plot_count_features_correlations(df: pd.DataFrame, plot_file_path: str, show
             plt.show()
 
     except Exception as e:
-        print(f"[ERRO] Failed to plot Count Features Correlations => {e}")
\ No newline at end of file
+        print(f"[ERRO] Failed to plot Count Features Correlations => {e}")
+    finally:
+        # Release the figure once it is saved (and shown)
+        plt.close()
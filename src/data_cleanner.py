@@ -4,8 +4,51 @@ import pandas as pd
 import seaborn as sns
 import matplotlib.pyplot as plt
 import os
+import json
 from pathlib import Path
 import numpy as np
+from src.dataset_cache import DatasetCache
+from src.locality_canonicalizer import LocalityCanonicalizer
+from src.category_normalizer import CategoryNormalizer, NORMALIZATION_MAPPINGS, MISSING_VALUE
+from src.data_profile import DataProfile, profile_file_path
+from src.deduplication import deduplicate, key_columns, row_fingerprints, FingerprintSet
+
+# Version of the cleaning rules. Bump it whenever the output of normalization() changes,
+# so cached cleaned datasets built with older rules are not reused.
+CLEANING_VERSION = 3
+
+# Irrelevant or problematic columns dropped after deduplication
+COLUMNS_TO_DROP = [
+    "monthlyCost",
+    "accessibleDisabledPeople",
+    "hasBalcony",
+    "url",
+    "Unnamed: 0",
+    "id"
+]
+
+# Columns converted to integers (-1 for invalid or missing entries)
+INT_COLS = [
+    "hasAirConditioning", "hasSwimmingPool", "hasDressingRoom", "hasFireplace",
+    "hasThermicPanels", "hasArmoredDoor", "hasHeatPump", "hasPhotovoltaicPanels",
+    "hasOffice", "hasAttic", "hasDiningRoom", "hasVisiophone", "hasGarden",
+    "gardenSurface", "parkingCountOutdoor", "hasLift", "roomCount", "parkingCountIndoor",
+    "hasBasement", "floorCount", "hasLivingRoom", "hasTerrace", "buildingConstructionYear",
+    "facedeCount", "toiletCount", "bathroomCount", "bedroomCount", "postCode","diningRoomSurface",
+    "kitchenSurface","terraceSurface","livingRoomSurface","landSurface","habitableSurface","streetFacadeWidth"
+]
+
+# Compact dtypes used for INT_COLS with the compact_dtypes option (missing values are <NA>/NaN)
+FLAG_DTYPE = "Int8"           # has* flags
+COUNT_DTYPE = "UInt16"        # counts, years and postal codes
+SURFACE_DTYPE = "float32"     # surfaces and widths
+
+# Columns converted to stripped strings ("missing value" for missing entries)
+STR_COLS = [
+    "gardenOrientation", "terraceOrientation", "kitchenType", "floodZoneType",
+    "heatingType", "buildingCondition", "epcScore", "subtype", "province",
+    "locality", "type"
+]
 
 class DataCleanner:
     """
@@ -15,23 +58,203 @@ class DataCleanner:
     Supports multiple file formats and provides functions for data quality analysis,
     duplicate removal, error correction, normalization of categorical features,
     and output file export.
+
+    Each pipeline stage is computed at most once per instance and cached, so calling
+    several public methods (e.g. send_output_file() then to_real_values()) parses and
+    cleans the source file only once.
     """
 
-    def __init__(self, data_file_path: str) -> None:
+    # Order in which the pipeline stages are built; invalidating a stage also drops every later one
+    STAGES = ("raw", "deduplicated", "error_cleaned", "normalized", "real_valued")
+
+    # Cleaning options (see __init__) and their default values
+    DEFAULT_OPTIONS = {"categorical": False, "compact_dtypes": False, "dedup_key": None, "near_duplicates": False}
+
+    # Options changing the "deduplicated" stage (the others only change later stages)
+    DEDUP_OPTIONS = ("dedup_key", "near_duplicates")
+
+    def __init__(self, data_file_path: str, cache: DatasetCache = None,
+                 locality_canonicalizer: LocalityCanonicalizer = None, categorical: bool = False,
+                 compact_dtypes: bool = False, dedup_key: list = None, near_duplicates: bool = False) -> None:
         """
         Initialize the DataCleanner with the path to the data file.
 
         Args:
             data_file_path (str): Path to the input data file.
+            cache (DatasetCache, optional): On-disk cache of cleaned datasets. When given,
+                                            normalization() loads its result from the cache
+                                            instead of cleaning the data file again.
+            locality_canonicalizer (LocalityCanonicalizer, optional): Prebuilt (e.g. persisted)
+                                            postcode → locality table. When None, it is built
+                                            from the data by clean_errors().
+            categorical (bool): If True, the string columns (STR_COLS) are emitted as pandas
+                                'category' instead of object strings (see _convert_column_types()).
+            compact_dtypes (bool): If True, the numeric columns (INT_COLS) and the normalized
+                                   columns use the smallest fitting nullable dtypes, with <NA>
+                                   for missing values instead of the -1 sentinel.
+            dedup_key (list[str], optional): Columns identifying duplicate listings. Defaults to
+                                   every column but the id, url and index columns, so re-posts
+                                   of the same listing are duplicates (see src/deduplication.py).
+            near_duplicates (bool): If True, also remove near-duplicate listings (same address,
+                                   type, subtype and bedroom count, price and surface within 2%)
+                                   when deduplicating.
         """
+        self.cache = cache
+        # Categorical → numerical code normalization; keeps the report of unknown categories
+        self.normalizer = CategoryNormalizer()
+        self.categorical = categorical
+        self.compact_dtypes = compact_dtypes
+        self.dedup_key = dedup_key
+        self.near_duplicates = near_duplicates
+        # Number of rows removed by each deduplication rule in the last run
+        self.dedup_report = {}
+        self._given_canonicalizer = locality_canonicalizer
+        # Canonicalizer used by the last clean_errors() run (given or built from the data)
+        self.locality_canonicalizer = locality_canonicalizer
+        # Per-stage results ("raw", "deduplicated", "error_cleaned", "normalized", "real_valued")
+        self._stages = {}
+        # Data-quality profile of the "normalized" stage (see profile())
+        self._profile = None
+        # On-disk cache key of the "normalized" stage, once computed
+        self._cache_key = None
         self.data_file_path = data_file_path
 
+    @property
+    def data_file_path(self) -> str:
+        """
+        Path of the input data file. Changing it invalidates every cached stage.
+        """
+        return self._data_file_path
+
+    @data_file_path.setter
+    def data_file_path(self, data_file_path: str) -> None:
+        self._data_file_path = data_file_path
+        self.clear_cache()
+
+    def set_locality_canonicalizer(self, locality_canonicalizer: LocalityCanonicalizer = None) -> None:
+        """
+        Use another prebuilt postcode → locality table (or None to build it from the data).
+
+        Invalidates the cached stages that depend on it.
+
+        Args:
+            locality_canonicalizer (LocalityCanonicalizer, optional): The table to use.
+
+        Returns:
+            None
+        """
+        self._given_canonicalizer = locality_canonicalizer
+        self.locality_canonicalizer = locality_canonicalizer
+        self.clear_cache("error_cleaned")
+
+    def configure(self, **options) -> None:
+        """
+        Change cleaning options (see DEFAULT_OPTIONS) and invalidate the cached stages they affect.
+
+        Args:
+            **options: Option values, e.g. categorical=True.
+
+        Returns:
+            None
+
+        Raises:
+            ValueError: If an option is unknown.
+        """
+        for name, value in options.items():
+            if name not in self.DEFAULT_OPTIONS:
+                raise ValueError(f"Unknown option '{name}'. Expected one of {list(self.DEFAULT_OPTIONS)}.")
+            setattr(self, name, value)
+
+        self.clear_cache("deduplicated" if set(options) & set(self.DEDUP_OPTIONS) else "error_cleaned")
+
+    def _cache_options(self) -> dict:
+        """
+        Options that change the cleaned output, used in the on-disk cache key.
+
+        Returns:
+            dict: The options (empty with the default configuration).
+        """
+        options = {
+            name: getattr(self, name)
+            for name, default in self.DEFAULT_OPTIONS.items()
+            if getattr(self, name) != default
+        }
+        if self._given_canonicalizer is not None:
+            options["locality_table"] = self._given_canonicalizer.fingerprint()
+        return options
+
+    def rules_key(self) -> str:
+        """
+        Key of the cleaning rules and options producing the cleaned dataset.
+
+        Changes whenever CLEANING_VERSION or an option changing the output does, so
+        data derived from the cleaned dataset can tell when to be rebuilt.
+
+        Returns:
+            str: The key (see DatasetCache.rules_key()).
+        """
+        return DatasetCache.rules_key(CLEANING_VERSION, self._cache_options())
+
+    @property
+    def cache_key(self) -> str | None:
+        """
+        On-disk cache key of the cleaned dataset (raw file content, cleaning rules and options),
+        once normalization() has run with a cache. None otherwise.
+        """
+        return self._cache_key
+
+    def clear_cache(self, from_stage: str = "raw") -> None:
+        """
+        Invalidate the cached pipeline stages.
+
+        Args:
+            from_stage (str): First stage to drop. Every later stage is dropped too,
+                              since it was derived from it. Defaults to "raw" (everything).
+
+        Raises:
+            ValueError: If the stage name is unknown.
+        """
+        if from_stage not in self.STAGES:
+            raise ValueError(f"Unknown stage '{from_stage}'. Expected one of {self.STAGES}.")
+
+        for stage in self.STAGES[self.STAGES.index(from_stage):]:
+            self._stages.pop(stage, None)
+        if self.STAGES.index(from_stage) <= self.STAGES.index("normalized"):
+            self._profile = None
+            self._cache_key = None
+
+    def _get_stage(self, stage: str, build) -> pd.DataFrame:
+        """
+        Return a cached stage result, building and caching it on first access.
+
+        Args:
+            stage (str): Name of the stage (one of STAGES).
+            build (Callable[[], pd.DataFrame]): Function computing the stage.
+
+        Returns:
+            pd.DataFrame: The stage result. It is shared with the cache, so callers
+                          must copy it before modifying it in place.
+        """
+        if stage not in self._stages:
+            self._stages[stage] = build()
+        return self._stages[stage]
+
     def load_data_file(self) -> pd.DataFrame:
         """
         Load a data file into a pandas DataFrame.
 
         Supports CSV, JSON, Excel, Parquet, TXT (tab-delimited), and XML formats.
-        Handles missing or empty files gracefully.
+        Handles missing or empty files gracefully. The file is only parsed once;
+        later calls return the cached "raw" stage.
+
+        Returns:
+            pd.DataFrame: Loaded data or empty DataFrame on failure.
+        """
+        return self._get_stage("raw", self._read_data_file)
+
+    def _read_data_file(self) -> pd.DataFrame:
+        """
+        Parse the data file from disk (uncached).
 
         Returns:
             pd.DataFrame: Loaded data or empty DataFrame on failure.
@@ -45,7 +268,8 @@ class DataCleanner:
         try:
             match suffix:
                 case ".csv":
-                    df = pd.read_csv(self.data_file_path)
+                    # Keep the dtypes described by a sidecar file (see send_output_file())
+                    df = pd.read_csv(self.data_file_path, dtype=_read_csv_dtypes(self.data_file_path) or None)
                 case ".json":
                     df = pd.read_json(self.data_file_path)
                 case ".xls" | ".xlsx":
@@ -79,7 +303,10 @@ class DataCleanner:
         - Data types
         - Non-null counts
         - Missing value counts and percentages
-        - Number of unique values per column
+        - Number of unique values per column (estimated for high-cardinality columns)
+        - Min and max of numeric columns
+
+        All of them come from a single scan of the data (see src/data_profile.py).
 
         Args:
             df (pd.DataFrame): DataFrame to analyze.
@@ -91,23 +318,46 @@ class DataCleanner:
             print("[WARNING] The DataFrame is empty.")
             return pd.DataFrame()
 
-        summary = pd.DataFrame({
-            "Data type": df.dtypes,
-            "Non-null count": df.notnull().sum(),
-            "Missing count": df.isnull().sum(),
-            "Missing %": df.isnull().mean() * 100,
-            "Unique values": df.nunique()
-        })
-
+        summary = DataProfile.from_frame(df).summary()
         summary = summary.sort_values(by="Missing %", ascending=False)
         return summary
 
+    def profile(self) -> DataProfile:
+        """
+        Data-quality profile of the cleaned ("normalized") dataset.
+
+        With an on-disk cache, the profile is stored next to the cached dataset and
+        read back instead of scanning the data again.
+
+        Returns:
+            DataProfile: The profile.
+        """
+        if self._profile is None:
+            df = self.normalization()
+            path = self.cache.profile_path(self._cache_key) if self._cache_key else None
+            if path is not None and not self.cache.rebuild and path.exists():
+                self._profile = DataProfile.load(path)
+            else:
+                self._profile = DataProfile.from_frame(df)
+                if path is not None:
+                    self._profile.save(path)
+        return self._profile
+
     def clean_duplicates(self) -> pd.DataFrame:
         """
         Clean the dataset by removing duplicate rows and dropping irrelevant columns.
 
         Also prints data quality metrics before and after cleaning.
 
+        Returns:
+            pd.DataFrame: The cleaned DataFrame.
+        """
+        return self._get_stage("deduplicated", self._build_deduplicated)
+
+    def _build_deduplicated(self) -> pd.DataFrame:
+        """
+        Build the "deduplicated" stage from the cached "raw" stage.
+
         Returns:
             pd.DataFrame: The cleaned DataFrame.
         """
@@ -122,19 +372,13 @@ class DataCleanner:
         summary_before = self.analyze_data_quality(df)
         print(summary_before)
 
-        # Step 2: Remove exact duplicates
-        cleaned_df = df.drop_duplicates()
+        # Step 2: Remove duplicate listings (copy so the cached raw stage stays untouched)
+        cleaned_df, self.dedup_report = deduplicate(df, self.dedup_key, self.near_duplicates)
+        cleaned_df = cleaned_df.copy()
+        self._print_dedup_report(len(df))
 
         # Step 3: Drop irrelevant or problematic columns (if they exist)
-        columns_to_drop = [
-            "monthlyCost",
-            "accessibleDisabledPeople",
-            "hasBalcony",
-            "url",
-            "Unnamed: 0",
-            "id"
-        ]
-        cleaned_df.drop(columns=[col for col in columns_to_drop if col in cleaned_df.columns], inplace=True)
+        self._drop_irrelevant_columns(cleaned_df)
 
         # Step 4: Show data quality summary after cleaning
         print("\n📊 Data Quality AFTER cleaning:")
@@ -142,7 +386,27 @@ class DataCleanner:
         print(summary_after)
 
         return cleaned_df
-        
+
+    def _print_dedup_report(self, rows_read: int) -> None:
+        """
+        Print the number of rows removed by each deduplication rule.
+
+        Args:
+            rows_read (int): Number of rows before deduplication.
+        """
+        removed = ", ".join(f"{count} {rule}" for rule, count in self.dedup_report.items())
+        print(f"[INFO] Duplicates removed from {rows_read} rows: {removed}.")
+
+    @staticmethod
+    def _drop_irrelevant_columns(df: pd.DataFrame) -> None:
+        """
+        Drop, in place, the irrelevant or problematic columns listed in COLUMNS_TO_DROP (if they exist).
+
+        Args:
+            df (pd.DataFrame): DataFrame to modify.
+        """
+        df.drop(columns=[col for col in COLUMNS_TO_DROP if col in df.columns], inplace=True)
+
     def clean_errors(self) -> pd.DataFrame:
         """
         Perform error correction and standardization on the dataset.
@@ -157,21 +421,26 @@ class DataCleanner:
         Returns:
             pd.DataFrame: Cleaned and standardized DataFrame.
         """
-        df = self.clean_duplicates()
+        return self._get_stage("error_cleaned", self._build_error_cleaned)
+
+    def _build_error_cleaned(self) -> pd.DataFrame:
+        """
+        Build the "error_cleaned" stage from the cached "deduplicated" stage.
+
+        Returns:
+            pd.DataFrame: Cleaned and standardized DataFrame.
+        """
+        df = self.clean_duplicates().copy()
         # Step 1: Normalize text
-        if "locality" in df.columns:
-            df["locality"] = df["locality"].astype(str).str.upper().str.strip()
+        self._standardize_locality_text(df)
 
         # Step 2:  Replace each locality with the most frequent locality for the same postal code.
-        # Compute the most frequent locality for each postalCode
-        most_common_locality = (
-            df.groupby("postCode")["locality"]
-            .agg(lambda x: x.mode().iloc[0] if not x.mode().empty else x.iloc[0])
-            .to_dict()
-        )
+        # Count each (postCode, locality) pair once, unless a prebuilt table was given
+        if self._given_canonicalizer is None:
+            self.locality_canonicalizer = LocalityCanonicalizer.from_frame(df)
 
         # Replace all localities by the most frequent one per postalCode
-        df["locality"] = df["postCode"].map(most_common_locality)
+        df["locality"] = self.locality_canonicalizer.canonicalize(df["postCode"], df["locality"])
 
         print("[INFO] Localities standardized based on most frequent value per postal code.")
 
@@ -182,34 +451,58 @@ class DataCleanner:
         df = df.dropna(subset=["price"])
 
         # Convert column types safely, replacing invalid or NaN entries where necessary.
-        int_cols = [
-            "hasAirConditioning", "hasSwimmingPool", "hasDressingRoom", "hasFireplace",
-            "hasThermicPanels", "hasArmoredDoor", "hasHeatPump", "hasPhotovoltaicPanels",
-            "hasOffice", "hasAttic", "hasDiningRoom", "hasVisiophone", "hasGarden",
-            "gardenSurface", "parkingCountOutdoor", "hasLift", "roomCount", "parkingCountIndoor",
-            "hasBasement", "floorCount", "hasLivingRoom", "hasTerrace", "buildingConstructionYear",
-            "facedeCount", "toiletCount", "bathroomCount", "bedroomCount", "postCode","diningRoomSurface",
-            "kitchenSurface","terraceSurface","livingRoomSurface","landSurface","habitableSurface","streetFacadeWidth"
-        ]
-
-        str_cols = [
-            "gardenOrientation", "terraceOrientation", "kitchenType", "floodZoneType",
-            "heatingType", "buildingCondition", "epcScore", "subtype", "province",
-            "locality", "type"
-        ]
+        df = self._convert_column_types(df, self.categorical, self.compact_dtypes)
+
+        print("[INFO] All specified column types converted safely.")
 
+        return df
+
+    @staticmethod
+    def _standardize_locality_text(df: pd.DataFrame) -> None:
+        """
+        Upper-case and strip, in place, the 'locality' column (if it exists).
+
+        Args:
+            df (pd.DataFrame): DataFrame to modify.
+        """
+        if "locality" in df.columns:
+            df["locality"] = df["locality"].astype(str).str.upper().str.strip()
+
+    @staticmethod
+    def _convert_column_types(df: pd.DataFrame, categorical: bool = False, compact_dtypes: bool = False) -> pd.DataFrame:
+        """
+        Convert the INT_COLS and STR_COLS columns safely.
+
+        Integer columns get -1 for invalid or missing entries; string columns are stripped
+        and get "missing value" for missing entries. Works row by row, so it can be applied
+        to a whole DataFrame or to one chunk of it.
+
+        Args:
+            df (pd.DataFrame): DataFrame to convert.
+            categorical (bool): If True, string columns become pandas 'category' columns
+                                (see string_categories()).
+            compact_dtypes (bool): If True, integer columns get compact nullable dtypes
+                                   (see compact_numeric_dtype()) and keep missing values.
+
+        Returns:
+            pd.DataFrame: The converted DataFrame.
+        """
         # Convert integer columns safely
-        for col in int_cols:
+        for col in INT_COLS:
             if col in df.columns:
-                df[col] = pd.to_numeric(df[col], errors='coerce').fillna(-1).astype(int)
+                if compact_dtypes:
+                    values = np.trunc(pd.to_numeric(df[col], errors='coerce').astype("float64"))
+                    df[col] = values.astype(compact_numeric_dtype(col, values))
+                else:
+                    df[col] = pd.to_numeric(df[col], errors='coerce').fillna(-1).astype(int)
 
         # Convert string columns safely
-        for col in str_cols:
+        for col in STR_COLS:
             if col in df.columns:
-                df[col]=df[col].fillna("missing value")
+                df[col]=df[col].fillna(MISSING_VALUE)
                 df[col] = df[col].astype(str).str.strip()
-               
-        print("[INFO] All specified column types converted safely.")
+                if categorical:
+                    df[col] = pd.Categorical(df[col], categories=string_categories(col, df[col]))
 
         return df
 
@@ -224,120 +517,375 @@ class DataCleanner:
         - Flood zone type
         - Kitchen type
 
+        Categories unknown to the mappings are normalized as missing and reported
+        (see CategoryNormalizer).
+
         Returns:
             pd.DataFrame: DataFrame with additional normalized categorical columns.
         """
+        return self._get_stage("normalized", self._load_or_build_normalized)
 
-        # Get cleaned DataFrame
-        df = self.clean_errors()
-
-        # Normalization mappings
-        building_conditions = {
-            "missing value": -1,
-            "GOOD": 1,
-            "AS_NEW": 2,
-            "TO_RENOVATE": 3, 
-            "TO_BE_DONE_UP": 4,
-            "JUST_RENOVATED": 5,
-            "TO_RESTORE": 6
-        }
-        
-        epc_scores = {
-            "missing value": -1,
-            'A++': 1,
-            'A+': 2,
-            'A': 3,
-            'B': 4,
-            'C': 5,
-            'D': 6,
-            'E': 7,
-            'F': 8,
-            'G': 9,
-            'G_C': 9, # for ranges, we take the lowest score ()
-            'F_D': 8,
-            'C_A': 5,
-            'F_C': 8,
-            'E_C': 7,
-            'C_B': 5,
-            'E_D': 7,
-            'G_F': 9,
-            'D_C': 6,
-            'G_E': 9,
-            'X': 0
-        }
-        
-        heating_types = {
-            "missing value": -1,
-            'GAS': 1,
-            'FUELOIL': 2,
-            'ELECTRIC': 3,
-            'PELLET': 4,
-            'WOOD': 5,
-            'SOLAR': 6,
-            'CARBON': 7
-        }
+    def _load_or_build_normalized(self) -> pd.DataFrame:
+        """
+        Load the "normalized" stage from the on-disk cache, building and caching it on a miss.
 
-        flood_zone_types = {
-            "missing value": -1,
-            'NON_FLOOD_ZONE': 1,
-            'POSSIBLE_FLOOD_ZONE': 2,
-            'RECOGNIZED_FLOOD_ZONE': 3,
-            'RECOGNIZED_N_CIRCUMSCRIBED_FLOOD_ZONE': 4,
-            'CIRCUMSCRIBED_WATERSIDE_ZONE': 5,
-            'CIRCUMSCRIBED_FLOOD_ZONE': 6,
-            'POSSIBLE_N_CIRCUMSCRIBED_FLOOD_ZONE': 7,
-            'POSSIBLE_N_CIRCUMSCRIBED_WATERSIDE_ZONE': 8,
-            'RECOGNIZED_N_CIRCUMSCRIBED_WATERSIDE_FLOOD_ZONE': 9
-        }
+        Returns:
+            pd.DataFrame: DataFrame with additional normalized categorical columns.
+        """
+        if self.cache is None or not os.path.exists(self.data_file_path):
+            return self._build_normalized()
+
+        key = self.cache.make_key(self.data_file_path, CLEANING_VERSION, self._cache_options())
+        self._cache_key = key
+        df = self.cache.load(key)
+        if df is None:
+            df = self._build_normalized()
+            if not df.empty:
+                self.cache.store(key, df)
+        return df
 
-        kitchen_types = {
-            "missing value": -1,
-            'NOT_INSTALLED': 0,
-            'SEMI_EQUIPPED': 1,
-            'INSTALLED': 2,
-            'HYPER_EQUIPPED': 3,
-            'USA_UNINSTALLED': 0,
-            'USA_SEMI_EQUIPPED': 1,
-            'USA_INSTALLED': 2,
-            'USA_HYPER_EQUIPPED': 3
-        }
+    def _build_normalized(self) -> pd.DataFrame:
+        """
+        Build the "normalized" stage from the cached "error_cleaned" stage.
+
+        Returns:
+            pd.DataFrame: DataFrame with additional normalized categorical columns.
+        """
 
-        # Apply mappings to normalize categorical columns
-        df["buildingConditionNormalize"] = df["buildingCondition"].replace(building_conditions)
-        df["epcScoreNormalize"] = df["epcScore"].replace(epc_scores)
-        df["heatingTypeNormalize"] = df["heatingType"].replace(heating_types)
-        df["floodZoneTypeNormalize"] = df["floodZoneType"].replace(flood_zone_types)
-        df["kitchenTypeNormalize"] = df["kitchenType"].replace(kitchen_types)
+        # Get cleaned DataFrame
+        df = self.clean_errors().copy()
 
+        self.normalizer.reset_report()
+        df = self._add_normalized_columns(df)
+        self.normalizer.print_report()
         return df
-    
+
+    def _add_normalized_columns(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Add the "<column>Normalize" columns defined in NORMALIZATION_MAPPINGS (see CategoryNormalizer).
+
+        Args:
+            df (pd.DataFrame): Error-cleaned DataFrame (or one chunk of it).
+
+        Returns:
+            pd.DataFrame: DataFrame with additional normalized categorical columns.
+        """
+        # Apply all the compiled mappings to normalize categorical columns
+        return self.normalizer.transform(df, self.compact_dtypes)
+
     def to_real_values(self) -> pd.DataFrame:
         """
         Convert normalized placeholder values (-1) to NaN to represent missing data.
 
+        With the compact_dtypes option there are no placeholders, so the normalized
+        DataFrame is returned as is.
+
         Returns:
             pd.DataFrame: Normalized DataFrame with missing values as NaN.
         """
-        df = self.normalization()
-        df = df.replace(-1, np.nan)
-        return df
+        if self.compact_dtypes:
+            # Missing values are already <NA>: no sentinel to replace
+            return self.normalization()
+        return self._get_stage("real_valued", lambda: self.normalization().replace(-1, np.nan))
 
-    def send_output_file(self, output_file: str):
+    def send_output_file(self, output_file: str, chunk_size: int = None):
         """
         Export the cleaned, deduplicated, and normalized DataFrame to a CSV file.
 
-        Creates the output directory if it does not exist.
+        Creates the output directory if it does not exist. With the categorical or compact_dtypes
+        options, the column dtypes are described in a "<name>.dtypes.json" sidecar file, which
+        load_data_file() uses to read them back (and which is removed otherwise). The data-quality profile of the output is
+        written to a "<name>.profile.json" sidecar file (see profile()).
 
         Args:
             output_file (str): File path where to save the CSV output.
+            chunk_size (int, optional): If given, the data file is cleaned in streaming mode,
+                                        reading and writing this many rows at a time
+                                        (see clean_in_chunks()), instead of in memory.
 
         Returns:
             None
         """
+        if chunk_size:
+            self.clean_in_chunks(output_file, chunk_size)
+            return
+
         cleaned_df = self.normalization()
         if not cleaned_df.empty:
             os.makedirs(os.path.dirname(output_file), exist_ok=True)
             cleaned_df.to_csv(output_file, index=False)
+            if self.categorical or self.compact_dtypes:
+                _write_dtypes_file(cleaned_df, output_file)
+            else:
+                _remove_dtypes_file(output_file)
+            self.profile().save(profile_file_path(output_file))
             print(f"[SUCCESS] Exported {len(cleaned_df)} merged records → {output_file}")
         else:
-            print("[WARNING] No data exported due to empty or invalid input.")        
\ No newline at end of file
+            print("[WARNING] No data exported due to empty or invalid input.")
+
+    # -------------------- Streaming (chunked) mode --------------------
+
+    def _read_csv_chunks(self, chunk_size: int):
+        """
+        Iterate over the CSV data file in chunks of rows.
+
+        Args:
+            chunk_size (int): Number of rows per chunk.
+
+        Returns:
+            Iterator[pd.DataFrame]: The chunks, in file order.
+        """
+        return pd.read_csv(self.data_file_path, chunksize=chunk_size)
+
+    def _scan_duplicates_and_localities(self, chunk_size: int) -> tuple:
+        """
+        First pass of the streaming mode: find duplicate rows and count localities.
+
+        Keeps only compact global state:
+        - the set of 64-bit fingerprints of the rows kept so far (see FingerprintSet),
+          to flag exact duplicates;
+        - a per-row "keep" bit mask (packed 8 rows per byte);
+        - the counts of each (postCode, locality) pair among the kept rows.
+
+        Near-duplicates (near_duplicates option) are only detected in memory mode.
+
+        Args:
+            chunk_size (int): Number of rows per chunk.
+
+        Returns:
+            tuple: (list of packed keep masks, one per chunk, number of rows read)
+        """
+        seen = FingerprintSet()
+        keep_masks = []
+        canonicalizer = LocalityCanonicalizer()
+        rows_read = 0
+
+        if self.near_duplicates:
+            print("[WARNING] Near-duplicates are not detected in chunked mode, only exact duplicates.")
+
+        for chunk in self._read_csv_chunks(chunk_size):
+            keep = seen.add_new(row_fingerprints(chunk, key_columns(chunk, self.dedup_key)))
+
+            keep_masks.append(np.packbits(keep))
+            rows_read += len(chunk)
+
+            if self._given_canonicalizer is None:
+                kept = chunk.loc[keep, ["postCode", "locality"]].copy()
+                self._standardize_locality_text(kept)
+                canonicalizer.update(added=kept)
+
+        self.locality_canonicalizer = self._given_canonicalizer or canonicalizer
+        self.dedup_report = {"exact": rows_read - len(seen)}
+        self._print_dedup_report(rows_read)
+        return keep_masks, rows_read
+
+    def clean_in_chunks(self, output_file: str, chunk_size: int = 100_000) -> int:
+        """
+        Clean and normalize a CSV data file too large for memory, streaming it in chunks.
+
+        Two passes over the file:
+        1. Row hashes and (postCode, locality) counts are collected to know which rows are
+           exact duplicates and which locality is the most frequent for each postal code.
+        2. Each chunk is deduplicated, cleaned, normalized and appended to the output file.
+
+        Only one chunk is held in memory at a time, plus compact per-row and per-postcode
+        tables. The output matches send_output_file() in memory mode.
+
+        Args:
+            output_file (str): File path where to save the CSV output.
+            chunk_size (int): Number of rows read and written at a time.
+
+        Returns:
+            int: Number of rows written.
+        """
+        if Path(self.data_file_path).suffix.lower() != ".csv":
+            raise ValueError(f"Chunked cleaning only supports CSV files: {self.data_file_path}")
+
+        if not os.path.exists(self.data_file_path) or os.path.getsize(self.data_file_path) == 0:
+            print(f"[WARNING] File is missing or empty: {self.data_file_path}")
+            return 0
+
+        keep_masks, _ = self._scan_duplicates_and_localities(chunk_size)
+        self.normalizer.reset_report()
+
+        os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
+        rows_written = 0
+        seen_categories = {}
+        seen_dtypes = {}
+        profile = DataProfile()
+
+        for i, chunk in enumerate(self._read_csv_chunks(chunk_size)):
+            keep = np.unpackbits(keep_masks[i], count=len(chunk)).astype(bool)
+            df = chunk.loc[keep].copy()
+
+            self._drop_irrelevant_columns(df)
+            self._standardize_locality_text(df)
+            df["locality"] = self.locality_canonicalizer.canonicalize(df["postCode"], df["locality"])
+            df = df.dropna(subset=["price"])
+            df = self._convert_column_types(df, self.categorical, self.compact_dtypes)
+            df = self._add_normalized_columns(df)
+
+            df.to_csv(output_file, mode="w" if i == 0 else "a", header=(i == 0), index=False)
+            for col in df.columns if not df.empty else []:
+                if isinstance(df[col].dtype, pd.CategoricalDtype):
+                    seen_categories.setdefault(col, set()).update(df[col].cat.categories)
+                else:
+                    seen_dtypes.setdefault(col, set()).add(str(df[col].dtype))
+            profile.add(df)
+            rows_written += len(df)
+
+        if self.categorical or self.compact_dtypes:
+            # Describe the dtypes seen over all the chunks (widest one when chunks disagree)
+            schema_df = pd.DataFrame({
+                col: pd.Series([], dtype=_widest_dtype(dtypes)) for col, dtypes in seen_dtypes.items()
+            })
+            for col, values in seen_categories.items():
+                schema_df[col] = pd.Categorical([], categories=string_categories(col, pd.Series(sorted(values))))
+            _write_dtypes_file(schema_df, output_file)
+        else:
+            _remove_dtypes_file(output_file)
+        profile.save(profile_file_path(output_file))
+
+        self.normalizer.print_report()
+        print(f"[SUCCESS] Exported {rows_written} merged records in chunks of {chunk_size} → {output_file}")
+        return rows_written
+
+def compact_numeric_dtype(col: str, values: pd.Series) -> str:
+    """
+    Smallest dtype that holds an INT_COLS column with the compact_dtypes option.
+
+    has* flags use FLAG_DTYPE, surfaces and widths SURFACE_DTYPE, and the other columns
+    (counts, years, postal codes) COUNT_DTYPE. If the values do not fit, a wider dtype
+    of the same kind is used instead.
+
+    Args:
+        col (str): Column name.
+        values (pd.Series): Numeric values of the column (NaN for missing).
+
+    Returns:
+        str: Name of the dtype.
+    """
+    low, high = values.min(), values.max()
+    if pd.isna(low):
+        low = high = 0
+
+    if col.endswith("Surface") or col == "streetFacadeWidth":
+        # float32 holds integers exactly up to 2**24
+        return SURFACE_DTYPE if max(abs(low), abs(high)) <= 2**24 else "float64"
+
+    preferred = FLAG_DTYPE if col.startswith("has") else COUNT_DTYPE
+    for dtype in (preferred, "Int16", "Int32"):
+        info = np.iinfo(pd.api.types.pandas_dtype(dtype).numpy_dtype)
+        if info.min <= low and high <= info.max:
+            return dtype
+    return "Int64"
+
+def string_categories(col: str, values: pd.Series = None) -> list:
+    """
+    Category set of a string column when the cleaner emits categorical columns.
+
+    Columns with a normalization mapping get a fixed set: the mapping keys (which include
+    "missing value"), followed by any other value found in the data so nothing is lost.
+    Other columns get their observed values, sorted.
+
+    Args:
+        col (str): Column name.
+        values (pd.Series, optional): Cleaned values of the column.
+
+    Returns:
+        list: Categories, in order.
+    """
+    observed = [] if values is None else sorted(pd.unique(values.dropna()))
+
+    if col in NORMALIZATION_MAPPINGS:
+        known = list(NORMALIZATION_MAPPINGS[col][1])
+        return known + [value for value in observed if value not in known]
+
+    return observed
+
+def _widest_dtype(dtypes: set) -> str:
+    """
+    Dtype able to hold the values of every chunk of a column, given each chunk's dtype.
+
+    Args:
+        dtypes (set): Dtype names seen in the chunks.
+
+    Returns:
+        str: Name of the dtype.
+    """
+    if len(dtypes) == 1:
+        return next(iter(dtypes))
+    if any(not pd.api.types.is_numeric_dtype(pd.api.types.pandas_dtype(d)) for d in dtypes):
+        return "object"
+    if any(d.startswith("float") for d in dtypes):
+        return "float64"
+    return "Int64"
+
+def _dtypes_file_path(data_file_path: str) -> Path:
+    """
+    Path of the dtype sidecar file of a CSV file ("x.csv" → "x.dtypes.json").
+
+    CSV files cannot store dtypes, so categorical and compact columns are described in this file.
+
+    Args:
+        data_file_path (str): Path to the CSV file.
+
+    Returns:
+        Path: Path to the sidecar file.
+    """
+    return Path(data_file_path).with_suffix(".dtypes.json")
+
+def _write_dtypes_file(df: pd.DataFrame, data_file_path: str) -> None:
+    """
+    Write the categorical and compact columns of a DataFrame (and their categories) next to its CSV export.
+
+    Args:
+        df (pd.DataFrame): Exported DataFrame.
+        data_file_path (str): Path to the CSV file.
+
+    Returns:
+        None
+    """
+    schema = {}
+    for col in df.columns:
+        dtype = df[col].dtype
+        if isinstance(dtype, pd.CategoricalDtype):
+            schema[col] = {"dtype": "category", "categories": [str(c) for c in dtype.categories]}
+        elif str(dtype) not in ("int64", "float64", "object", "bool"):
+            # Compact and nullable dtypes
+            schema[col] = {"dtype": str(dtype)}
+    with open(_dtypes_file_path(data_file_path), "w", encoding="utf-8") as f:
+        json.dump(schema, f, indent=2, ensure_ascii=False)
+
+def _remove_dtypes_file(data_file_path: str) -> None:
+    """
+    Remove the dtype sidecar file of a CSV file, if any (e.g. left by an export with other options).
+
+    Args:
+        data_file_path (str): Path to the CSV file.
+
+    Returns:
+        None
+    """
+    _dtypes_file_path(data_file_path).unlink(missing_ok=True)
+
+def _read_csv_dtypes(data_file_path: str) -> dict:
+    """
+    Read the dtypes described by the sidecar file of a CSV file, if any.
+
+    Args:
+        data_file_path (str): Path to the CSV file.
+
+    Returns:
+        dict: Column → dtype, usable as pd.read_csv(dtype=...). Empty without sidecar file.
+    """
+    path = _dtypes_file_path(data_file_path)
+    if not path.exists():
+        return {}
+
+    with open(path, encoding="utf-8") as f:
+        schema = json.load(f)
+    return {
+        col: pd.CategoricalDtype(spec.get("categories")) if spec["dtype"] == "category" else spec["dtype"]
+        for col, spec in schema.items()
+    }
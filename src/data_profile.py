@@ -0,0 +1,307 @@
+import base64
+import json
+import os
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+# HyperLogLog precision: 2**12 registers per column, for a ~1.6% standard error
+HLL_PRECISION = 12
+
+# Distinct values are counted exactly up to this many per column, then estimated (HyperLogLog)
+EXACT_DISTINCT_LIMIT = 2048
+
+# Numeric value the cleaning uses for missing entries (see DataCleanner.to_real_values())
+MISSING_SENTINEL = -1
+
+_REGISTERS = 1 << HLL_PRECISION
+_RANK_BITS = 64 - HLL_PRECISION
+
+def profile_file_path(data_file_path: str) -> Path:
+    """
+    Path of the profile file of a data file ("x.csv" → "x.profile.json").
+
+    Args:
+        data_file_path (str): Path to the data file.
+
+    Returns:
+        Path: Path to the profile file.
+    """
+    return Path(data_file_path).with_suffix(".profile.json")
+
+def _value_hashes(values: pd.Series) -> np.ndarray:
+    # 64-bit hashes of the non-missing values, the same whatever dtype a chunk was read with
+    # (numbers read as text in some chunks hash like numbers, as in deduplication.row_fingerprints())
+    values = values.dropna()
+    if pd.api.types.is_numeric_dtype(values.dtype):
+        return pd.util.hash_array(values.to_numpy(dtype="float64"))
+    numbers = pd.to_numeric(values, errors="coerce") if values.dtype == object else pd.Series(np.nan, index=values.index)
+    is_number = numbers.notna().to_numpy()
+    return np.concatenate([
+        pd.util.hash_array(numbers[is_number].to_numpy(dtype="float64")),
+        pd.util.hash_array(values[~is_number].astype(str).to_numpy(dtype=object))
+    ])
+
+def _hll_ranks(hashes: np.ndarray) -> tuple:
+    # Register of every hash (its first HLL_PRECISION bits) and rank of the first 1 bit in the others
+    registers = (hashes >> np.uint64(_RANK_BITS)).astype(np.int64)
+    remainder = hashes & np.uint64((1 << _RANK_BITS) - 1)
+    # frexp is exact here: the remainder has fewer bits than a float64 mantissa
+    _, exponent = np.frexp(remainder.astype("float64"))
+    ranks = np.where(remainder == 0, _RANK_BITS + 1, _RANK_BITS + 1 - exponent).astype(np.uint8)
+    return registers, ranks
+
+def _hll_estimate(registers: np.ndarray) -> float:
+    # HyperLogLog estimate, with linear counting for small cardinalities
+    alpha = 0.7213 / (1 + 1.079 / _REGISTERS)
+    estimate = alpha * _REGISTERS ** 2 / np.sum(np.exp2(-registers.astype("float64")))
+    zeros = np.count_nonzero(registers == 0)
+    if estimate <= 2.5 * _REGISTERS and zeros:
+        return _REGISTERS * np.log(_REGISTERS / zeros)
+    return estimate
+
+class ColumnProfile:
+    """
+    Mergeable profile of one column: counts, range, dtype and distinct values.
+
+    Distinct values are tracked as a set of 64-bit hashes while there are at most
+    EXACT_DISTINCT_LIMIT of them, and always in a HyperLogLog sketch, which takes
+    over beyond that limit (constant memory per column).
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize an empty column profile.
+        """
+        self.rows = 0
+        self.nulls = 0
+        self.sentinels = 0
+        self.min = None
+        self.max = None
+        self.dtypes = set()
+        self.hashes = np.empty(0, dtype=np.uint64)   # None once the limit is exceeded
+        self.registers = np.zeros(_REGISTERS, dtype=np.uint8)
+
+    def add(self, values: pd.Series, nulls: int) -> None:
+        """
+        Add the values of a chunk.
+
+        Args:
+            values (pd.Series): Values of the column in the chunk.
+            nulls (int): Number of missing values among them.
+
+        Returns:
+            None
+        """
+        self.rows += len(values)
+        self.nulls += nulls
+        self.dtypes.add(str(values.dtype))
+
+        if pd.api.types.is_numeric_dtype(values.dtype) and not pd.api.types.is_bool_dtype(values.dtype):
+            numeric = values.astype("float64")
+            self.sentinels += int((numeric == MISSING_SENTINEL).sum())
+            if len(values) > nulls:
+                self._update_range(float(numeric.min()), float(numeric.max()))
+
+        hashes = _value_hashes(values)
+        self._add_hashes(np.unique(hashes))
+
+    def _update_range(self, low: float, high: float) -> None:
+        self.min = low if self.min is None else min(self.min, low)
+        self.max = high if self.max is None else max(self.max, high)
+
+    def _add_hashes(self, hashes: np.ndarray) -> None:
+        registers, ranks = _hll_ranks(hashes)
+        np.maximum.at(self.registers, registers, ranks)
+        if self.hashes is not None:
+            self.hashes = np.union1d(self.hashes, hashes)
+            if len(self.hashes) > EXACT_DISTINCT_LIMIT:
+                self.hashes = None
+
+    def merge(self, other: "ColumnProfile") -> None:
+        """
+        Add the profile of the same column in other rows (e.g. another chunk).
+
+        Args:
+            other (ColumnProfile): Profile to merge.
+
+        Returns:
+            None
+        """
+        self.rows += other.rows
+        self.nulls += other.nulls
+        self.sentinels += other.sentinels
+        self.dtypes |= other.dtypes
+        if other.min is not None:
+            self._update_range(other.min, other.max)
+
+        np.maximum(self.registers, other.registers, out=self.registers)
+        if self.hashes is not None and other.hashes is not None:
+            self.hashes = np.union1d(self.hashes, other.hashes)
+            if len(self.hashes) > EXACT_DISTINCT_LIMIT:
+                self.hashes = None
+        else:
+            self.hashes = None
+
+    @property
+    def distinct(self) -> int:
+        """
+        Number of distinct non-missing values (exact up to EXACT_DISTINCT_LIMIT, estimated beyond).
+        """
+        if self.hashes is not None:
+            return len(self.hashes)
+        return int(round(_hll_estimate(self.registers)))
+
+    def to_dict(self) -> dict:
+        """
+        Serializable form of the profile (hashes and registers base64-encoded).
+
+        Returns:
+            dict: The profile.
+        """
+        return {
+            "rows": self.rows, "nulls": self.nulls, "sentinels": self.sentinels,
+            "min": self.min, "max": self.max, "dtypes": sorted(self.dtypes),
+            "hashes": None if self.hashes is None else base64.b64encode(self.hashes.tobytes()).decode(),
+            "registers": base64.b64encode(self.registers.tobytes()).decode()
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ColumnProfile":
+        """
+        Rebuild a profile from its serializable form (see to_dict()).
+
+        Args:
+            data (dict): Serialized profile.
+
+        Returns:
+            ColumnProfile: The profile.
+        """
+        profile = cls()
+        profile.rows, profile.nulls, profile.sentinels = data["rows"], data["nulls"], data["sentinels"]
+        profile.min, profile.max = data["min"], data["max"]
+        profile.dtypes = set(data["dtypes"])
+        profile.hashes = (None if data["hashes"] is None
+                          else np.frombuffer(base64.b64decode(data["hashes"]), dtype=np.uint64).copy())
+        profile.registers = np.frombuffer(base64.b64decode(data["registers"]), dtype=np.uint8).copy()
+        return profile
+
+class DataProfile:
+    """
+    Data-quality profile of a dataset, built in a single scan and mergeable across chunks.
+
+    For every column: row and missing counts, the count of MISSING_SENTINEL values,
+    the min/max of numeric columns, the dtype(s) and the number of distinct values
+    (see ColumnProfile). The profile is persisted next to the cleaned data, so reports
+    and charts read it instead of scanning the data again.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize an empty profile.
+        """
+        self.columns = {}
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "DataProfile":
+        """
+        Profile a DataFrame.
+
+        Args:
+            df (pd.DataFrame): Dataset (or one chunk of it).
+
+        Returns:
+            DataProfile: The profile.
+        """
+        profile = cls()
+        profile.add(df)
+        return profile
+
+    def add(self, chunk: pd.DataFrame) -> None:
+        """
+        Add a chunk of the dataset to the profile.
+
+        Args:
+            chunk (pd.DataFrame): Rows of the dataset.
+
+        Returns:
+            None
+        """
+        # One null scan of the whole chunk
+        null_counts = chunk.isna().sum()
+        for col in chunk.columns:
+            self.columns.setdefault(col, ColumnProfile()).add(chunk[col], int(null_counts[col]))
+
+    def merge(self, other: "DataProfile") -> None:
+        """
+        Add the profile of other rows of the same dataset (e.g. another chunk or worker).
+
+        Args:
+            other (DataProfile): Profile to merge.
+
+        Returns:
+            None
+        """
+        for col, column in other.columns.items():
+            if col in self.columns:
+                self.columns[col].merge(column)
+            else:
+                self.columns[col] = ColumnProfile.from_dict(column.to_dict())
+
+    def summary(self, sentinel_as_missing: bool = False) -> pd.DataFrame:
+        """
+        Data-quality summary, one row per column.
+
+        Args:
+            sentinel_as_missing (bool): If True, MISSING_SENTINEL values count as missing
+                                        (as in the data returned by DataCleanner.to_real_values()).
+
+        Returns:
+            pd.DataFrame: 'Data type', 'Non-null count', 'Missing count', 'Missing %',
+                          'Unique values', 'Min' and 'Max' of every column.
+        """
+        rows = []
+        for col, column in self.columns.items():
+            missing = column.nulls + (column.sentinels if sentinel_as_missing else 0)
+            rows.append({
+                "Column": col,
+                "Data type": "/".join(sorted(column.dtypes)),
+                "Non-null count": column.rows - missing,
+                "Missing count": missing,
+                "Missing %": missing / column.rows * 100 if column.rows else np.nan,
+                "Unique values": column.distinct,
+                "Min": column.min,
+                "Max": column.max
+            })
+        return pd.DataFrame(rows).set_index("Column").rename_axis(None)
+
+    def save(self, file_path: str) -> None:
+        """
+        Persist the profile to a JSON file.
+
+        Args:
+            file_path (str): Destination file path.
+
+        Returns:
+            None
+        """
+        os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+        with open(file_path, "w", encoding="utf-8") as f:
+            json.dump({col: column.to_dict() for col, column in self.columns.items()}, f)
+
+    @classmethod
+    def load(cls, file_path: str) -> "DataProfile":
+        """
+        Load a profile persisted with save().
+
+        Args:
+            file_path (str): JSON file written by save().
+
+        Returns:
+            DataProfile: The profile.
+        """
+        with open(file_path, encoding="utf-8") as f:
+            data = json.load(f)
+        profile = cls()
+        profile.columns = {col: ColumnProfile.from_dict(column) for col, column in data.items()}
+        return profile
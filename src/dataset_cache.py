@@ -0,0 +1,162 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+import pandas as pd
+
+# Raw Immoweb scrape every entry point cleans (or loads from the cache)
+RAW_DATA_FILE = "data/immoweb-dataset.csv"
+
+# Default location of the on-disk cache of cleaned datasets
+CACHE_DIR = "data/cache"
+
+class DatasetCache:
+    """
+    Persistent on-disk cache of cleaned DataFrames.
+
+    Entries are keyed by the content hash of the raw file they were built from plus
+    the cleaning-rule version (and any cleaning options), so a cache entry is reused
+    as long as neither the raw data nor the cleaning rules change. Entries are stored
+    as Parquet files, which keep the column dtypes and load much faster than CSV.
+    """
+
+    def __init__(self, cache_dir: str = CACHE_DIR, rebuild: bool = False) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir (str): Directory where cache entries are stored.
+            rebuild (bool): If True, existing entries are ignored (and overwritten),
+                            forcing the cleaned dataset to be rebuilt.
+        """
+        self.cache_dir = cache_dir
+        self.rebuild = rebuild
+
+    @staticmethod
+    def file_hash(file_path: str, block_size: int = 1 << 20) -> str:
+        """
+        Compute the SHA-256 hash of a file's content, reading it block by block.
+
+        Args:
+            file_path (str): Path to the file to hash.
+            block_size (int): Number of bytes read at a time.
+
+        Returns:
+            str: Hexadecimal digest of the file content.
+        """
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for block in iter(lambda: f.read(block_size), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def make_key(self, raw_file_path: str, version: int, options: dict = None) -> str:
+        """
+        Build the cache key of a cleaned dataset.
+
+        Args:
+            raw_file_path (str): Path to the raw file the dataset is built from.
+            version (int): Version of the cleaning rules.
+            options (dict, optional): Cleaning options that change the output.
+
+        Returns:
+            str: Cache key, usable as a file name.
+        """
+        return f"{self.file_hash(raw_file_path)[:16]}-{self.rules_key(version, options)}"
+
+    @staticmethod
+    def rules_key(version: int, options: dict = None) -> str:
+        """
+        Part of the cache key identifying the cleaning rules and options (see make_key()).
+
+        Args:
+            version (int): Version of the cleaning rules.
+            options (dict, optional): Cleaning options that change the output.
+
+        Returns:
+            str: Key of the cleaning rules, e.g. "v3" or "v3-1a2b3c4d".
+        """
+        key = f"v{version}"
+        if options:
+            options_json = json.dumps(options, sort_keys=True, default=str)
+            key += "-" + hashlib.sha256(options_json.encode()).hexdigest()[:8]
+        return key
+
+    def _entry_paths(self, key: str) -> tuple:
+        base = Path(self.cache_dir) / f"cleaned-{key}"
+        return base.with_suffix(".parquet"), base.with_suffix(".pkl")
+
+    def profile_path(self, key: str) -> Path:
+        """
+        Path of the data-quality profile stored with a cache entry (see src/data_profile.py).
+
+        Args:
+            key (str): Cache key (see make_key()).
+
+        Returns:
+            Path: Path to the profile file.
+        """
+        return Path(self.cache_dir) / f"cleaned-{key}.profile.json"
+
+    def load(self, key: str) -> pd.DataFrame | None:
+        """
+        Load a cached DataFrame.
+
+        Args:
+            key (str): Cache key (see make_key()).
+
+        Returns:
+            pd.DataFrame | None: The cached DataFrame, or None on a cache miss
+                                 (or when a rebuild is forced).
+        """
+        if self.rebuild:
+            return None
+
+        parquet_path, pickle_path = self._entry_paths(key)
+        try:
+            if parquet_path.exists():
+                df = pd.read_parquet(parquet_path)
+            elif pickle_path.exists():
+                df = pd.read_pickle(pickle_path)
+            else:
+                return None
+        except Exception as e:
+            print(f"[WARNING] Ignoring unreadable cache entry {key}: {e}")
+            return None
+
+        print(f"[INFO] Loaded cleaned dataset from cache ({len(df)} rows) → {key}")
+        return df
+
+    def store(self, key: str, df: pd.DataFrame) -> None:
+        """
+        Store a DataFrame in the cache.
+
+        Parquet is used whenever possible. Columns Parquet cannot represent (e.g. object
+        columns mixing numbers and strings) make the entry fall back to a pickle file.
+        Entries are written aside then renamed, so concurrent readers (e.g. dashboard
+        workers) never load a partial file.
+
+        Args:
+            key (str): Cache key (see make_key()).
+            df (pd.DataFrame): DataFrame to cache.
+
+        Returns:
+            None
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        parquet_path, pickle_path = self._entry_paths(key)
+
+        tmp_path = parquet_path.with_name(f"{parquet_path.name}.{os.getpid()}.tmp")
+        try:
+            df.to_parquet(tmp_path)
+            os.replace(tmp_path, parquet_path)
+            print(f"[INFO] Cached cleaned dataset → {parquet_path}")
+        except (ImportError, ValueError, TypeError) as e:
+            # pyarrow errors derive from ValueError/TypeError
+            tmp_path.unlink(missing_ok=True)
+            if parquet_path.exists():
+                parquet_path.unlink()
+            tmp_path = pickle_path.with_name(f"{pickle_path.name}.{os.getpid()}.tmp")
+            df.to_pickle(tmp_path)
+            os.replace(tmp_path, pickle_path)
+            print(f"[WARNING] Parquet cache not possible ({e}), cached as pickle → {pickle_path}")
@@ -0,0 +1,345 @@
+import numpy as np
+import pandas as pd
+
+# Columns left out of the default duplicate key: they differ between re-posts of the same listing
+KEY_EXCLUDED_COLUMNS = ("Unnamed: 0", "id", "url")
+
+# Fields the near-duplicate rule needs: postal code, price and surface
+NEAR_DUPLICATE_COLUMNS = ("postCode", "price", "habitableSurface")
+
+# Fields near-duplicates must share (normalized, see row_fingerprints()), when present in the data
+NEAR_DUPLICATE_KEY_COLUMNS = ("postCode", "locality", "street", "number", "type", "subtype", "bedroomCount")
+
+# Street address fields: without them, different units of a same building or project can match
+ADDRESS_COLUMNS = ("street", "number")
+
+# Near-duplicates have prices and surfaces within this relative difference
+NEAR_DUPLICATE_TOLERANCE = 0.02
+
+# MinHash signature: MINHASH_BANDS bands of MINHASH_ROWS hashes each (LSH)
+MINHASH_BANDS = 16
+MINHASH_ROWS = 2
+
+# Rows of an LSH bucket (sorted by price) compared with their next LSH_WINDOW neighbours
+LSH_WINDOW = 3
+
+def key_columns(df: pd.DataFrame, key: list = None) -> list:
+    """
+    Columns of the duplicate key.
+
+    Args:
+        df (pd.DataFrame): Dataset.
+        key (list[str], optional): Key columns. Defaults to every column but KEY_EXCLUDED_COLUMNS.
+
+    Returns:
+        list[str]: The key columns present in df.
+    """
+    if key is None:
+        return [col for col in df.columns if col not in KEY_EXCLUDED_COLUMNS]
+    return [col for col in key if col in df.columns]
+
+def _float_hashes(values: np.ndarray) -> np.ndarray:
+    # Hashes of float values, with -0.0 as 0.0 and a single NaN
+    values = np.asarray(values, dtype="float64") + 0.0
+    return pd.util.hash_array(np.where(np.isnan(values), np.nan, values))
+
+def _column_hashes(values: pd.Series) -> np.ndarray:
+    # Hash of the normalized value of every row of a column
+    # Categorical and extension string dtypes ("string", pyarrow strings) take the text path
+    if isinstance(values.dtype, pd.CategoricalDtype) or pd.api.types.is_string_dtype(values.dtype):
+        values = values.astype(object)
+    if values.dtype != object:
+        return _float_hashes(values.to_numpy(dtype="float64", na_value=np.nan))
+
+    # Text columns: normalize and hash the distinct values only
+    codes, uniques = pd.factorize(values)
+    uniques = pd.Series(uniques, dtype=object)
+    numbers = pd.to_numeric(uniques, errors="coerce")
+    text = uniques.astype(str).str.strip().str.lower().str.replace(r"\s+", " ", regex=True)
+    hashes = np.where(numbers.isna(), pd.util.hash_array(text.to_numpy(dtype=object)),
+                      _float_hashes(numbers.to_numpy(dtype="float64")))
+    return np.where(codes >= 0, hashes[codes] if len(hashes) else 0, _float_hashes([np.nan])[0])
+
+def row_fingerprints(df: pd.DataFrame, columns: list) -> np.ndarray:
+    """
+    64-bit fingerprint of the normalized key of every row.
+
+    Values are normalized so that the fingerprint only depends on the content of the
+    listing, not on how it was typed or read: numbers as floats (pd.read_csv infers
+    dtypes per chunk, so a column can be int in one chunk and float or object in
+    another), text stripped, lowercased and with single spaces. The hashes of the
+    columns are combined as in pd.util.hash_pandas_object().
+
+    Args:
+        df (pd.DataFrame): Dataset (or chunk).
+        columns (list[str]): Key columns (see key_columns()).
+
+    Returns:
+        np.ndarray: uint64 fingerprint per row.
+    """
+    fingerprints = np.full(len(df), 0x345678, dtype=np.uint64)
+    multiplier = np.uint64(1000003)
+    for i, col in enumerate(columns):
+        fingerprints ^= _column_hashes(df[col])
+        fingerprints *= multiplier
+        multiplier += np.uint64(82520 + 2 * (len(columns) - i))
+    return fingerprints + np.uint64(97531)
+
+class FingerprintSet:
+    """
+    Compact set of row fingerprints (sorted uint64 arrays, 8 bytes per unique row).
+
+    Used to find exact duplicates across the chunks of a file too large for memory:
+    only the fingerprints of the rows kept so far are held, never the rows. They are
+    kept as a few sorted runs, merged only when a run grows as large as the previous
+    one (as in a log-structured merge tree), so adding a chunk never re-sorts the
+    whole set: every fingerprint is merged O(log N) times over the whole file, and
+    a lookup is a binary search in each of the O(log N) runs.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize an empty set.
+        """
+        self._runs = []   # Sorted, disjoint runs, from the largest to the smallest
+
+    def __len__(self) -> int:
+        return sum(len(run) for run in self._runs)
+
+    @property
+    def fingerprints(self) -> np.ndarray:
+        """
+        All the fingerprints, as a single sorted array (the runs are merged).
+        """
+        self._merge(0)
+        return self._runs[0] if self._runs else np.empty(0, dtype=np.uint64)
+
+    def _merge(self, start: int) -> None:
+        # Merge the runs from start on into one (a stable sort merges sorted runs in linear time)
+        if len(self._runs) - start > 1:
+            self._runs[start:] = [np.sort(np.concatenate(self._runs[start:]), kind="stable")]
+
+    def contains(self, fingerprints: np.ndarray) -> np.ndarray:
+        """
+        Test which fingerprints are in the set.
+
+        Args:
+            fingerprints (np.ndarray): uint64 fingerprints.
+
+        Returns:
+            np.ndarray: Boolean mask, True for the fingerprints in the set.
+        """
+        found = np.zeros(len(fingerprints), dtype=bool)
+        for run in self._runs:
+            positions = np.minimum(np.searchsorted(run, fingerprints), len(run) - 1)
+            found |= run[positions] == fingerprints
+        return found
+
+    def add_new(self, fingerprints: np.ndarray) -> np.ndarray:
+        """
+        Add fingerprints, flagging the ones not seen before.
+
+        Args:
+            fingerprints (np.ndarray): uint64 fingerprints of a chunk, in row order.
+
+        Returns:
+            np.ndarray: Boolean mask, True for the first occurrence of every new fingerprint.
+        """
+        # Duplicates inside the chunk, then duplicates of rows from previous chunks
+        new = ~pd.Series(fingerprints).duplicated().to_numpy()
+        new &= ~self.contains(fingerprints)
+        if new.any():
+            self._runs.append(np.sort(fingerprints[new]))
+            # Merge the last runs while a run is not at least twice as large as the next one
+            while len(self._runs) > 1 and len(self._runs[-2]) < 2 * len(self._runs[-1]):
+                self._merge(len(self._runs) - 2)
+        return new
+
+    def save(self, file_path: str) -> None:
+        """
+        Persist the set (e.g. to deduplicate the next scrape against this one).
+
+        Args:
+            file_path (str): Destination .npy file.
+
+        Returns:
+            None
+        """
+        np.save(file_path, self.fingerprints)
+
+    @classmethod
+    def load(cls, file_path: str) -> "FingerprintSet":
+        """
+        Load a set persisted with save().
+
+        Args:
+            file_path (str): .npy file written by save().
+
+        Returns:
+            FingerprintSet: The set.
+        """
+        fingerprint_set = cls()
+        fingerprints = np.load(file_path)
+        if len(fingerprints):
+            fingerprint_set._runs = [fingerprints]
+        return fingerprint_set
+
+def _near_duplicate_tokens(df: pd.DataFrame, tolerance: float) -> pd.Series:
+    # Tokens of every row: its shared-field key (weighted three times, so that rows with the
+    # same key and close values have a high Jaccard similarity), and the log-scale buckets of
+    # its price and surface with their upper neighbour, so values within the tolerance share a token
+    key = pd.Series(row_fingerprints(df, near_duplicate_key_columns(df)).astype(str), index=df.index)
+    tokens = [f"key{i}:" + key for i in range(3)]
+    for col in ("price", "habitableSurface"):
+        values = pd.to_numeric(df[col], errors="coerce")
+        buckets = np.floor(np.log(values.where(values > 0)) / np.log1p(tolerance))
+        for offset in (0, 1):
+            tokens.append(col + ":" + (buckets + offset).dropna().astype("int64").astype(str))
+    return pd.concat(tokens).dropna()
+
+def near_duplicate_key_columns(df: pd.DataFrame) -> list:
+    """
+    Fields near-duplicates must share: the NEAR_DUPLICATE_KEY_COLUMNS present in df.
+
+    Args:
+        df (pd.DataFrame): Dataset.
+
+    Returns:
+        list[str]: The columns.
+    """
+    return [col for col in NEAR_DUPLICATE_KEY_COLUMNS if col in df.columns]
+
+def minhash_signatures(df: pd.DataFrame, tolerance: float = NEAR_DUPLICATE_TOLERANCE,
+                       num_hashes: int = MINHASH_BANDS * MINHASH_ROWS) -> np.ndarray:
+    """
+    MinHash signature of the shared fields, price and surface of every row.
+
+    Args:
+        df (pd.DataFrame): Dataset with the NEAR_DUPLICATE_COLUMNS, with a unique index.
+        tolerance (float): Width of the price and surface buckets (relative).
+        num_hashes (int): Length of the signatures.
+
+    Returns:
+        np.ndarray: uint64 array of shape (len(df), num_hashes).
+    """
+    tokens = _near_duplicate_tokens(df, tolerance)
+    codes, vocabulary = pd.factorize(tokens)
+
+    # Tokens grouped by row, for one minimum per row and hash function
+    rows = df.index.get_indexer(tokens.index)
+    order = np.argsort(rows, kind="stable")
+    codes, rows = codes[order], rows[order]
+    starts = np.flatnonzero(np.r_[True, rows[1:] != rows[:-1]])
+
+    signatures = np.full((len(df), num_hashes), np.iinfo(np.uint64).max, dtype=np.uint64)
+    if tokens.empty:
+        return signatures
+    for i in range(num_hashes):
+        # One independent hash function per signature position (a different hash key each),
+        # applied to the distinct tokens only
+        hashes = pd.util.hash_array(np.asarray(vocabulary, dtype=object), hash_key=f"minhash{i:09d}")
+        signatures[rows[starts], i] = np.minimum.reduceat(hashes[codes], starts)
+    return signatures
+
+def _drop_direct_matches(size: int, pairs: np.ndarray) -> np.ndarray:
+    # Rows matching an earlier kept row: a row matching only dropped rows is kept,
+    # so chains of matches (A~B~C with A and C too different) never collapse into one
+    dropped = np.zeros(size, dtype=bool)
+    # Distinct pairs, encoded as later * size + earlier: sorted by later row, then earlier row
+    codes = np.unique(pairs.max(axis=1).astype(np.int64) * size + pairs.min(axis=1))
+    later_rows, earlier_rows = np.divmod(codes, size)
+    for earlier, later in zip(earlier_rows.tolist(), later_rows.tolist()):
+        if not dropped[earlier]:
+            dropped[later] = True
+    return dropped
+
+def near_duplicate_mask(df: pd.DataFrame, tolerance: float = NEAR_DUPLICATE_TOLERANCE,
+                        bands: int = MINHASH_BANDS, rows_per_band: int = MINHASH_ROWS,
+                        window: int = LSH_WINDOW) -> np.ndarray:
+    """
+    Flag the near-duplicates of earlier rows: same NEAR_DUPLICATE_KEY_COLUMNS (postal code,
+    locality, street address, type, subtype and bedroom count, those present in df), and
+    price and surface within the tolerance (e.g. a listing re-posted with a slightly
+    different price).
+
+    Candidate pairs come from locality-sensitive hashing of MinHash signatures (rows
+    sharing a band of their signature fall in the same bucket), and within a bucket
+    every row is only compared with its next `window` rows by price, so the number of
+    comparisons grows linearly with the number of rows. A row is flagged only if it
+    directly matches an earlier row that is kept (matches are not transitive).
+
+    Args:
+        df (pd.DataFrame): Dataset with the NEAR_DUPLICATE_COLUMNS.
+        tolerance (float): Maximal relative difference of price and surface.
+        bands (int): Number of LSH bands.
+        rows_per_band (int): Signature hashes per band.
+        window (int): Neighbours compared with every row of a bucket.
+
+    Returns:
+        np.ndarray: Boolean mask, True for the rows to drop.
+    """
+    data = df[near_duplicate_key_columns(df) + ["price", "habitableSurface"]].reset_index(drop=True)
+    signatures = minhash_signatures(data, tolerance, bands * rows_per_band)
+    keys = row_fingerprints(data, near_duplicate_key_columns(data))
+    # Rows without postal code never match
+    has_postcode = pd.to_numeric(data["postCode"], errors="coerce").notna().to_numpy()
+    prices = pd.to_numeric(data["price"], errors="coerce").to_numpy(dtype="float64")
+    surfaces = pd.to_numeric(data["habitableSurface"], errors="coerce").to_numpy(dtype="float64")
+
+    pairs = []
+    for band in range(bands):
+        band_keys = pd.util.hash_pandas_object(
+            pd.DataFrame(signatures[:, band * rows_per_band:(band + 1) * rows_per_band]), index=False).to_numpy()
+        order = np.lexsort((prices, band_keys))
+        sorted_keys = band_keys[order]
+        for offset in range(1, window + 1):
+            same_bucket = sorted_keys[:-offset] == sorted_keys[offset:]
+            a, b = order[:-offset][same_bucket], order[offset:][same_bucket]
+            # Keep the candidates satisfying the rule (missing prices and surfaces never match)
+            with np.errstate(invalid="ignore"):
+                close = (
+                    (keys[a] == keys[b]) & has_postcode[a]
+                    & (np.abs(prices[a] - prices[b]) <= tolerance * np.maximum(prices[a], prices[b]))
+                    & (np.abs(surfaces[a] - surfaces[b]) <= tolerance * np.maximum(surfaces[a], surfaces[b]))
+                )
+            pairs.append(np.column_stack([a[close], b[close]]))
+
+    pairs = np.concatenate(pairs) if pairs else np.empty((0, 2), dtype=np.int64)
+    return _drop_direct_matches(len(data), pairs)
+
+def deduplicate(df: pd.DataFrame, key: list = None, near_duplicates: bool = False) -> tuple:
+    """
+    Remove the duplicate listings of a dataset, keeping the first occurrence.
+
+    Rules, applied in order:
+    - "exact": same fingerprint of the normalized key columns (see row_fingerprints());
+    - "near" (optional): same postal code, address, type, subtype and bedroom count,
+      with price and surface within NEAR_DUPLICATE_TOLERANCE (see near_duplicate_mask()).
+
+    Args:
+        df (pd.DataFrame): Dataset.
+        key (list[str], optional): Key columns of the exact rule. Defaults to every
+                                   column but KEY_EXCLUDED_COLUMNS (id, url, ...).
+        near_duplicates (bool): If True, also remove near-duplicates.
+
+    Returns:
+        tuple: (deduplicated DataFrame, dict of the number of rows removed by each rule)
+    """
+    fingerprints = row_fingerprints(df, key_columns(df, key))
+    keep = ~pd.Series(fingerprints).duplicated().to_numpy()
+    removed = {"exact": int((~keep).sum())}
+    df = df[keep]
+
+    if near_duplicates:
+        if all(col in df.columns for col in NEAR_DUPLICATE_COLUMNS):
+            if not any(col in df.columns for col in ADDRESS_COLUMNS):
+                print(f"[WARNING] No street address column ({', '.join(ADDRESS_COLUMNS)}): near-duplicates are "
+                      "matched on postal code, locality, type, subtype and bedroom count only.")
+            near = near_duplicate_mask(df)
+            removed["near"] = int(near.sum())
+            df = df[~near]
+        else:
+            print(f"[WARNING] Near-duplicate detection needs the columns {list(NEAR_DUPLICATE_COLUMNS)}, skipped.")
+            removed["near"] = 0
+
+    return df, removed
@@ -0,0 +1,355 @@
+import argparse
+import json
+import os
+from pathlib import Path
+import numpy as np
+
+# Default location of the local geometry store
+GEO_DIR = "data/geo"
+
+# Simplification tolerances (in degrees: ~50 m, ~200 m and ~1 km), from the most to the least detailed
+TOLERANCES = (0.0005, 0.002, 0.01)
+
+# Feature id of the stored features (featureidkey of px.choropleth())
+FEATURE_ID_KEY = "properties.id"
+
+# Decimals kept in the stored coordinates (~1 m)
+COORDINATE_DECIMALS = 5
+
+# Names used by the dashboard (regions as in src/regions.py, provinces as in the raw dataset),
+# per level, keyed by the other spellings found in GeoJSON sources (Dutch, French, English)
+FEATURE_ID_ALIASES = {
+    "region": {
+        "Brussels-Capital": "Brussels", "Brussels Capital Region": "Brussels", "Brussels-Capital Region": "Brussels",
+        "Brussel": "Brussels", "Bruxelles": "Brussels", "Région de Bruxelles-Capitale": "Brussels",
+        "Brussels Hoofdstedelijk Gewest": "Brussels",
+        "Flemish Region": "Flanders", "Vlaanderen": "Flanders", "Vlaams Gewest": "Flanders", "Région flamande": "Flanders",
+        "Walloon Region": "Wallonia", "Wallonie": "Wallonia", "Région wallonne": "Wallonia", "Waals Gewest": "Wallonia",
+    },
+    "province": {
+        "Brussels-Capital": "Brussels", "Brussels Capital Region": "Brussels", "Brussel": "Brussels", "Bruxelles": "Brussels",
+        "Antwerpen": "Antwerp", "Anvers": "Antwerp",
+        "Oost-Vlaanderen": "East Flanders", "Flandre orientale": "East Flanders", "Flandre-Orientale": "East Flanders",
+        "West-Vlaanderen": "West Flanders", "Flandre occidentale": "West Flanders", "Flandre-Occidentale": "West Flanders",
+        "Vlaams-Brabant": "Flemish Brabant", "Brabant flamand": "Flemish Brabant",
+        "Waals-Brabant": "Walloon Brabant", "Brabant wallon": "Walloon Brabant",
+        "Liege": "Liège", "Luik": "Liège", "Lüttich": "Liège",
+        "Henegouwen": "Hainaut", "Namen": "Namur", "Limbourg": "Limburg", "Luxemburg": "Luxembourg",
+    },
+}
+
+def _douglas_peucker(points: np.ndarray, tolerance: float) -> np.ndarray:
+    # Iterative Douglas-Peucker: keep the points farther than tolerance from the simplified line
+    keep = np.zeros(len(points), dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+
+    while stack:
+        start, end = stack.pop()
+        if end <= start + 1:
+            continue
+
+        inner = points[start + 1:end] - points[start]
+        direction = points[end] - points[start]
+        length = np.hypot(*direction)
+        if length == 0:
+            distances = np.hypot(inner[:, 0], inner[:, 1])
+        else:
+            distances = np.abs(direction[0] * inner[:, 1] - direction[1] * inner[:, 0]) / length
+
+        farthest = int(np.argmax(distances))
+        if distances[farthest] > tolerance:
+            index = start + 1 + farthest
+            keep[index] = True
+            stack.append((start, index))
+            stack.append((index, end))
+
+    return points[keep]
+
+def _open_ring(ring: list) -> np.ndarray:
+    # Rounded ring coordinates, without the closing point
+    points = np.round(np.asarray(ring, dtype="float64")[:, :2], COORDINATE_DECIMALS)
+    if len(points) > 1 and (points[0] == points[-1]).all():
+        points = points[:-1]
+    return points
+
+def _polygons(geometry: dict) -> list:
+    # Polygons of a Polygon or MultiPolygon geometry (none for other types)
+    if geometry["type"] == "Polygon":
+        return [geometry["coordinates"]]
+    if geometry["type"] == "MultiPolygon":
+        return geometry["coordinates"]
+    return []
+
+def find_junctions(geometries: list) -> set:
+    """
+    Find the junctions of a set of polygon geometries: the vertices where a shared
+    border starts or ends (where rings meet, split or part).
+
+    A vertex is a junction when its rings do not all reach it from the same two
+    neighbours. Borders between junctions are then the same chain of vertices in
+    every ring that contains them, so they can be simplified once for all of them.
+    Shared borders are detected by their identical (rounded) vertices.
+
+    Args:
+        geometries (list[dict]): GeoJSON geometries (e.g. every feature of a level).
+
+    Returns:
+        set[tuple]: (x, y) coordinates of the junctions, rounded to COORDINATE_DECIMALS.
+    """
+    rings = [_open_ring(ring) for geometry in geometries for polygon in _polygons(geometry) for ring in polygon]
+    rings = [ring for ring in rings if len(ring) >= 3]
+    if not rings:
+        return set()
+
+    vertices, ids = np.unique(np.concatenate(rings), axis=0, return_inverse=True)
+    ids = ids.reshape(-1)
+    ring_ids = np.split(ids, np.cumsum([len(ring) for ring in rings])[:-1])
+    previous = np.concatenate([np.roll(r, 1) for r in ring_ids])
+    following = np.concatenate([np.roll(r, -1) for r in ring_ids])
+
+    # Distinct (vertex, unordered pair of neighbours) occurrences
+    neighbours = np.unique(np.column_stack([ids, np.minimum(previous, following), np.maximum(previous, following)]), axis=0)
+    counts = np.bincount(neighbours[:, 0], minlength=len(vertices))
+    return set(map(tuple, vertices[counts > 1].tolist()))
+
+def _simplify_arc(arc: np.ndarray, tolerance: float, arcs: dict) -> np.ndarray:
+    # Simplified arc (endpoints kept), computed once per arc whichever way it is walked
+    key = arc.tobytes()
+    if key in arcs:
+        return arcs[key]
+    reversed_key = arc[::-1].tobytes()
+    if reversed_key in arcs:
+        return arcs[reversed_key][::-1]
+    arcs[key] = _douglas_peucker(arc, tolerance) if len(arc) > 2 else arc
+    return arcs[key]
+
+def _simplify_ring(ring: list, tolerance: float, junctions: set, arcs: dict) -> list | None:
+    # Simplified closed ring, or None if it collapses (fewer than 4 points)
+    points = _open_ring(ring)
+    if len(points) < 3:
+        return None
+    is_junction = np.array([point in junctions for point in map(tuple, points.tolist())])
+
+    if not is_junction.any():
+        # Whole ring as a single closed arc, from its lowest vertex, so that a ring shared
+        # as a whole (e.g. an enclave and the hole around it) is simplified the same way
+        first = np.lexsort((points[:, 1], points[:, 0]))[0]
+        points = np.roll(points, -first, axis=0)
+        simplified = _simplify_arc(np.vstack([points, points[:1]]), tolerance, arcs)
+    else:
+        # Split at the junctions and simplify every arc between them
+        first = int(np.argmax(is_junction))
+        points = np.roll(points, -first, axis=0)
+        cuts = np.flatnonzero(np.roll(is_junction, -first)).tolist() + [len(points)]
+        closed = np.vstack([points, points[:1]])
+        pieces = [closed[:1]]
+        for start, end in zip(cuts[:-1], cuts[1:]):
+            pieces.append(_simplify_arc(closed[start:end + 1], tolerance, arcs)[1:])
+        simplified = np.vstack(pieces)
+
+    if len(simplified) < 4:
+        return None
+    return simplified.tolist()
+
+def _coarse_ring(ring: list) -> list:
+    # Smallest closed ring (4 points) evenly sampled from a ring, for geometries that collapse
+    points = np.asarray(ring, dtype="float64")[:, :2]
+    sampled = points[np.linspace(0, len(points) - 1, 5).astype(int)]
+    return np.round(sampled, COORDINATE_DECIMALS).tolist()
+
+def _simplify_polygon(polygon: list, tolerance: float, junctions: set, arcs: dict) -> list | None:
+    exterior = _simplify_ring(polygon[0], tolerance, junctions, arcs)
+    if exterior is None:
+        return None
+    holes = [hole for hole in (_simplify_ring(ring, tolerance, junctions, arcs) for ring in polygon[1:])
+             if hole is not None]
+    return [exterior] + holes
+
+def simplify_geometry(geometry: dict, tolerance: float, junctions: set = None, arcs: dict = None) -> dict:
+    """
+    Simplify a GeoJSON Polygon or MultiPolygon with the Douglas-Peucker algorithm.
+
+    Rings are split at the junctions (see find_junctions()) and every arc between two
+    junctions is simplified once: borders shared with other geometries simplified with
+    the same junctions and arcs are simplified identically on both sides, without gaps
+    or overlaps. Coordinates are rounded to COORDINATE_DECIMALS.
+
+    Rings that collapse at this tolerance (e.g. tiny islands) are dropped, unless the
+    whole geometry would vanish, in which case its first polygon is reduced to 4 points.
+
+    Args:
+        geometry (dict): GeoJSON geometry.
+        tolerance (float): Maximal distance (in coordinate units) between the original
+                           and the simplified boundaries.
+        junctions (set, optional): Junctions of all the geometries of the level. Defaults
+                                   to the junctions of this geometry alone.
+        arcs (dict, optional): Arcs already simplified at this tolerance, shared between
+                               the geometries of the level (filled in place).
+
+    Returns:
+        dict: The simplified geometry (other geometry types are returned unchanged).
+    """
+    polygons = _polygons(geometry)
+    if not polygons:
+        return geometry
+    if junctions is None:
+        junctions = find_junctions([geometry])
+    if arcs is None:
+        arcs = {}
+
+    simplified = [p for p in (_simplify_polygon(polygon, tolerance, junctions, arcs) for polygon in polygons)
+                  if p is not None]
+    if not simplified:
+        return {"type": "Polygon", "coordinates": [_coarse_ring(polygons[0][0])]}
+    if len(simplified) == 1:
+        return {"type": "Polygon", "coordinates": simplified[0]}
+    return {"type": "MultiPolygon", "coordinates": simplified}
+
+def _store_path(geo_dir: str, level: str, tolerance: float) -> Path:
+    return Path(geo_dir) / f"{level}-{tolerance:g}.geojson"
+
+def build_geo_store(source_path: str, level: str, id_property: str, geo_dir: str = GEO_DIR,
+                    tolerances: tuple = TOLERANCES) -> list:
+    """
+    Simplify a full-resolution GeoJSON file at several tolerances and store the results locally.
+
+    Only the feature id is kept (as properties.id, see FEATURE_ID_KEY) and coordinates
+    are rounded, to keep the stored files small. Region and province ids are stored under
+    the dashboard's names (see FEATURE_ID_ALIASES), whatever the source's language. Borders shared by neighbouring features
+    are simplified once (see simplify_geometry()), so the simplified features still tile
+    without gaps or overlaps, provided the source has the same vertices on both sides
+    of each border.
+
+    Args:
+        source_path (str): Full-resolution GeoJSON FeatureCollection (e.g. Belgian provinces).
+        level (str): Level of the geometries (e.g. "region", "province", "municipality").
+        id_property (str): Feature property identifying each feature (e.g. "name").
+        geo_dir (str): Store directory.
+        tolerances (tuple[float]): Simplification tolerances, in coordinate units (degrees).
+
+    Returns:
+        list[str]: Paths of the written files.
+    """
+    with open(source_path, encoding="utf-8") as f:
+        source = json.load(f)
+
+    os.makedirs(geo_dir, exist_ok=True)
+    aliases = FEATURE_ID_ALIASES.get(level, {})
+    junctions = find_junctions([feature["geometry"] for feature in source["features"]])
+    written = []
+    for tolerance in tolerances:
+        arcs = {}
+        collection = {
+            "type": "FeatureCollection",
+            "features": [
+                {
+                    "type": "Feature",
+                    "properties": {"id": aliases.get(feature["properties"][id_property], feature["properties"][id_property])},
+                    "geometry": simplify_geometry(feature["geometry"], tolerance, junctions, arcs)
+                }
+                for feature in source["features"]
+            ]
+        }
+
+        path = _store_path(geo_dir, level, tolerance)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(collection, f, separators=(",", ":"), ensure_ascii=False)
+        print(f"[SUCCESS] {level} geometries simplified at {tolerance:g} ({path.stat().st_size / 1024:.0f} KB) → {path}")
+        written.append(str(path))
+
+    return written
+
+class GeoStore:
+    """
+    Local, pre-simplified geometries (see build_geo_store()), read from disk once.
+    """
+
+    def __init__(self, geo_dir: str = GEO_DIR) -> None:
+        """
+        Initialize the store.
+
+        Args:
+            geo_dir (str): Store directory.
+        """
+        self.geo_dir = geo_dir
+        self._loaded = {}
+
+    def tolerances(self, level: str) -> list:
+        """
+        Tolerances at which the geometries of a level are stored.
+
+        Args:
+            level (str): Geometry level (e.g. "region").
+
+        Returns:
+            list[float]: Available tolerances, from the most to the least detailed.
+        """
+        tolerances = []
+        for path in Path(self.geo_dir).glob(f"{level}-*.geojson"):
+            try:
+                tolerances.append(float(path.stem[len(level) + 1:]))
+            except ValueError:
+                continue
+        return sorted(tolerances)
+
+    def tolerance_for_zoom(self, level: str, scale: float = 1.0) -> float:
+        """
+        Lightest stored tolerance detailed enough for a map zoom level.
+
+        The least detailed tolerance is used for the whole map (scale 1); zooming in by
+        a factor k requires a tolerance k times smaller.
+
+        Args:
+            level (str): Geometry level (e.g. "region").
+            scale (float): Zoom factor of the map (e.g. plotly's geo.projection.scale).
+
+        Returns:
+            float: The tolerance (the most detailed one beyond its zoom range).
+
+        Raises:
+            FileNotFoundError: If the level is not in the store.
+        """
+        tolerances = self.tolerances(level)
+        if not tolerances:
+            raise FileNotFoundError(f"No '{level}' geometries in {self.geo_dir} (see src/geo_store.py)")
+        required = tolerances[-1] / max(scale, 1.0)
+        detailed_enough = [tolerance for tolerance in tolerances if tolerance <= required * (1 + 1e-9)]
+        return detailed_enough[-1] if detailed_enough else tolerances[0]
+
+    def get(self, level: str, tolerance: float = None) -> dict:
+        """
+        Geometries of a level, as a GeoJSON FeatureCollection (cached after the first read).
+
+        Args:
+            level (str): Geometry level (e.g. "region").
+            tolerance (float, optional): Simplification tolerance. Defaults to the least
+                                         detailed (lightest) one available.
+
+        Returns:
+            dict: The FeatureCollection (features identified by FEATURE_ID_KEY).
+
+        Raises:
+            FileNotFoundError: If the level (or tolerance) is not in the store.
+        """
+        if tolerance is None:
+            tolerance = self.tolerance_for_zoom(level)
+
+        key = (level, tolerance)
+        if key not in self._loaded:
+            path = _store_path(self.geo_dir, level, tolerance)
+            if not path.exists():
+                raise FileNotFoundError(f"Geometries not found: {path}")
+            with open(path, encoding="utf-8") as f:
+                self._loaded[key] = json.load(f)
+        return self._loaded[key]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Add simplified geometries to the local geometry store.")
+    parser.add_argument("source", help="full-resolution GeoJSON FeatureCollection")
+    parser.add_argument("--level", required=True, help="geometry level, e.g. region, province or municipality")
+    parser.add_argument("--id-property", default="name", help="feature property identifying each feature")
+    parser.add_argument("--geo-dir", default=GEO_DIR, help=f"store directory (default: {GEO_DIR})")
+    args = parser.parse_args()
+
+    build_geo_store(args.source, args.level, args.id_property, args.geo_dir)
@@ -0,0 +1,279 @@
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+import pandas as pd
+from src.data_cleanner import DataCleanner
+from src.dataset_cache import DatasetCache, RAW_DATA_FILE
+from src.quantile_sketch import GroupedQuantileSketch, DEFAULT_RELATIVE_ACCURACY, grouped_median
+from src.regions import map_postcodes_to_region
+
+# Grouping of the locality summary
+GROUP_COLS = ["region", "province", "locality", "subtype"]
+
+# Default location of the persisted aggregate store
+STORE_DIR = "data/aggregates"
+
+# Summary emitted by src/summary.py (and by the store)
+SUMMARY_FILE = "output/summary_by_locality.csv"
+
+def prepare_listings(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Apply the quality filters of the locality summary and derive its columns.
+
+    Keeps the listings with a habitable surface in (10, 25000) m² and a price in
+    (10,000, 800,000) €, and adds the 'price_per_m2' and 'region' columns.
+
+    Args:
+        df (pd.DataFrame): Cleaned listings.
+
+    Returns:
+        pd.DataFrame: Filtered listings (a new DataFrame).
+    """
+    df = df[
+        (df["habitableSurface"].notna()) &
+        (df["habitableSurface"] > 10) &
+        (df["habitableSurface"] < 25000) &
+        (df["price"] > 10000) &
+        (df["price"] < 800000)
+    ]
+    return df.assign(
+        price_per_m2=df["price"] / df["habitableSurface"],
+        region=map_postcodes_to_region(df["postCode"])
+    )
+
+class LocalityAggregateStore:
+    """
+    Incrementally maintained statistics per (region, province, locality, subtype).
+
+    Each group keeps mergeable state only: its listing count, the sums of the prices and
+    of the prices per m², and a quantile sketch of the prices (for the median). Inserting
+    or deleting listings updates the state of their groups, so the summary can be
+    re-emitted without rescanning the full dataset.
+
+    A store built from a full dataset can also keep the exact median of every group;
+    the median of a group is then approximate (within the sketch's relative accuracy)
+    only once listings of that group are inserted or deleted. The store remembers the
+    key of the cleaned dataset it was built from (source_key), so that callers can tell
+    when it must be rebuilt.
+    """
+
+    def __init__(self, relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY,
+                 totals: pd.DataFrame = None, price_sketch: GroupedQuantileSketch = None,
+                 exact_medians: pd.Series = None, source_key: str = None,
+                 median_accuracy: float = None) -> None:
+        """
+        Initialize the store (empty by default).
+
+        Args:
+            relative_accuracy (float): Maximal relative error of the approximate medians.
+            totals (pd.DataFrame, optional): Count and sums per group, indexed by GROUP_COLS.
+            price_sketch (GroupedQuantileSketch, optional): Price sketch per group.
+            exact_medians (pd.Series, optional): Exact median price of the groups not updated
+                                                 since the store was built, indexed by GROUP_COLS.
+            source_key (str, optional): Key of the cleaned dataset the store was built from.
+            median_accuracy (float, optional): Accuracy of the medians the store was built
+                                               with (see from_frame()), None for exact medians.
+        """
+        if totals is None:
+            totals = pd.DataFrame(
+                {"count": pd.Series([], dtype="int64"),
+                 "price_sum": pd.Series([], dtype="float64"),
+                 "price_m2_sum": pd.Series([], dtype="float64")},
+                index=pd.MultiIndex.from_arrays([[]] * len(GROUP_COLS), names=GROUP_COLS)
+            )
+        self.totals = totals
+        self.price_sketch = price_sketch or GroupedQuantileSketch(GROUP_COLS, relative_accuracy)
+        if exact_medians is None:
+            exact_medians = pd.Series([], dtype="float64", index=totals.index[:0], name="exact_median")
+        self.exact_medians = exact_medians
+        self.source_key = source_key
+        self.median_accuracy = median_accuracy
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, median_accuracy: float = None,
+                   source_key: str = None) -> "LocalityAggregateStore":
+        """
+        Build a store from a DataFrame of cleaned listings.
+
+        Args:
+            df (pd.DataFrame): Cleaned listings.
+            median_accuracy (float, optional): None (default) to keep the exact median of
+                                               every group (until the group is updated), else
+                                               the maximal relative error of the approximate medians.
+            source_key (str, optional): Key of the cleaned dataset (see DataCleanner.cache_key).
+
+        Returns:
+            LocalityAggregateStore: The store.
+        """
+        store = cls(median_accuracy or DEFAULT_RELATIVE_ACCURACY, source_key=source_key,
+                    median_accuracy=median_accuracy)
+        store.insert(df)
+        if median_accuracy is None:
+            store.exact_medians = grouped_median(cls._prepare(df), GROUP_COLS, "price").rename("exact_median")
+        return store
+
+    @staticmethod
+    def _prepare(df: pd.DataFrame) -> pd.DataFrame:
+        listings = prepare_listings(df)
+        # Plain object keys, so groups from categorical and non-categorical frames match
+        return listings.astype({col: "object" for col in GROUP_COLS})
+
+    @staticmethod
+    def _group_totals(listings: pd.DataFrame) -> pd.DataFrame:
+        return listings.groupby(GROUP_COLS).agg(
+            count=("price", "count"),
+            price_sum=("price", "sum"),
+            price_m2_sum=("price_per_m2", "sum")
+        )
+
+    def insert(self, df: pd.DataFrame) -> None:
+        """
+        Add new listings to the aggregates.
+
+        Args:
+            df (pd.DataFrame): New cleaned listings (the summary's filters are applied).
+
+        Returns:
+            None
+        """
+        listings = self._prepare(df)
+        group_totals = self._group_totals(listings)
+        self.totals = self.totals.add(group_totals, fill_value=0).astype({"count": "int64"})
+        self.price_sketch.add(listings, "price")
+        # The medians of the updated groups are approximate from now on
+        self.exact_medians = self.exact_medians.drop(group_totals.index, errors="ignore")
+
+    def delete(self, df: pd.DataFrame) -> None:
+        """
+        Remove listings that were previously inserted.
+
+        Args:
+            df (pd.DataFrame): Removed cleaned listings, as they were inserted.
+
+        Returns:
+            None
+        """
+        listings = self._prepare(df)
+        group_totals = self._group_totals(listings)
+        totals = self.totals.sub(group_totals, fill_value=0)
+        self.totals = totals[totals["count"] > 0].astype({"count": "int64"})
+        self.price_sketch.remove(listings, "price")
+        self.exact_medians = self.exact_medians.drop(group_totals.index, errors="ignore")
+
+    def summary(self) -> pd.DataFrame:
+        """
+        Statistics of every group, as emitted in summary_by_locality.csv.
+
+        Returns:
+            pd.DataFrame: Columns ['region', 'province', 'locality', 'subtype', 'avg_price',
+                          'med_price', 'price_m2', 'count'], one row per group.
+        """
+        totals = self.totals.sort_index()
+        # Exact medians where still known, sketch medians elsewhere
+        medians = self.exact_medians.reindex(totals.index).fillna(self.price_sketch.quantile(0.5).reindex(totals.index))
+        return pd.DataFrame({
+            "avg_price": totals["price_sum"] / totals["count"],
+            "med_price": medians,
+            "price_m2": totals["price_m2_sum"] / totals["count"],
+            "count": totals["count"]
+        }).reset_index()
+
+    def to_csv(self, file_path: str = SUMMARY_FILE) -> pd.DataFrame:
+        """
+        Emit the summary as a CSV file.
+
+        Args:
+            file_path (str): Destination file path.
+
+        Returns:
+            pd.DataFrame: The summary.
+        """
+        summary = self.summary()
+        os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+        summary.to_csv(file_path, index=False)
+        return summary
+
+    def save(self, store_dir: str = STORE_DIR) -> None:
+        """
+        Persist the store to a directory (Parquet files).
+
+        Args:
+            store_dir (str): Destination directory.
+
+        Returns:
+            None
+        """
+        os.makedirs(store_dir, exist_ok=True)
+        totals = self.totals.join(self.exact_medians.rename("exact_median"))
+        totals.reset_index().to_parquet(Path(store_dir) / "totals.parquet", index=False)
+        self.price_sketch.save(Path(store_dir) / "price_sketch.parquet")
+        with open(Path(store_dir) / "store.json", "w", encoding="utf-8") as f:
+            json.dump({"source_key": self.source_key, "median_accuracy": self.median_accuracy}, f)
+        print(f"[SUCCESS] Saved aggregates of {len(self.totals)} groups → {store_dir}")
+
+    @classmethod
+    def load(cls, store_dir: str = STORE_DIR) -> "LocalityAggregateStore":
+        """
+        Load a store persisted with save().
+
+        Args:
+            store_dir (str): Directory written by save().
+
+        Returns:
+            LocalityAggregateStore: The store.
+
+        Raises:
+            FileNotFoundError: If no store was saved in the directory.
+        """
+        totals_path = Path(store_dir) / "totals.parquet"
+        if not totals_path.exists():
+            raise FileNotFoundError(f"Aggregate store not found: {store_dir}")
+
+        totals = pd.read_parquet(totals_path).set_index(GROUP_COLS)
+        exact_medians = totals.pop("exact_median").dropna() if "exact_median" in totals else None
+        price_sketch = GroupedQuantileSketch.load(Path(store_dir) / "price_sketch.parquet", GROUP_COLS)
+        metadata_path = Path(store_dir) / "store.json"
+        metadata = {}
+        if metadata_path.exists():
+            with open(metadata_path, encoding="utf-8") as f:
+                metadata = json.load(f)
+        return cls(price_sketch.relative_accuracy, totals, price_sketch, exact_medians,
+                   metadata.get("source_key"), metadata.get("median_accuracy", price_sketch.relative_accuracy))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Update the locality aggregates and re-emit summary_by_locality.csv.")
+    parser.add_argument("--rebuild", action="store_true",
+                        help="build the store from the full cleaned dataset instead of loading it")
+    parser.add_argument("--rebuild-cache", action="store_true",
+                        help="ignore the cached cleaned dataset (with --rebuild)")
+    parser.add_argument("--insert", metavar="CSV", help="cleaned listings to add")
+    parser.add_argument("--delete", metavar="CSV", help="cleaned listings to remove")
+    parser.add_argument("--store-dir", default=STORE_DIR, help=f"store directory (default: {STORE_DIR})")
+    args = parser.parse_args()
+
+    if args.rebuild:
+        data = DataCleanner(RAW_DATA_FILE, cache=DatasetCache(rebuild=args.rebuild_cache))
+        store = LocalityAggregateStore.from_frame(data.normalization(), source_key=data.cache_key)
+    else:
+        try:
+            store = LocalityAggregateStore.load(args.store_dir)
+        except FileNotFoundError as e:
+            sys.exit(f"[ERROR] {e} (run with --rebuild first)")
+
+    start = time.perf_counter()
+    if args.insert:
+        store.insert(pd.read_csv(args.insert))
+    if args.delete:
+        store.delete(pd.read_csv(args.delete))
+    update_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    summary = store.to_csv(SUMMARY_FILE)
+    emit_time = time.perf_counter() - start
+
+    store.save(args.store_dir)
+    print(f"[INFO] Updated in {update_time * 1000:.0f} ms, emitted {len(summary)} groups in "
+          f"{emit_time * 1000:.0f} ms → {SUMMARY_FILE}")
@@ -0,0 +1,166 @@
+import os
+from pathlib import Path
+import pandas as pd
+
+class LocalityCanonicalizer:
+    """
+    Canonical (most frequent) locality name of every postal code.
+
+    The table is derived from the counts of each (postCode, locality) pair, counted once
+    in a single vectorized groupby. The counts are kept, so the table can be updated
+    when listings are added or removed, merged across chunks, and persisted between
+    runs instead of being recomputed from the full dataset.
+
+    Ties between localities with the same count go to the first one in sorted order,
+    like Series.mode().
+    """
+
+    def __init__(self, pair_counts: pd.Series = None) -> None:
+        """
+        Initialize the canonicalizer.
+
+        Args:
+            pair_counts (pd.Series, optional): Number of listings per (postCode, locality)
+                                               pair, indexed by a ("postCode", "locality")
+                                               MultiIndex. Empty by default.
+        """
+        if pair_counts is None:
+            pair_counts = pd.Series(
+                [], dtype="int64",
+                index=pd.MultiIndex.from_arrays([[], []], names=["postCode", "locality"])
+            )
+        self.pair_counts = pair_counts
+        self._table = None
+
+    @staticmethod
+    def count_pairs(df: pd.DataFrame) -> pd.Series:
+        """
+        Count the listings of each (postCode, locality) pair.
+
+        Listings without a postal code are ignored.
+
+        Args:
+            df (pd.DataFrame): Listings with 'postCode' and (standardized) 'locality' columns.
+
+        Returns:
+            pd.Series: Counts indexed by a ("postCode", "locality") MultiIndex.
+        """
+        return df.groupby(["postCode", "locality"]).size()
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "LocalityCanonicalizer":
+        """
+        Build a canonicalizer from a DataFrame of listings.
+
+        Args:
+            df (pd.DataFrame): Listings with 'postCode' and (standardized) 'locality' columns.
+
+        Returns:
+            LocalityCanonicalizer: The canonicalizer.
+        """
+        return cls(cls.count_pairs(df))
+
+    def update(self, added: pd.DataFrame = None, removed: pd.DataFrame = None) -> None:
+        """
+        Update the pair counts with added and/or removed listings.
+
+        Args:
+            added (pd.DataFrame, optional): New listings.
+            removed (pd.DataFrame, optional): Listings that no longer exist.
+
+        Returns:
+            None
+        """
+        counts = self.pair_counts
+        if added is not None and not added.empty:
+            counts = counts.add(self.count_pairs(added), fill_value=0)
+        if removed is not None and not removed.empty:
+            counts = counts.sub(self.count_pairs(removed), fill_value=0)
+        self.pair_counts = counts[counts > 0].astype("int64")
+        self._table = None
+
+    def merge(self, other: "LocalityCanonicalizer") -> None:
+        """
+        Add the counts of another canonicalizer (e.g. built from another chunk) to this one.
+
+        Args:
+            other (LocalityCanonicalizer): Canonicalizer to merge.
+
+        Returns:
+            None
+        """
+        self.pair_counts = self.pair_counts.add(other.pair_counts, fill_value=0).astype("int64")
+        self._table = None
+
+    @property
+    def table(self) -> pd.Series:
+        """
+        Most frequent locality of every postal code (computed on first access after a change).
+
+        Returns:
+            pd.Series: Locality names indexed by postCode.
+        """
+        if self._table is None:
+            ranked = self.pair_counts.rename("count").reset_index().sort_values(
+                ["postCode", "count", "locality"], ascending=[True, False, True]
+            )
+            self._table = ranked.drop_duplicates("postCode").set_index("postCode")["locality"]
+        return self._table
+
+    def canonicalize(self, postcodes: pd.Series, localities: pd.Series) -> pd.Series:
+        """
+        Replace each locality by the canonical locality of its postal code.
+
+        Listings without a postal code get NaN; postal codes missing from the table
+        (e.g. new ones) keep their own locality.
+
+        Args:
+            postcodes (pd.Series): Postal codes.
+            localities (pd.Series): Standardized localities, aligned with postcodes.
+
+        Returns:
+            pd.Series: Canonical localities.
+        """
+        canonical = postcodes.map(self.table)
+        return canonical.where(canonical.notna() | postcodes.isna(), localities)
+
+    def fingerprint(self) -> str:
+        """
+        Short fingerprint of the canonical table, to tell whether two tables differ.
+
+        Returns:
+            str: Hexadecimal fingerprint.
+        """
+        table = self.table.reset_index()
+        return format(int(pd.util.hash_pandas_object(table, index=False).sum()) & (2**64 - 1), "016x")
+
+    def save(self, file_path: str) -> None:
+        """
+        Persist the pair counts to a CSV file.
+
+        Args:
+            file_path (str): Destination file path.
+
+        Returns:
+            None
+        """
+        os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+        self.pair_counts.rename("count").reset_index().to_csv(file_path, index=False)
+        print(f"[SUCCESS] Saved locality table ({len(self.table)} postal codes) → {file_path}")
+
+    @classmethod
+    def load(cls, file_path: str) -> "LocalityCanonicalizer":
+        """
+        Load pair counts persisted with save().
+
+        Args:
+            file_path (str): CSV file written by save().
+
+        Returns:
+            LocalityCanonicalizer: The canonicalizer.
+        """
+        if not Path(file_path).exists():
+            raise FileNotFoundError(f"Locality table not found: {file_path}")
+
+        counts = pd.read_csv(file_path, dtype={"locality": str}, keep_default_na=False)
+        return cls(counts.set_index(["postCode", "locality"])["count"])
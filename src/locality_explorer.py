@@ -0,0 +1,179 @@
+import json
+import os
+import time
+import pandas as pd
+
+# Default output file of the explorer
+EXPLORER_FILE = "output/locality_explorer.html"
+
+# Self-contained page: the data is embedded once, and the chart of the selected
+# locality is drawn client-side as an SVG donut (no external script).
+_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>Subtype Distribution by Locality</title>
+<style>
+body { font-family: Arial, sans-serif; margin: 24px; color: #222; }
+select { font-size: 14px; margin-right: 12px; padding: 2px 4px; }
+#chart { display: flex; align-items: center; gap: 32px; margin-top: 16px; }
+#legend td { padding: 2px 8px; font-size: 13px; }
+.swatch { display: inline-block; width: 12px; height: 12px; border-radius: 2px; }
+path:hover { opacity: 0.8; }
+</style>
+</head>
+<body>
+<h2 id="title">Subtype Distribution</h2>
+<label>Region <select id="region"></select></label>
+<label>Locality <select id="locality"></select></label>
+<div id="chart"><svg id="donut" width="360" height="360" viewBox="-1 -1 2 2"></svg><table id="legend"></table></div>
+<script>
+const DATA = __DATA__;
+const COLORS = ["#636efa", "#ef553b", "#00cc96", "#ab63fa", "#ffa15a", "#19d3f3", "#ff6692",
+                "#b6e880", "#ff97ff", "#fecb52"];
+
+// Rows of every (region, locality) group, built once from the columnar data
+const groups = new Map();
+for (let i = 0; i < DATA.region.length; i++) {
+  const key = DATA.region[i] + "|" + DATA.locality[i];
+  if (!groups.has(key)) groups.set(key, []);
+  groups.get(key).push(i);
+}
+
+const regionSelect = document.getElementById("region");
+const localitySelect = document.getElementById("locality");
+const euro = new Intl.NumberFormat("fr-BE", { maximumFractionDigits: 0 });
+
+function option(select, value, label) {
+  const o = document.createElement("option");
+  o.value = value;
+  o.textContent = label;
+  select.appendChild(o);
+}
+
+function fillLocalities() {
+  const region = Number(regionSelect.value);
+  const codes = [...new Set([...groups.keys()]
+    .filter(key => Number(key.split("|")[0]) === region)
+    .map(key => Number(key.split("|")[1])))];
+  codes.sort((a, b) => DATA.localities[a].localeCompare(DATA.localities[b]));
+  localitySelect.innerHTML = "";
+  codes.forEach(code => option(localitySelect, code, DATA.localities[code]));
+  draw();
+}
+
+function draw() {
+  const region = Number(regionSelect.value);
+  const locality = Number(localitySelect.value);
+  const rows = (groups.get(region + "|" + locality) || []).slice()
+    .sort((a, b) => DATA.count[b] - DATA.count[a]);
+  const total = rows.reduce((sum, i) => sum + DATA.count[i], 0);
+
+  document.getElementById("title").textContent =
+    DATA.localities[locality] + ", " + DATA.regions[region] + " – Subtype Distribution";
+
+  const svg = document.getElementById("donut");
+  const legend = document.getElementById("legend");
+  svg.innerHTML = "";
+  legend.innerHTML = "";
+
+  let angle = -Math.PI / 2;
+  rows.forEach((i, n) => {
+    const share = DATA.count[i] / total;
+    const color = COLORS[n % COLORS.length];
+    const label = DATA.subtypes[DATA.subtype[i]];
+    const tooltip = label + "\\nCount: " + DATA.count[i] + "\\nAvg. Price: " + euro.format(DATA.avg_price[i]) + " €";
+
+    const end = angle + share * 2 * Math.PI;
+    let shape;
+    if (share >= 1) {
+      shape = document.createElementNS("http://www.w3.org/2000/svg", "circle");
+      shape.setAttribute("r", "0.7");
+      shape.setAttribute("fill", "none");
+      shape.setAttribute("stroke", color);
+      shape.setAttribute("stroke-width", "0.6");
+    } else {
+      const large = share > 0.5 ? 1 : 0;
+      const p = (r, a) => (r * Math.cos(a)).toFixed(4) + " " + (r * Math.sin(a)).toFixed(4);
+      shape = document.createElementNS("http://www.w3.org/2000/svg", "path");
+      shape.setAttribute("d", "M " + p(1, angle) + " A 1 1 0 " + large + " 1 " + p(1, end) +
+        " L " + p(0.4, end) + " A 0.4 0.4 0 " + large + " 0 " + p(0.4, angle) + " Z");
+      shape.setAttribute("fill", color);
+    }
+    const title = document.createElementNS("http://www.w3.org/2000/svg", "title");
+    title.textContent = tooltip;
+    shape.appendChild(title);
+    svg.appendChild(shape);
+    angle = end;
+
+    const row = legend.insertRow();
+    row.title = tooltip;
+    row.insertCell().innerHTML = '<span class="swatch" style="background:' + color + '"></span>';
+    row.insertCell().textContent = label;
+    row.insertCell().textContent = (share * 100).toFixed(1) + " %";
+  });
+}
+
+DATA.regions.forEach((name, code) => option(regionSelect, code, name));
+regionSelect.addEventListener("change", fillLocalities);
+localitySelect.addEventListener("change", draw);
+fillLocalities();
+</script>
+</body>
+</html>
+"""
+
+def explorer_data(subtype_dist: pd.DataFrame) -> dict:
+    """
+    Encode the subtype distribution as compact columnar data.
+
+    Region, locality and subtype names are stored once each, and the rows refer to
+    them by code. Average prices are rounded to the euro.
+
+    Args:
+        subtype_dist (pd.DataFrame): Count and average price per region, locality and subtype
+                                     (columns 'region', 'locality', 'subtype', 'count', 'avg_price').
+
+    Returns:
+        dict: Name lists ('regions', 'localities', 'subtypes') and one list per column.
+    """
+    data = {}
+    columns = {}
+    for col, names in (("region", "regions"), ("locality", "localities"), ("subtype", "subtypes")):
+        codes, uniques = pd.factorize(subtype_dist[col].astype(str), sort=True)
+        data[names] = uniques.tolist()
+        columns[col] = codes.tolist()
+
+    columns["count"] = subtype_dist["count"].astype("int64").tolist()
+    columns["avg_price"] = subtype_dist["avg_price"].round().astype("int64").tolist()
+    return {**data, **columns}
+
+def export_locality_explorer(subtype_dist: pd.DataFrame, output_file: str = EXPLORER_FILE) -> int:
+    """
+    Write a single self-contained HTML page to explore the subtype distribution of every locality.
+
+    The page embeds the aggregate once (see explorer_data()) and draws the donut chart
+    of the region/locality picked by the user in the browser.
+
+    Args:
+        subtype_dist (pd.DataFrame): Count and average price per region, locality and subtype.
+        output_file (str): Output HTML file.
+
+    Returns:
+        int: Size of the written file in bytes.
+    """
+    start = time.perf_counter()
+    subtype_dist = subtype_dist.dropna(subset=["region", "locality", "subtype", "avg_price"])
+
+    # Compact JSON; "</" is escaped so the data cannot close the script element
+    data_json = json.dumps(explorer_data(subtype_dist), separators=(",", ":"), ensure_ascii=False)
+    html = _TEMPLATE.replace("__DATA__", data_json.replace("</", "<\\/"))
+
+    os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
+    with open(output_file, "w", encoding="utf-8") as f:
+        f.write(html)
+
+    size = os.path.getsize(output_file)
+    print(f"[SUCCESS] Locality explorer ({subtype_dist.groupby(['region', 'locality'], observed=True).ngroups} "
+          f"localities, {size / 1024:.0f} KB) written in {time.perf_counter() - start:.2f}s → {output_file}")
+    return size
@@ -2,86 +2,43 @@ import pandas as pd
 import seaborn as sns
 import matplotlib.pyplot as plt
 import os
-from src.data_cleanner import DataCleanner
+from src.municipality_stats import MunicipalityStats
+
+# Chart file of every region
+REGION_FILES = {
+    "Belgium": "plots/07_top_expensive_belgium.png",
+    "Wallonia": "plots/08_top_expensive_wallonia.png",
+    "Flanders": "plots/09_top_expensive_flander.png",
+    "Brussels": "plots/10_top_expensive_bruxelles.png"
+}
 
 # -------------------- Préparation des données --------------------
 
-def get_expensive_municipality_data():
+def get_expensive_municipality_data(df: pd.DataFrame = None, median_accuracy: float = None) -> MunicipalityStats:
     """
-    Load, clean, and aggregate property price data to identify expensive municipalities in Belgium.
+    Get the price statistics of every municipality, to identify the most expensive ones.
 
-    - Loads data from a cleaned CSV file.
+    - Loads the cleaned data (from the on-disk cache when it is up to date) when no DataFrame is given.
     - Filters properties with price > 10,000€ and habitable surface > 10 m².
-    - Calculates price per square meter.
-    - Maps postal codes to regions (Brussels, Wallonia, Flanders, Unknown).
     - Aggregates data by region, province, and locality to compute average price, median price,
       average price per m², and count of properties.
-    - Adds an aggregate row for the whole country ("Belgium") by duplicating regional data.
-
-    Returns:
-        pd.DataFrame: Aggregated DataFrame with columns:
-            ['region', 'province', 'locality', 'avg_price', 'med_price', 'price_m2', 'count']
-    """
-    # Chargement et nettoyage des données
-    data = DataCleanner("data/data_cleanned.csv")
-    df = data.load_data_file()
-
-    # Filtrage des valeurs aberrantes
-    df = df[df["price"] > 10000]
-    df = df[df["habitableSurface"] > 10]
-    df["price_per_m2"] = df["price"] / df["habitableSurface"]
-
-    # Mapping des codes postaux vers les régions
-    df["region"] = df["postCode"].apply(map_postcode_to_region)
-
-    # Agrégation des statistiques
-    summary_df = df[["locality", "province", "region", "price", "price_per_m2"]].copy()
-    agg_df = summary_df.groupby(["region", "province", "locality"]).agg(
-        avg_price=("price", "mean"),
-        med_price=("price", "median"),
-        price_m2=("price_per_m2", "mean"),
-        count=("price", "count")
-    ).reset_index()
-
-    # Ajouter une ligne "Belgium"
-    agg_df_belgium = agg_df.copy()
-    agg_df_belgium["region"] = "Belgium"
-
-    full_df = pd.concat([agg_df, agg_df_belgium], ignore_index=True)
-    return full_df
-
-def map_postcode_to_region(postcode):
-    """
-    Map a Belgian postal code to its corresponding region.
 
-    Regions:
-        - Brussels: 1000–1299
-        - Wallonia: 1300–1499 and 4000–7999
-        - Flanders: 1500–3999
-        - Unknown: Any other value or invalid input
+    The aggregate is computed once and shared with the least expensive report
+    (see src/municipality_stats.py).
 
     Args:
-        postcode (str or int): Postal code to map.
+        df (pd.DataFrame, optional): Cleaned listings. Loaded from the cache when not given.
+        median_accuracy (float, optional): Maximal relative error of approximate medians.
+                                           None (default) for exact medians.
 
     Returns:
-        str: Region name ("Brussels", "Wallonia", "Flanders", or "Unknown").
+        MunicipalityStats: Statistics per locality, queried by region with nlargest().
     """
-    try:
-        pc = int(postcode)
-        if 1000 <= pc <= 1299:
-            return "Brussels"
-        elif (1300 <= pc <= 1499) or (4000 <= pc <= 7999):
-            return "Wallonia"
-        elif 1500 <= pc <= 3999:
-            return "Flanders"
-        else:
-            return "Unknown"
-    except:
-        return "Unknown"
+    return MunicipalityStats.shared(df, median_accuracy)
 
 # -------------------- Plotting --------------------
 
-def plot_top_expensive(df_region, title_prefix, save_path=None):
+def plot_top_expensive(stats, region, save_path=None, show_plot=True):
     """
     Plot bar charts for the top 10 most expensive municipalities in a given region.
 
@@ -93,33 +50,33 @@ def plot_top_expensive(df_region, title_prefix, save_path=None):
     Each bar is annotated with its respective value.
 
     Args:
-        df_region (pd.DataFrame): DataFrame filtered by a specific region with columns
-                                  ['locality', 'avg_price', 'med_price', 'price_m2'].
-        title_prefix (str): Title prefix to display on the plot.
+        stats (MunicipalityStats): Statistics per locality.
+        region (str): Region to plot ("Belgium" for the whole country), also shown in the title.
         save_path (str, optional): File path to save the plot image. If None, the plot is not saved.
+        show_plot (bool): Whether to display the plot interactively.
 
     Returns:
         None
     """
     fig, axes = plt.subplots(1, 3, figsize=(18, 6))
-    fig.suptitle(f"{title_prefix} - Top 10 Most Expensive Municipalities", fontsize=16)
+    fig.suptitle(f"{region} - Top 10 Most Expensive Municipalities", fontsize=16)
 
     # Moyenne
-    top_avg = df_region.nlargest(10, "avg_price")
+    top_avg = stats.nlargest(10, "avg_price", region)
     sns.barplot(data=top_avg, x="avg_price", y="locality", palette="Blues", ax=axes[0])
     axes[0].set_title("Average Price (€)")
     for i, row in top_avg.iterrows():
         axes[0].text(row["avg_price"], i, f"{int(row['avg_price']):,}€", va='center', ha='left', fontsize=9)
 
     # Médiane
-    top_med = df_region.nlargest(10, "med_price")
+    top_med = stats.nlargest(10, "med_price", region)
     sns.barplot(data=top_med, x="med_price", y="locality", palette="Greens", ax=axes[1])
     axes[1].set_title("Median Price (€)")
     for i, row in top_med.iterrows():
         axes[1].text(row["med_price"], i, f"{int(row['med_price']):,}€", va='center', ha='left', fontsize=9)
 
     # Prix/m²
-    top_m2 = df_region.nlargest(10, "price_m2")
+    top_m2 = stats.nlargest(10, "price_m2", region)
     sns.barplot(data=top_m2, x="price_m2", y="locality", palette="Oranges", ax=axes[2])
     axes[2].set_title("Price per m² (€)")
     for i, row in top_m2.iterrows():
@@ -127,40 +84,63 @@ def plot_top_expensive(df_region, title_prefix, save_path=None):
 
     plt.tight_layout(rect=[0, 0, 1, 0.95])
 
-    plt.savefig(save_path)
-    print(f"✅ Saved: {save_path}")
-    plt.show()
+    if save_path:
+        plt.savefig(save_path)
+        print(f"✅ Saved: {save_path}")
+
+    if show_plot:
+        plt.show()
+
+    plt.close(fig)
+
+def generate_expensive_municipality_chart(df: pd.DataFrame, region: str, save_path: str, show_plot: bool = True,
+                                          median_accuracy: float = None) -> None:
+    """
+    Generate and save the top expensive municipality chart of a single region.
 
-    plt.close()
+    Used to render each region as its own job (see src/chart_scheduler.py).
+
+    Args:
+        df (pd.DataFrame): Cleaned listings.
+        region (str): Region to plot ("Belgium", "Wallonia", "Flanders" or "Brussels").
+        save_path (str): File path to save the plot image.
+        show_plot (bool): Whether to display the plot interactively.
+        median_accuracy (float, optional): Maximal relative error of approximate medians.
+
+    Returns:
+        None
+    """
+    stats = get_expensive_municipality_data(df, median_accuracy)
+    if not stats.region(region).empty:
+        plot_top_expensive(stats, region, save_path=save_path, show_plot=show_plot)
+    else:
+        print(f"⚠️ Aucune donnée pour la région : {region}")
 
 # -------------------- Entrée principale --------------------
 
-def generate_all_expensive_municipality_charts():
+def generate_all_expensive_municipality_charts(show_plot: bool = True, df: pd.DataFrame = None, median_accuracy: float = None):
     """
     Generate and save top expensive municipality charts for Belgium and its regions.
 
     - Ensures the "plots" directory exists.
-    - Loads and processes property data to get aggregated expensive municipality info.
+    - Gets the shared statistics per municipality (computed once for both reports).
     - Generates and saves bar charts for Belgium, Wallonia, Flanders, and Brussels.
     - Prints a warning if no data is available for a region.
 
+    Args:
+        show_plot (bool): Whether to display the plots interactively.
+        df (pd.DataFrame, optional): Cleaned listings. Loaded from the cache when not given.
+        median_accuracy (float, optional): Maximal relative error of approximate medians.
+
     Returns:
         None
     """
     os.makedirs("plots", exist_ok=True)
 
-    df = get_expensive_municipality_data()
-
-    region_files = {
-        "Belgium": "plots/07_top_expensive_belgium.png",
-        "Wallonia": "plots/08_top_expensive_wallonia.png",
-        "Flanders": "plots/09_top_expensive_flander.png",
-        "Brussels": "plots/10_top_expensive_bruxelles.png"
-    }
+    stats = get_expensive_municipality_data(df, median_accuracy)
 
-    for region, path in region_files.items():
-        region_df = df[df["region"] == region]
-        if not region_df.empty:
-            plot_top_expensive(region_df, region, save_path=path)
+    for region, path in REGION_FILES.items():
+        if not stats.region(region).empty:
+            plot_top_expensive(stats, region, save_path=path, show_plot=show_plot)
         else:
             print(f"⚠️ Aucune donnée pour la région : {region}")
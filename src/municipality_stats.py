@@ -0,0 +1,317 @@
+import numpy as np
+import pandas as pd
+from src.data_cleanner import DataCleanner
+from src.dataset_cache import DatasetCache, RAW_DATA_FILE
+from src.regions import map_postcodes_to_region
+from src.quantile_sketch import grouped_median
+
+# Pseudo-region covering every locality of the country
+NATIONAL_REGION = "Belgium"
+
+# Locality statistics that can be ranked
+METRICS = ("avg_price", "med_price", "price_m2")
+
+class RankingIndex:
+    """
+    Localities sorted by each metric within each region, to answer ranking queries fast.
+
+    For every (region, metric) pair, the positions of the region's localities in the
+    aggregate are sorted once, in both directions. A "top/bottom k localities by metric
+    in region R" query is then a slice of k positions, whatever the number of localities.
+    Ties are ranked in aggregate order, and localities whose metric is NaN are not ranked.
+    """
+
+    def __init__(self, aggregate: pd.DataFrame, metrics: tuple = METRICS) -> None:
+        """
+        Build the index.
+
+        Args:
+            aggregate (pd.DataFrame): Statistics per locality, with a 'region' column and
+                                      one column per metric (see MunicipalityStats.aggregate).
+            metrics (tuple[str]): Metrics to index.
+        """
+        self.aggregate = aggregate
+        self.metrics = tuple(metrics)
+
+        positions_by_region = {
+            NATIONAL_REGION: np.arange(len(aggregate)),
+            **aggregate.groupby("region", observed=True).indices
+        }
+
+        # (region, metric) -> (positions by decreasing value, positions by increasing value)
+        self._orders = {}
+        for metric in self.metrics:
+            values = aggregate[metric].to_numpy(dtype="float64", na_value=np.nan)
+            for region, positions in positions_by_region.items():
+                positions = positions[~np.isnan(values[positions])]
+                region_values = values[positions]
+                self._orders[(region, metric)] = (
+                    positions[np.lexsort((positions, -region_values))],
+                    positions[np.lexsort((positions, region_values))]
+                )
+
+    def regions(self) -> list:
+        """
+        Indexed regions, national rollup first.
+
+        Returns:
+            list[str]: Region names.
+        """
+        return list(dict.fromkeys(region for region, _ in self._orders))
+
+    def positions(self, region: str, metric: str, k: int, largest: bool = True) -> np.ndarray:
+        """
+        Positions (in the aggregate) of the k highest or lowest ranked localities.
+
+        Args:
+            region (str): Region name, or "Belgium" for the whole country.
+            metric (str): Ranking metric.
+            k (int): Number of localities.
+            largest (bool): True for the highest values first, False for the lowest first.
+
+        Returns:
+            np.ndarray: Up to k positions (none for an unknown region).
+
+        Raises:
+            ValueError: If the metric is not indexed.
+        """
+        if metric not in self.metrics:
+            raise ValueError(f"Unknown metric '{metric}', expected one of {self.metrics}")
+
+        orders = self._orders.get((region, metric))
+        if orders is None:
+            return np.empty(0, dtype=np.intp)
+        return orders[0 if largest else 1][:max(k, 0)]
+
+    def top(self, region: str, metric: str, k: int) -> pd.DataFrame:
+        """
+        The k localities of a region with the highest value of a metric.
+
+        Args:
+            region (str): Region name, or "Belgium" for the whole country.
+            metric (str): Ranking metric.
+            k (int): Number of localities.
+
+        Returns:
+            pd.DataFrame: Up to k rows of the aggregate, highest first, indexed from 0.
+        """
+        return self.aggregate.iloc[self.positions(region, metric, k, largest=True)].reset_index(drop=True)
+
+    def bottom(self, region: str, metric: str, k: int) -> pd.DataFrame:
+        """
+        The k localities of a region with the lowest value of a metric.
+
+        Args:
+            region (str): Region name, or "Belgium" for the whole country.
+            metric (str): Ranking metric.
+            k (int): Number of localities.
+
+        Returns:
+            pd.DataFrame: Up to k rows of the aggregate, lowest first, indexed from 0.
+        """
+        return self.aggregate.iloc[self.positions(region, metric, k, largest=False)].reset_index(drop=True)
+
+    def query(self, region: str, metric: str, k: int = 10, order: str = "top") -> list:
+        """
+        Answer a ranking query with plain Python records (e.g. to serve it as JSON).
+
+        Args:
+            region (str): Region name, or "Belgium" for the whole country.
+            metric (str): Ranking metric.
+            k (int): Number of localities.
+            order (str): "top" for the highest values first, "bottom" for the lowest first.
+
+        Returns:
+            list[dict]: One record per locality, with its rank (from 1) and statistics.
+
+        Raises:
+            ValueError: If the metric or the order is unknown.
+        """
+        if order not in ("top", "bottom"):
+            raise ValueError(f"Unknown order '{order}', expected 'top' or 'bottom'")
+
+        ranked = self.aggregate.iloc[self.positions(region, metric, k, largest=(order == "top"))]
+        records = []
+        for rank, record in enumerate(ranked.to_dict("records"), start=1):
+            records.append({"rank": rank, **{key: _to_python(value) for key, value in record.items()}})
+        return records
+
+def _to_python(value):
+    # numpy scalars (and NaN) to JSON-friendly Python values
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and np.isnan(value):
+        return None
+    return value
+
+class MunicipalityStats:
+    """
+    Price statistics of every locality, shared by the most and least expensive reports.
+
+    The listings are aggregated by (region, province, locality) once, on first use, and
+    the aggregate is cached. The national rollup ("Belgium") is the aggregate itself
+    rather than a relabeled copy of it, and the top/bottom localities of a region are
+    served by nlargest()/nsmallest() from a RankingIndex built with the aggregate.
+    """
+
+    # Instance shared by the callers working on the same DataFrame (see shared())
+    _shared = None
+
+    def __init__(self, df: pd.DataFrame, min_price: float = 10000, min_surface: float = 10,
+                 median_accuracy: float = None) -> None:
+        """
+        Initialize the statistics (the aggregate itself is computed on first use).
+
+        Args:
+            df (pd.DataFrame): Cleaned listings with 'price', 'habitableSurface', 'postCode',
+                               'province' and 'locality' columns.
+            min_price (float): Listings priced at or below this are ignored (outliers).
+            min_surface (float): Listings with a habitable surface at or below this are ignored.
+            median_accuracy (float, optional): Maximal relative error of approximate medians
+                                               (see quantile_sketch.grouped_median()).
+                                               None (default) for exact medians.
+        """
+        self.df = df
+        self.min_price = min_price
+        self.min_surface = min_surface
+        self.median_accuracy = median_accuracy
+        self._aggregate = None
+        self._ranking = None
+
+    @classmethod
+    def load(cls, cache: DatasetCache = None, median_accuracy: float = None) -> "MunicipalityStats":
+        """
+        Build the statistics of the cleaned dataset (loaded from the on-disk cache when it is up to date).
+
+        Args:
+            cache (DatasetCache, optional): Cache of cleaned datasets. Defaults to the default cache.
+            median_accuracy (float, optional): Maximal relative error of approximate medians.
+
+        Returns:
+            MunicipalityStats: The statistics.
+        """
+        data = DataCleanner(RAW_DATA_FILE, cache=cache or DatasetCache())
+        return cls(data.normalization(), median_accuracy=median_accuracy)
+
+    @classmethod
+    def shared(cls, df: pd.DataFrame = None, median_accuracy: float = None) -> "MunicipalityStats":
+        """
+        Get the statistics of a DataFrame, reusing the last ones built for the same object.
+
+        Lets every report (and every chart job of a worker process) share a single aggregate.
+
+        Args:
+            df (pd.DataFrame, optional): Cleaned listings. Loaded from the cache when not given
+                                         (and no statistics were built yet).
+            median_accuracy (float, optional): Maximal relative error of approximate medians.
+
+        Returns:
+            MunicipalityStats: The statistics.
+        """
+        if (cls._shared is None or (df is not None and cls._shared.df is not df)
+                or cls._shared.median_accuracy != median_accuracy):
+            if df is None and cls._shared is not None:
+                df = cls._shared.df
+            cls._shared = (cls(df, median_accuracy=median_accuracy) if df is not None
+                           else cls.load(median_accuracy=median_accuracy))
+        return cls._shared
+
+    @property
+    def aggregate(self) -> pd.DataFrame:
+        """
+        Statistics of every locality (computed on first access).
+
+        Returns:
+            pd.DataFrame: One row per (region, province, locality), with columns
+                ['region', 'province', 'locality', 'avg_price', 'med_price', 'price_m2', 'count']
+        """
+        if self._aggregate is None:
+            df = self.df
+            df = df[(df["price"] > self.min_price) & (df["habitableSurface"] > self.min_surface)]
+
+            listings = pd.DataFrame({
+                "region": map_postcodes_to_region(df["postCode"]),
+                "province": df["province"],
+                "locality": df["locality"],
+                "price": df["price"],
+                "price_per_m2": df["price"] / df["habitableSurface"]
+            })
+
+            keys = ["region", "province", "locality"]
+            aggregate = listings.groupby(keys, observed=True).agg(
+                avg_price=("price", "mean"),
+                price_m2=("price_per_m2", "mean"),
+                count=("price", "count")
+            )
+            aggregate.insert(1, "med_price", grouped_median(listings, keys, "price", self.median_accuracy))
+            self._aggregate = aggregate.reset_index()
+        return self._aggregate
+
+    @property
+    def ranking(self) -> RankingIndex:
+        """
+        Ranking index of the aggregate (built on first access).
+
+        Returns:
+            RankingIndex: The index.
+        """
+        if self._ranking is None:
+            self._ranking = RankingIndex(self.aggregate)
+        return self._ranking
+
+    def regions(self) -> list:
+        """
+        Regions with at least one locality, national rollup first.
+
+        Returns:
+            list[str]: Region names.
+        """
+        return [NATIONAL_REGION] + sorted(self.aggregate["region"].unique())
+
+    def region(self, region: str = NATIONAL_REGION) -> pd.DataFrame:
+        """
+        Statistics of the localities of a region.
+
+        Args:
+            region (str): Region name, or "Belgium" for every locality.
+
+        Returns:
+            pd.DataFrame: Rows of the aggregate (the aggregate itself for "Belgium";
+                          do not modify it).
+        """
+        if region == NATIONAL_REGION:
+            return self.aggregate
+        return self.aggregate[self.aggregate["region"] == region]
+
+    def nlargest(self, n: int, metric: str, region: str = NATIONAL_REGION) -> pd.DataFrame:
+        """
+        The n most expensive localities of a region.
+
+        Args:
+            n (int): Number of localities.
+            metric (str): Ranking metric ('avg_price', 'med_price' or 'price_m2').
+            region (str): Region name, or "Belgium" for the whole country.
+
+        Returns:
+            pd.DataFrame: Up to n localities, most expensive first, indexed from 0.
+        """
+        return self._rank(n, metric, region, largest=True)
+
+    def nsmallest(self, n: int, metric: str, region: str = NATIONAL_REGION) -> pd.DataFrame:
+        """
+        The n least expensive localities of a region.
+
+        Args:
+            n (int): Number of localities.
+            metric (str): Ranking metric ('avg_price', 'med_price' or 'price_m2').
+            region (str): Region name, or "Belgium" for the whole country.
+
+        Returns:
+            pd.DataFrame: Up to n localities, least expensive first, indexed from 0.
+        """
+        return self._rank(n, metric, region, largest=False)
+
+    def _rank(self, n: int, metric: str, region: str, largest: bool) -> pd.DataFrame:
+        if largest:
+            return self.ranking.top(region, metric, n)
+        return self.ranking.bottom(region, metric, n)
@@ -0,0 +1,201 @@
+import argparse
+import time
+import numpy as np
+import pandas as pd
+from src.quantile_sketch import GroupedQuantileSketch, DEFAULT_RELATIVE_ACCURACY
+
+# Whiskers reach at most IQR_FACTOR × IQR beyond the quartiles (Tukey's fences)
+IQR_FACTOR = 1.5
+
+# Quantiles computed for every column: quartiles, median and the 97th percentile (label position)
+QUANTILES = {"q1": 0.25, "median": 0.5, "q3": 0.75, "p97": 0.97}
+
+def numeric_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Numeric columns of a DataFrame, as float64 whatever their compact or nullable dtype.
+
+    Args:
+        df (pd.DataFrame): Any DataFrame.
+
+    Returns:
+        pd.DataFrame: Its numeric columns (missing values as NaN).
+    """
+    return df.select_dtypes(include="number").astype("float64")
+
+def _with_fences(quantiles: pd.DataFrame, factor: float) -> pd.DataFrame:
+    iqr = quantiles["q3"] - quantiles["q1"]
+    return quantiles.assign(lower=quantiles["q1"] - factor * iqr, upper=quantiles["q3"] + factor * iqr)
+
+def outlier_bounds(df: pd.DataFrame, factor: float = IQR_FACTOR) -> pd.DataFrame:
+    """
+    Quartiles and IQR outlier bounds of every numeric column.
+
+    All the quantiles of all the columns come from a single DataFrame.quantile() call.
+
+    Args:
+        df (pd.DataFrame): Dataset (only its numeric columns are used).
+        factor (float): Values farther than factor × IQR from the quartiles are outliers.
+
+    Returns:
+        pd.DataFrame: One row per numeric column, with the QUANTILES columns
+                      ('q1', 'median', 'q3', 'p97') and the 'lower'/'upper' bounds.
+    """
+    quantiles = numeric_columns(df).quantile(list(QUANTILES.values())).T
+    quantiles.columns = list(QUANTILES)
+    return _with_fences(quantiles, factor)
+
+def outlier_mask(df: pd.DataFrame, bounds: pd.DataFrame) -> pd.DataFrame:
+    """
+    Flag the outliers of every column of the bounds.
+
+    The mask is a single boolean block (one byte per value), aligned with df.
+    Missing values are never outliers.
+
+    Args:
+        df (pd.DataFrame): Dataset with (at least) the columns of the bounds.
+        bounds (pd.DataFrame): Bounds per column (see outlier_bounds()).
+
+    Returns:
+        pd.DataFrame: Boolean matrix, True where a value is below 'lower' or above 'upper'.
+    """
+    values = df[bounds.index].to_numpy(dtype="float64", na_value=np.nan)
+    with np.errstate(invalid="ignore"):
+        mask = (values < bounds["lower"].to_numpy()) | (values > bounds["upper"].to_numpy())
+    return pd.DataFrame(mask, index=df.index, columns=bounds.index)
+
+def outlier_summary(chunks, bounds: pd.DataFrame) -> pd.DataFrame:
+    """
+    Count the outliers of every column and find its whiskers, chunk by chunk.
+
+    Args:
+        chunks (Iterable[pd.DataFrame]): Dataset, in one or more chunks.
+        bounds (pd.DataFrame): Bounds per column (see outlier_bounds()).
+
+    Returns:
+        pd.DataFrame: One row per column of the bounds, with the number of 'outliers' and
+                      the lowest/highest non-outlier values ('whislo'/'whishi').
+    """
+    outliers = np.zeros(len(bounds), dtype="int64")
+    whislo = np.full(len(bounds), np.inf)
+    whishi = np.full(len(bounds), -np.inf)
+
+    for chunk in chunks:
+        values = chunk[bounds.index].to_numpy(dtype="float64", na_value=np.nan)
+        mask = outlier_mask(chunk, bounds).to_numpy()
+        inliers = ~mask & ~np.isnan(values)
+        outliers += mask.sum(axis=0)
+        whislo = np.minimum(whislo, np.where(inliers, values, np.inf).min(axis=0, initial=np.inf))
+        whishi = np.maximum(whishi, np.where(inliers, values, -np.inf).max(axis=0, initial=-np.inf))
+
+    return pd.DataFrame({
+        "outliers": outliers,
+        "whislo": np.where(np.isinf(whislo), np.nan, whislo),
+        "whishi": np.where(np.isinf(whishi), np.nan, whishi)
+    }, index=bounds.index)
+
+def box_statistics(df: pd.DataFrame, factor: float = IQR_FACTOR) -> pd.DataFrame:
+    """
+    Box statistics of every numeric column: quantiles, bounds, whiskers and outlier count.
+
+    Args:
+        df (pd.DataFrame): Dataset (only its numeric columns are used).
+        factor (float): Values farther than factor × IQR from the quartiles are outliers.
+
+    Returns:
+        pd.DataFrame: outlier_bounds() joined with outlier_summary(), one row per column.
+    """
+    bounds = outlier_bounds(df, factor)
+    return bounds.join(outlier_summary([df], bounds))
+
+class StreamingOutlierDetector:
+    """
+    Outlier bounds of a dataset read in chunks, from quantile sketches.
+
+    Every chunk is added to a quantile sketch per column (constant memory per column,
+    mergeable across chunks or workers), so the bounds of a dataset that does not fit
+    in memory can be computed in one pass. The quantiles, hence the bounds, are within
+    the sketch's relative accuracy. Outliers are then counted in a second pass, with
+    outlier_summary().
+    """
+
+    def __init__(self, factor: float = IQR_FACTOR, relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY) -> None:
+        """
+        Initialize the detector.
+
+        Args:
+            factor (float): Values farther than factor × IQR from the quartiles are outliers.
+            relative_accuracy (float): Maximal relative error of the quantiles.
+        """
+        self.factor = factor
+        self.sketch = GroupedQuantileSketch(["column"], relative_accuracy)
+        self.columns = []
+
+    def add(self, chunk: pd.DataFrame) -> None:
+        """
+        Add a chunk of the dataset.
+
+        Args:
+            chunk (pd.DataFrame): Rows of the dataset (only the numeric columns are used).
+
+        Returns:
+            None
+        """
+        for col, values in numeric_columns(chunk).items():
+            if col not in self.columns:
+                self.columns.append(col)
+            # One column at a time: no rows × columns long-format copy
+            self.sketch.add(pd.DataFrame({"column": col, "value": values.to_numpy()}), "value")
+
+    def merge(self, other: "StreamingOutlierDetector") -> None:
+        """
+        Add the chunks seen by another detector (with the same accuracy) to this one.
+
+        Args:
+            other (StreamingOutlierDetector): Detector to merge.
+
+        Returns:
+            None
+        """
+        self.sketch.merge(other.sketch)
+        self.columns += [col for col in other.columns if col not in self.columns]
+
+    def bounds(self) -> pd.DataFrame:
+        """
+        Approximate quantiles and outlier bounds of every numeric column seen so far.
+
+        The bounds are widened by the sketch's relative accuracy, so that no value is
+        flagged only because of the approximation (e.g. in a constant column).
+
+        Returns:
+            pd.DataFrame: Same layout as outlier_bounds() (columns without any value are left out).
+        """
+        quantiles = pd.DataFrame({name: self.sketch.quantile(q) for name, q in QUANTILES.items()})
+        quantiles = quantiles.reindex([col for col in self.columns if col in quantiles.index])
+        quantiles.index.name = None
+
+        bounds = _with_fences(quantiles, self.factor)
+        # Widened by one bucket width, which covers the error of the bucket values both ways
+        margin = self.sketch.gamma - 1
+        bounds["lower"] -= margin * bounds["lower"].abs()
+        bounds["upper"] += margin * bounds["upper"].abs()
+        return bounds
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Outlier bounds and counts of the numeric columns of a cleaned dataset.")
+    parser.add_argument("data_file", nargs="?", default="data/data_cleanned.csv", help="cleaned dataset (CSV)")
+    parser.add_argument("--chunksize", type=int,
+                        help="read the file in chunks of this many rows, with sketch-based quantiles")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.chunksize:
+        detector = StreamingOutlierDetector()
+        for chunk in pd.read_csv(args.data_file, chunksize=args.chunksize):
+            detector.add(chunk)
+        bounds = detector.bounds()
+        stats = bounds.join(outlier_summary(pd.read_csv(args.data_file, chunksize=args.chunksize), bounds))
+    else:
+        stats = box_statistics(pd.read_csv(args.data_file))
+
+    print(stats.sort_values("outliers", ascending=False).to_string(float_format=lambda x: f"{x:,.2f}"))
+    print(f"[INFO] Box statistics of {len(stats)} columns computed in {time.perf_counter() - start:.2f}s")
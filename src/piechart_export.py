@@ -0,0 +1,138 @@
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import pandas as pd
+import plotly.express as px
+from plotly.offline import get_plotlyjs
+
+# Default output directory of the pie charts
+PIECHART_DIR = "output/piecharts"
+
+# plotly.js bundle shared by every chart of the directory
+PLOTLYJS_FILE = "plotly.min.js"
+
+# Fingerprints of the exported groups, to skip unchanged ones on the next export
+MANIFEST_FILE = "manifest.json"
+
+def piechart_file_name(region: str, locality: str) -> str:
+    """
+    File name of the pie chart of a (region, locality) group.
+
+    Args:
+        region (str): Region name.
+        locality (str): Locality name.
+
+    Returns:
+        str: HTML file name (spaces replaced by underscores).
+    """
+    return f"{region}_{locality}.html".replace(" ", "_")
+
+def _group_fingerprint(group: pd.DataFrame) -> str:
+    # Hash of the group's data: its chart only changes when this does
+    values = group[["subtype", "count", "avg_price"]].astype({"subtype": str}).reset_index(drop=True)
+    return format(int(pd.util.hash_pandas_object(values, index=False).sum()) & (2**64 - 1), "016x")
+
+def _write_piechart(job: tuple) -> str:
+    """
+    Render the pie chart of one group to an HTML file referencing the shared plotly.js.
+
+    Args:
+        job (tuple): (region, locality, group DataFrame, file path).
+
+    Returns:
+        str: The file path.
+    """
+    region, locality, group, file_path = job
+
+    # Create pie chart using Plotly
+    fig = px.pie(
+        group,
+        values="count",              # Pie slice size = number of properties
+        names="subtype",             # Label each slice by property subtype
+        title=f"{locality}, {region} – Subtype Distribution",
+        hole=0.4,                    # Donut style
+        custom_data=["avg_price"]    # Attach avg_price for hover display
+    )
+
+    # Customize hover tooltip to show average price
+    fig.update_traces(
+        hovertemplate="<b>%{label}</b><br>Count: %{value}<br>Avg. Price: %{customdata[0]:,.0f} €<extra></extra>"
+    )
+
+    # Export as HTML file (interactive), loading plotly.js from the shared file next to it
+    fig.write_html(file_path, include_plotlyjs="directory")
+    return file_path
+
+def export_piecharts(subtype_dist: pd.DataFrame, output_dir: str = PIECHART_DIR,
+                     workers: int = None, min_subtypes: int = 2) -> dict:
+    """
+    Export one interactive pie chart of the subtype distribution per (region, locality).
+
+    plotly.js is written once to the output directory and referenced by every chart,
+    instead of being embedded in each file. Charts are rendered in parallel worker
+    processes, and a group whose data has not changed since the last export (according
+    to the fingerprints saved in the directory's manifest) is not rendered again.
+    Charts of groups that no longer exist are removed.
+
+    Args:
+        subtype_dist (pd.DataFrame): Count and average price per region, locality and subtype
+                                     (columns 'region', 'locality', 'subtype', 'count', 'avg_price').
+        output_dir (str): Output directory.
+        workers (int, optional): Number of worker processes. Defaults to the CPU count.
+        min_subtypes (int): Groups with fewer subtypes are skipped (nothing to compare).
+
+    Returns:
+        dict: Number of charts 'written', 'unchanged' and 'removed', and the 'seconds' taken.
+    """
+    start = time.perf_counter()
+    os.makedirs(output_dir, exist_ok=True)
+
+    # Shared plotly.js bundle (written before the workers start, so they never race on it)
+    plotlyjs_path = Path(output_dir) / PLOTLYJS_FILE
+    if not plotlyjs_path.exists():
+        plotlyjs_path.write_text(get_plotlyjs(), encoding="utf-8")
+
+    manifest_path = Path(output_dir) / MANIFEST_FILE
+    previous = json.loads(manifest_path.read_text(encoding="utf-8")) if manifest_path.exists() else {}
+
+    fingerprints = {}
+    jobs = []
+    for (region, locality), group in subtype_dist.groupby(["region", "locality"], observed=True):
+        if len(group) < min_subtypes:
+            continue  # Skip small or non-diverse groups
+
+        file_name = piechart_file_name(region, locality)
+        fingerprints[file_name] = _group_fingerprint(group)
+        file_path = Path(output_dir) / file_name
+        if previous.get(file_name) != fingerprints[file_name] or not file_path.exists():
+            jobs.append((region, locality, group, str(file_path)))
+
+    # Processes are forked, so the workers do not re-run the calling script
+    if jobs and (workers or os.cpu_count() or 1) > 1 and "fork" in multiprocessing.get_all_start_methods():
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("fork")) as executor:
+            list(executor.map(_write_piechart, jobs, chunksize=16))
+    else:
+        for job in jobs:
+            _write_piechart(job)
+
+    removed = 0
+    for file_name in set(previous) - set(fingerprints):
+        stale_path = Path(output_dir) / file_name
+        if stale_path.exists():
+            stale_path.unlink()
+            removed += 1
+
+    manifest_path.write_text(json.dumps(fingerprints, indent=0, sort_keys=True), encoding="utf-8")
+
+    stats = {
+        "written": len(jobs),
+        "unchanged": len(fingerprints) - len(jobs),
+        "removed": removed,
+        "seconds": round(time.perf_counter() - start, 3)
+    }
+    print(f"[INFO] Pie charts: {stats['written']} written, {stats['unchanged']} unchanged, "
+          f"{stats['removed']} removed in {stats['seconds']:.2f}s → {output_dir}")
+    return stats
@@ -0,0 +1,229 @@
+import numpy as np
+import pandas as pd
+
+# Default relative accuracy of the quantiles (0.1%)
+DEFAULT_RELATIVE_ACCURACY = 0.001
+
+# Offset separating the bucket keys of positive, zero and negative values (see _bucket_keys())
+_KEY_OFFSET = 1 << 40
+
+class GroupedQuantileSketch:
+    """
+    Mergeable quantile sketch of a value, for every group of a grouping.
+
+    Values are counted in logarithmic buckets (as in DDSketch): every value in a bucket
+    is within the relative accuracy of the bucket's representative value, so any
+    quantile is returned with a relative error of at most relative_accuracy, whatever
+    the number of values. Bucket counts can be added and subtracted, so sketches
+    support inserts, deletes and merges (e.g. of chunks or daily batches).
+
+    The counts are kept in a Series indexed by the group keys plus a "bucket" level.
+    """
+
+    def __init__(self, group_cols: list, relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY,
+                 counts: pd.Series = None) -> None:
+        """
+        Initialize the sketch.
+
+        Args:
+            group_cols (list[str]): Names of the grouping columns.
+            relative_accuracy (float): Maximal relative error of the quantiles, in (0, 1).
+            counts (pd.Series, optional): Bucket counts (see counts), empty by default.
+
+        Raises:
+            ValueError: If relative_accuracy is not in (0, 1).
+        """
+        if not 0 < relative_accuracy < 1:
+            raise ValueError(f"relative_accuracy must be in (0, 1), got {relative_accuracy}")
+
+        self.group_cols = list(group_cols)
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = np.log(self.gamma)
+
+        if counts is None:
+            names = self.group_cols + ["bucket"]
+            counts = pd.Series([], dtype="int64",
+                               index=pd.MultiIndex.from_arrays([[]] * len(names), names=names))
+        self.counts = counts
+
+    def _bucket_keys(self, values: np.ndarray) -> np.ndarray:
+        # Ordered bucket keys: negative values < 0 < positive values, each side in value order
+        keys = np.zeros(len(values), dtype=np.int64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            positive = values > 0
+            negative = values < 0
+            keys[positive] = _KEY_OFFSET + np.ceil(np.log(values[positive]) / self._log_gamma).astype(np.int64)
+            keys[negative] = -(_KEY_OFFSET + np.ceil(np.log(-values[negative]) / self._log_gamma).astype(np.int64))
+        return keys
+
+    def _bucket_values(self, keys: np.ndarray) -> np.ndarray:
+        # Representative value of each bucket (within relative_accuracy of all its values)
+        values = np.zeros(len(keys), dtype="float64")
+        positive = keys > 0
+        negative = keys < 0
+        values[positive] = 2 * self.gamma ** (keys[positive] - _KEY_OFFSET) / (self.gamma + 1)
+        values[negative] = -2 * self.gamma ** (-keys[negative] - _KEY_OFFSET) / (self.gamma + 1)
+        return values
+
+    def _count_buckets(self, df: pd.DataFrame, value_col: str) -> pd.Series:
+        values = pd.to_numeric(df[value_col], errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+        valid = np.isfinite(values)
+        buckets = df.loc[valid, self.group_cols].copy()
+        buckets["bucket"] = self._bucket_keys(values[valid])
+        return buckets.groupby(self.group_cols + ["bucket"], observed=True).size()
+
+    def add(self, df: pd.DataFrame, value_col: str) -> None:
+        """
+        Add values to the sketch.
+
+        Args:
+            df (pd.DataFrame): Rows with the grouping columns and the value column.
+                               Rows with a missing group key or value are ignored.
+            value_col (str): Column holding the values.
+
+        Returns:
+            None
+        """
+        self.counts = self.counts.add(self._count_buckets(df, value_col), fill_value=0).astype("int64")
+
+    def remove(self, df: pd.DataFrame, value_col: str) -> None:
+        """
+        Remove values previously added to the sketch.
+
+        Args:
+            df (pd.DataFrame): Rows with the grouping columns and the value column.
+            value_col (str): Column holding the values.
+
+        Returns:
+            None
+        """
+        counts = self.counts.sub(self._count_buckets(df, value_col), fill_value=0)
+        self.counts = counts[counts > 0].astype("int64")
+
+    def merge(self, other: "GroupedQuantileSketch") -> None:
+        """
+        Add the counts of another sketch (with the same grouping and accuracy) to this one.
+
+        Args:
+            other (GroupedQuantileSketch): Sketch to merge.
+
+        Returns:
+            None
+
+        Raises:
+            ValueError: If the sketches are not compatible.
+        """
+        if other.group_cols != self.group_cols or other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with a different grouping or relative accuracy.")
+        self.counts = self.counts.add(other.counts, fill_value=0).astype("int64")
+
+    def _values_at_rank(self, ranks: pd.Series) -> pd.Series:
+        # Representative value of the bucket holding the value of 0-based rank `ranks[group]`
+        counts = self.counts.sort_index()
+        cumulative = counts.groupby(level=self.group_cols, observed=True).cumsum()
+        group_ranks = ranks.reindex(cumulative.index.droplevel("bucket")).to_numpy()
+
+        holding = cumulative[cumulative.to_numpy() > group_ranks]
+        first = holding.groupby(level=self.group_cols, observed=True).head(1)
+        buckets = first.index.get_level_values("bucket").to_numpy()
+        return pd.Series(self._bucket_values(buckets), index=first.index.droplevel("bucket"))
+
+    def quantile(self, q: float = 0.5) -> pd.Series:
+        """
+        Approximate q-quantile of every group.
+
+        Like Series.quantile(), the quantile is interpolated linearly between the two
+        values surrounding rank q * (n - 1), so the median of an even number of values
+        is the mean of the two middle ones.
+
+        Args:
+            q (float): Quantile, in [0, 1].
+
+        Returns:
+            pd.Series: Quantile of every non-empty group, indexed by the group keys.
+        """
+        if self.counts.empty:
+            return pd.Series([], dtype="float64", index=self.counts.index.droplevel("bucket"))
+
+        totals = self.counts.groupby(level=self.group_cols, observed=True).sum()
+        ranks = q * (totals - 1)
+        lower_ranks = np.floor(ranks)
+
+        lower = self._values_at_rank(lower_ranks)
+        upper = self._values_at_rank(np.ceil(ranks))
+        return lower + (ranks - lower_ranks) * (upper - lower)
+
+    def save(self, file_path: str) -> None:
+        """
+        Persist the sketch to a Parquet file.
+
+        Args:
+            file_path (str): Destination file path.
+
+        Returns:
+            None
+        """
+        counts = self.counts.rename("count").reset_index()
+        counts.attrs["relative_accuracy"] = self.relative_accuracy
+        counts.to_parquet(file_path, index=False)
+
+    @classmethod
+    def load(cls, file_path: str, group_cols: list) -> "GroupedQuantileSketch":
+        """
+        Load a sketch persisted with save().
+
+        Args:
+            file_path (str): Parquet file written by save().
+            group_cols (list[str]): Names of the grouping columns.
+
+        Returns:
+            GroupedQuantileSketch: The sketch.
+        """
+        counts = pd.read_parquet(file_path)
+        relative_accuracy = counts.attrs.get("relative_accuracy", DEFAULT_RELATIVE_ACCURACY)
+        return cls(group_cols, relative_accuracy, counts.set_index(list(group_cols) + ["bucket"])["count"])
+
+def grouped_median(df: pd.DataFrame, group_cols: list, value_col: str,
+                   relative_accuracy: float = None) -> pd.Series:
+    """
+    Median of a column for every group, exact or approximate.
+
+    The exact median sorts every group's values. The approximate one counts them in a
+    GroupedQuantileSketch instead: constant memory per group, mergeable across chunks
+    or workers, with a relative error of at most relative_accuracy.
+
+    Args:
+        df (pd.DataFrame): Rows with the grouping columns and the value column.
+        group_cols (list[str]): Grouping columns.
+        value_col (str): Column to take the median of.
+        relative_accuracy (float, optional): Maximal relative error of the approximate
+                                             median. None (default) for the exact median.
+
+    Returns:
+        pd.Series: Median of every group, indexed by the group keys.
+    """
+    if relative_accuracy is None:
+        return df.groupby(group_cols, observed=True)[value_col].median()
+
+    sketch = GroupedQuantileSketch(group_cols, relative_accuracy)
+    sketch.add(df, value_col)
+    return sketch.quantile(0.5).rename(value_col)
+
+def median_accuracy_option(argv: list) -> float | None:
+    """
+    Read the --approx-median[=ACCURACY] option of the standalone scripts.
+
+    Args:
+        argv (list[str]): Command-line arguments (e.g. sys.argv[1:]).
+
+    Returns:
+        float | None: Relative accuracy of the approximate medians (DEFAULT_RELATIVE_ACCURACY
+                      when no value is given), or None for exact medians.
+    """
+    for arg in argv:
+        if arg == "--approx-median":
+            return DEFAULT_RELATIVE_ACCURACY
+        if arg.startswith("--approx-median="):
+            return float(arg.split("=", 1)[1])
+    return None
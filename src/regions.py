@@ -0,0 +1,109 @@
+import time
+import numpy as np
+import pandas as pd
+
+####################################################################################
+# Official Region Mapping by Postcode (Belgium)                                    #
+#| Region   | Postcode Range        |                                              #
+#| -------- | --------------------- |                                              #
+#| Brussels | 1000–1299             |                                              #
+#| Flanders | 1500–3999             |                                              #
+#| Wallonia | 1300–1499 & 4000–7999 |                                              #
+#                                                                                  #
+# Any other value (or an invalid postcode) maps to "Unknown".                      #
+####################################################################################
+
+# Region names, indexed by region code
+REGION_NAMES = np.array(["Unknown", "Brussels", "Wallonia", "Flanders"], dtype=object)
+
+# Region code of every postcode from 0 to 9999
+_REGION_CODE_BY_POSTCODE = np.zeros(10000, dtype=np.int8)
+_REGION_CODE_BY_POSTCODE[1000:1300] = 1
+_REGION_CODE_BY_POSTCODE[1300:1500] = 2
+_REGION_CODE_BY_POSTCODE[4000:8000] = 2
+_REGION_CODE_BY_POSTCODE[1500:4000] = 3
+
+def map_postcodes_to_region(postcodes: pd.Series) -> pd.Series:
+    """
+    Map Belgian postal codes to their region, for a whole column at once.
+
+    Postcodes are converted to numbers in one vectorized step and looked up in a
+    precomputed 0–9999 table. NaN, non-numeric and out-of-range postcodes map to "Unknown".
+
+    Args:
+        postcodes (pd.Series): Postal codes (int, float or str).
+
+    Returns:
+        pd.Series: Region names ("Brussels", "Wallonia", "Flanders" or "Unknown"),
+                   with the same index as the input.
+    """
+    postcodes = pd.Series(postcodes)
+    numeric = pd.to_numeric(postcodes, errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+
+    valid = np.isfinite(numeric) & (numeric >= 0) & (numeric < 10000)
+    codes = np.zeros(len(numeric), dtype=np.int8)
+    codes[valid] = _REGION_CODE_BY_POSTCODE[numeric[valid].astype(np.int64)]
+
+    return pd.Series(REGION_NAMES[codes], index=postcodes.index, name="region")
+
+def map_postcode_to_region(postcode):
+    """
+    Map a single Belgian postal code to its corresponding region.
+
+    Use map_postcodes_to_region() for a whole column.
+
+    Args:
+        postcode (str or int): Postal code to map.
+
+    Returns:
+        str: Region name ("Brussels", "Wallonia", "Flanders", or "Unknown").
+    """
+    try:
+        pc = int(postcode)
+        if 1000 <= pc <= 1299:
+            return "Brussels"
+        elif (1300 <= pc <= 1499) or (4000 <= pc <= 7999):
+            return "Wallonia"
+        elif 1500 <= pc <= 3999:
+            return "Flanders"
+        else:
+            return "Unknown"
+    except:
+        return "Unknown"
+
+def benchmark_region_mapping(postcodes: pd.Series, repeat: int = 3) -> dict:
+    """
+    Compare the row-wise map_postcode_to_region() with map_postcodes_to_region().
+
+    Args:
+        postcodes (pd.Series): Postal codes to map (e.g. the full dataset's 'postCode' column).
+        repeat (int): Number of runs per implementation; the best time is kept.
+
+    Returns:
+        dict: Best time in seconds of each implementation, speedup, and whether both agree.
+    """
+    def best_time(func):
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = func()
+            times.append(time.perf_counter() - start)
+        return min(times), result
+
+    apply_time, expected = best_time(lambda: postcodes.apply(map_postcode_to_region))
+    vectorized_time, result = best_time(lambda: map_postcodes_to_region(postcodes))
+
+    return {
+        "rows": len(postcodes),
+        "apply_seconds": apply_time,
+        "vectorized_seconds": vectorized_time,
+        "speedup": apply_time / vectorized_time if vectorized_time else float("inf"),
+        "identical": bool((expected == result).all())
+    }
+
+if __name__ == "__main__":
+    from src.data_cleanner import DataCleanner
+    from src.dataset_cache import DatasetCache, RAW_DATA_FILE
+
+    df = DataCleanner(RAW_DATA_FILE, cache=DatasetCache()).normalization()
+    print(benchmark_region_mapping(df["postCode"]))
@@ -0,0 +1,53 @@
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+def write_snapshot(df: pd.DataFrame, snapshot_path: str, metadata: dict = None) -> None:
+    """
+    Write a DataFrame as an uncompressed Feather (Arrow IPC) file, which can be memory-mapped.
+
+    Args:
+        df (pd.DataFrame): DataFrame to write.
+        snapshot_path (str): Destination file path.
+        metadata (dict, optional): String key/values stored in the file's schema
+                                   (see read_snapshot_metadata()).
+
+    Returns:
+        None
+    """
+    table = pa.Table.from_pandas(df.reset_index(drop=True), preserve_index=False)
+    if metadata:
+        table = table.replace_schema_metadata({**table.schema.metadata, **metadata})
+    feather.write_feather(table, snapshot_path, compression="uncompressed")
+
+def read_snapshot(snapshot_path: str, columns: list = None) -> pd.DataFrame:
+    """
+    Read a DataFrame written by write_snapshot(), memory-mapping the file.
+
+    Columns without missing values are not copied out of the mapped file where
+    possible, so processes reading the same snapshot share its pages.
+
+    Args:
+        snapshot_path (str): Path to the Feather file.
+        columns (list[str], optional): Columns to read. Defaults to all of them.
+
+    Returns:
+        pd.DataFrame: The DataFrame.
+    """
+    table = feather.read_table(snapshot_path, columns=columns, memory_map=True)
+    return table.to_pandas(split_blocks=True)
+
+def read_snapshot_metadata(snapshot_path: str) -> dict:
+    """
+    Read the metadata stored with write_snapshot(), without reading the data.
+
+    Args:
+        snapshot_path (str): Path to the Feather file.
+
+    Returns:
+        dict: The metadata (string keys and values).
+    """
+    with pa.memory_map(snapshot_path) as source:
+        schema = pa.ipc.open_file(source).schema
+    return {key.decode(): value.decode() for key, value in (schema.metadata or {}).items()
+            if key != b"pandas"}
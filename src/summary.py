@@ -1,7 +1,12 @@
 import pandas as pd
 import os
-import plotly.express as px
-from data_cleanner import DataCleanner
+import sys
+from src.data_cleanner import DataCleanner
+from src.dataset_cache import DatasetCache, RAW_DATA_FILE
+from src.locality_aggregates import LocalityAggregateStore, prepare_listings, STORE_DIR, SUMMARY_FILE
+from src.quantile_sketch import median_accuracy_option
+from src.piechart_export import export_piecharts
+from src.locality_explorer import export_locality_explorer
 
 ###############################################################################
 # 1. VALIDATION AUTOMATISÉE
@@ -20,38 +25,18 @@ def validate_dataset(df):
 # 2. CHARGEMENT ET FILTRAGE DES DONNÉES
 ###############################################################################
 
-data = DataCleanner("data/data_cleanned.csv")
-df = data.load_data_file()
+# Exact medians by default, approximate (quantile sketch) with --approx-median[=ACCURACY]
+median_accuracy = median_accuracy_option(sys.argv[1:])
+rebuild_cache = "--rebuild-cache" in sys.argv[1:]
+
+data = DataCleanner(RAW_DATA_FILE, cache=DatasetCache(rebuild=rebuild_cache))
+df = data.normalization()
 validate_dataset(df)
+cleaned_df = df
 
-# Filtres qualité
-df = df[
-    (df["habitableSurface"].notna()) &
-    (df["habitableSurface"] > 10) &
-    (df["habitableSurface"] < 25000) &
-    (df["price"] > 10000) &
-    (df["price"] < 800000)
-]
-
-# Calcul prix/m²
-df["price_per_m2"] = df["price"] / df["habitableSurface"]
-
-# Mapping code postal → région
-def map_postcode_to_region(postcode):
-    try:
-        pc = int(postcode)
-        if 1000 <= pc <= 1299:
-            return "Brussels"
-        elif (1300 <= pc <= 1499) or (4000 <= pc <= 7999):
-            return "Wallonia"
-        elif 1500 <= pc <= 3999:
-            return "Flanders"
-        else:
-            return "Unknown"
-    except:
-        return "Unknown"
-
-df["region"] = df["postCode"].apply(map_postcode_to_region)
+# Filtres qualité, calcul prix/m² et mapping code postal → région
+# (shared with the incremental aggregate store, see src/locality_aggregates.py)
+df = prepare_listings(df)
 
 # Détection type principal
 df["type_main"] = df["type"].apply(lambda x: "Apartment" if "apart" in str(x).lower() else "House")
@@ -60,19 +45,23 @@ df["type_main"] = df["type"].apply(lambda x: "Apartment" if "apart" in str(x).lo
 # 3. AGRÉGATION PAR LOCALITÉ / REGION / SUBTYPE
 ###############################################################################
 
-summary_df = df[["locality", "province", "region", "subtype", "price", "price_per_m2"]]
-agg_df = summary_df.groupby(["region", "province", "locality", "subtype"]).agg(
-    avg_price=("price", "mean"),
-    med_price=("price", "median"),
-    price_m2=("price_per_m2", "mean"),
-    count=("price", "count")
-).reset_index()
+# The summary is emitted by the incremental aggregate store (see src/locality_aggregates.py),
+# the only writer of summary_by_locality.csv, so daily inserts/deletes are not overwritten.
+# The store is rebuilt from the current dataset (with exact medians, unless --approx-median)
+# when it is missing, built from another cleaned dataset or median mode, or with --rebuild-cache.
+try:
+    store = None if rebuild_cache else LocalityAggregateStore.load(STORE_DIR)
+except FileNotFoundError:
+    store = None
+if store is None or store.source_key != data.cache_key or store.median_accuracy != median_accuracy:
+    store = LocalityAggregateStore.from_frame(cleaned_df, median_accuracy, source_key=data.cache_key)
+    store.save(STORE_DIR)
 
 ###############################################################################
 # 4. TABLEAU PIVOTÉ : HOUSE / APPARTEMENT
 ###############################################################################
 
-pivot_df = df.groupby(["region", "locality", "type_main"]).agg(
+pivot_df = df.groupby(["region", "locality", "type_main"], observed=True).agg(
     avg_price=("price", "mean")
 ).reset_index()
 
@@ -83,45 +72,25 @@ pivot_table.columns.name = None  # Clean MultiIndex
 # 5. PIECHART PAR LOCALITÉ + REGION (SUBTYPE DISTRIBUTION)
 ###############################################################################
 
-# Ensure output directory exists
-os.makedirs("output/piecharts", exist_ok=True)
-
 # Aggregate property count and average price per subtype, region, and locality
-subtype_dist = df.groupby(["region", "locality", "subtype"]).agg(
+subtype_dist = df.groupby(["region", "locality", "subtype"], observed=True).agg(
     count=("price", "count"),
     avg_price=("price", "mean")
 ).reset_index()
 
-# Generate one piechart per region-locality group
-for (region, locality), group in subtype_dist.groupby(["region", "locality"]):
-    if len(group) < 2:
-        continue  # Skip small or non-diverse groups
-
-    # Create pie chart using Plotly
-    fig = px.pie(
-        group,
-        values="count",              # Pie slice size = number of properties
-        names="subtype",             # Label each slice by property subtype
-        title=f"{locality}, {region} – Subtype Distribution",
-        hole=0.4,                    # Donut style
-        custom_data=["avg_price"]    # Attach avg_price for hover display
-    )
-
-    # Customize hover tooltip to show average price
-    fig.update_traces(
-        hovertemplate="<b>%{label}</b><br>Count: %{value}<br>Avg. Price: %{customdata[0]:,.0f} €<extra></extra>"
-    )
-
-    # Export as HTML file (interactive)
-    filename = f"output/piecharts/{region}_{locality}.html".replace(" ", "_")
-    fig.write_html(filename)
+# One self-contained page to explore every region-locality group
+export_locality_explorer(subtype_dist, "output/locality_explorer.html")
+
+# One piechart file per region-locality group (in parallel, unchanged groups skipped), on request
+if "--piecharts" in sys.argv[1:]:
+    export_piecharts(subtype_dist, "output/piecharts")
 
 ###############################################################################
 # 6. EXPORTS
 ###############################################################################
 
 os.makedirs("output", exist_ok=True)
-agg_df.to_csv("output/summary_by_locality.csv", index=False)
+store.to_csv(SUMMARY_FILE)
 pivot_table.to_csv("output/price_matrix_apartment_house.csv", index=False)
 
 # Type le plus vendu
@@ -3,8 +3,7 @@ import matplotlib.pyplot as plt
 import matplotlib
 import pandas as pd
 import matplotlib.patches as mpatches
-
-matplotlib.use('TkAgg')
+from src.box_stats import box_stats, draw_boxes
 
 def generate_surface_charts(df: pd.DataFrame, show_plot: bool):
     """
@@ -71,13 +70,17 @@ def plot_surface_histogram(df: pd.DataFrame, plot_file_path: str, show_plot: boo
             
     except Exception as e:
         print(f"[ERRO] Failed to plot surface histogram => {e}")
+    finally:
+        # Release the figure once it is saved (and shown)
+        plt.close()
 
 def plot_big_surface_boxplot(df: pd.DataFrame, surface_col="habitableSurface", price_col="price",
                              min_surface: int = 1000, plot_file_path: str = None, show_plot: bool = True) -> None:
     """
     Plot a boxplot of property prices for properties with a large surface area exceeding a minimum threshold.
 
-    Filters properties by surface area and non-missing price, then plots price distribution.
+    Filters properties by surface area and non-missing price, then plots the price distribution
+    from precomputed box statistics (see src/box_stats.py).
 
     Args:
         df (pd.DataFrame): DataFrame containing property data.
@@ -107,7 +110,8 @@ def plot_big_surface_boxplot(df: pd.DataFrame, surface_col="habitableSurface", p
 
         # Création du boxplot
         plt.figure(figsize=(8, 6))
-        sns.boxplot(y=filtered_df[price_col], color="tomato")
+        draw_boxes(plt.gca(), box_stats(filtered_df, price_col), colors=["tomato"], orientation="vertical")
+        plt.xticks([])
         plt.title(f"Distribution des prix pour les propriétés avec surface > {min_surface} m²")
         plt.ylabel("Prix (€)")
         plt.tight_layout()
@@ -120,4 +124,7 @@ def plot_big_surface_boxplot(df: pd.DataFrame, surface_col="habitableSurface", p
             plt.show()
 
     except Exception as e:
-        print(f"[ERROR] Failed to plot big surface boxplot => {e}")
\ No newline at end of file
+        print(f"[ERROR] Failed to plot big surface boxplot => {e}")
+    finally:
+        # Release the figure once it is saved (and shown)
+        plt.close()